@@ -11,6 +11,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from src.database import create_tables
+from src.services.llm_cache import reset_llm_cache
+from src.services.llm_client import reset_llm_client
 from src.services.seed_data import seed_if_empty
 from src.api import game, author
 
@@ -23,9 +25,14 @@ async def lifespan(app: FastAPI):
     # Run seeding in a background worker so it creates/commits its own session
     # (keeps startup non-blocking and ensures seeds persist).
     await seed_if_empty(in_background=True)
+    # Periodically reap expired sessions in small chunks
+    game.session_reaper.start()
     yield
     # Shutdown code
-    # (none for now)
+    await game.session_reaper.stop()
+    # Release pooled LLM connections and the response cache
+    reset_llm_client()
+    reset_llm_cache()
 
 
 # FastAPI Setup
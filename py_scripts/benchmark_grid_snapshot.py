@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Time navigator cold starts from the database and from a grid snapshot."""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from src.database import Base
+from src.models import Storylet  # noqa: F401  (registers the table)
+from src.services.grid_snapshot import position_fingerprint
+from src.services.spatial_navigator import SpatialNavigator
+
+
+def build_grid(db, size: int):
+    """Insert a size x size grid of positioned storylets in one executemany."""
+    db.execute(
+        text(
+            "INSERT INTO storylets (title, text_template, requires, choices, "
+            "weight, position) VALUES (:title, '', '{}', '[]', 1.0, :position)"
+        ),
+        [
+            {"title": f"Cell {x},{y}", "position": f'{{"x": {x}, "y": {y}}}'}
+            for x in range(size)
+            for y in range(size)
+        ],
+    )
+    db.commit()
+
+
+def best_of(runs: int, fn) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        build_grid(db, size)
+        snapshot = os.path.join(tmp, "world.grid")
+        SpatialNavigator(db).export_snapshot(snapshot)
+
+        from_db = best_of(3, lambda: SpatialNavigator(db))
+        fingerprint = best_of(3, lambda: position_fingerprint(db))
+        from_snapshot = best_of(3, lambda: SpatialNavigator(db, snapshot_path=snapshot))
+        db.close()
+
+    print(f"Storylets:              {size * size}")
+    print(f"Cold start (database):  {from_db * 1000:8.1f} ms")
+    print(f"Cold start (snapshot):  {from_snapshot * 1000:8.1f} ms")
+    print(f"  of which fingerprint: {fingerprint * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
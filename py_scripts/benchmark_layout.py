@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Time the location layout engine on a large synthetic transition graph."""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.layout_engine import force_directed_layout, snap_to_grid
+
+
+def build_graph(size: int, seed: int = 1):
+    """A branching world: each location links back to a recent one, plus local loops."""
+    rng = random.Random(seed)
+    names = [f"location {i}" for i in range(size)]
+    graph = {name: set() for name in names}
+    for i in range(1, size):
+        j = rng.randrange(max(0, i - 50), i)
+        graph[names[i]].add(names[j])
+        graph[names[j]].add(names[i])
+    for i in range(0, size, 3):
+        j = rng.randrange(max(0, i - 8), i + 1)
+        if i != j:
+            graph[names[i]].add(names[j])
+            graph[names[j]].add(names[i])
+    return graph
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    graph = build_graph(size)
+    edges = [(a, b) for a in graph for b in graph[a] if a < b]
+
+    print("🗺️ Location layout benchmark")
+    print("=" * 40)
+    start = time.perf_counter()
+    coordinates = force_directed_layout(graph)
+    laid_out = time.perf_counter()
+    cells = snap_to_grid(graph, coordinates)
+    snapped = time.perf_counter()
+
+    adjacent = sum(
+        1
+        for a, b in edges
+        if max(abs(cells[a][0] - cells[b][0]), abs(cells[a][1] - cells[b][1])) == 1
+    )
+    print(f"Locations: {size}, transitions: {len(edges)}")
+    print(f"Layout: {(laid_out - start) * 1000:.0f} ms, snap: {(snapped - laid_out) * 1000:.0f} ms")
+    print(f"Adjacent transitions: {adjacent}/{len(edges)}")
+    print(f"Collisions: {size - len(set(cells.values()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Compare a fresh OpenAI client per call with the shared pooled client, offline."""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from openai_stub_server import start_stub_server
+
+from src.services.llm_client import get_llm_client, reset_llm_client
+
+CALLS = 50
+
+
+def one_call(client):
+    client.chat.completions.create(
+        model="stub",
+        messages=[{"role": "user", "content": "Describe a storylet."}],
+    )
+
+
+def main():
+    server, state = start_stub_server()
+    os.environ["DW_LLM_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    reset_llm_client()
+    from openai import OpenAI
+
+    print("🔌 LLM client benchmark (local stub)")
+    print("=" * 40)
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        client = OpenAI(api_key="stub", base_url=os.environ["DW_LLM_BASE_URL"])
+        one_call(client)
+        client.close()
+    fresh = (time.perf_counter() - start) * 1000 / CALLS
+    fresh_connections = state.connections
+
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        one_call(get_llm_client())
+    shared = (time.perf_counter() - start) * 1000 / CALLS
+
+    print(f"Fresh client per call: {fresh:.2f} ms/call, {fresh_connections} connections")
+    print(
+        f"Shared pooled client:  {shared:.2f} ms/call, "
+        f"{state.connections - fresh_connections} connections"
+    )
+    reset_llm_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
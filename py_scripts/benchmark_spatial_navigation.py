@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Count SQL queries issued by one spatial navigation request."""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models import Storylet
+from src.services.spatial_navigator import DIRECTIONS, SpatialNavigator
+
+
+def build_grid(db, size: int):
+    """Fill a size x size grid with storylets."""
+    for x in range(size):
+        for y in range(size):
+            db.add(
+                Storylet(
+                    title=f"Cell {x},{y}",
+                    text_template=f"You stand at {x},{y}.",
+                    requires={"location": f"cell_{x}_{y}"},
+                    position={"x": x, "y": y},
+                )
+            )
+    db.commit()
+
+
+def navigation_request(navigator: SpatialNavigator, storylet_id: int, player_vars):
+    """Mirror what GET /api/spatial/navigation does with the navigator."""
+    directions = navigator.get_directional_navigation(storylet_id)
+    for name, target in directions.items():
+        if target is not None:
+            navigator.can_move_to_direction(
+                storylet_id, name, player_vars, session_id="benchmark"
+            )
+
+
+def main():
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    build_grid(db, 20)
+    center = db.query(Storylet).filter_by(title="Cell 10,10").one()
+    navigator = SpatialNavigator(db)
+
+    queries = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: queries.append(args[2])
+    )
+
+    print("🧭 Spatial navigation query benchmark")
+    print("=" * 40)
+    for label in ("cold", "warm"):
+        queries.clear()
+        start = time.perf_counter()
+        navigation_request(navigator, center.id, {"location": "cell_10_10"})
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{label:>5}: {len(queries)} queries, {elapsed:.2f} ms")
+
+    print(f"Neighbour directions checked: {len(DIRECTIONS)}")
+    print("Before batching a request could issue up to 72 queries (8 + 8 x 8).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Local OpenAI-compatible stub server for offline tests and benchmarks.
+
+Serves ``POST /v1/chat/completions`` with canned storylets shaped like the
+responses each WorldWeaver prompt expects, after an optional artificial
+latency; ``"stream": true`` requests get server-sent event chunks. Connections are kept alive (HTTP/1.1), and the server counts
+requests and connections so connection reuse can be checked.
+
+    python py_scripts/openai_stub_server.py --port 8001 --latency-ms 250
+    DW_LLM_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub uvicorn main:app
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+
+def _storylet(i: int) -> Dict[str, Any]:
+    return {
+        "title": f"Stub Storylet {i}",
+        "text": f"Scene {i} unfolds around {{name}}.",
+        "text_template": f"Scene {i} unfolds around {{name}}.",
+        "choices": [
+            {"label": "Press on", "set": {"location": f"stub_place_{i + 1}"}},
+            {"label": "Wait", "set": {}},
+        ],
+        "requires": {"location": f"stub_place_{i}"},
+        "weight": 1.0,
+    }
+
+
+def _requested_count(text: str, default: int = 3) -> int:
+    match = re.search(r"(?:Generate|EXACTLY|Create)\s+(\d+)", text)
+    return int(match.group(1)) if match else default
+
+
+def canned_content(body: Dict[str, Any]) -> str:
+    """Completion text matching the kind of prompt in ``body``."""
+    prompt = "\n".join(
+        str(message.get("content", "")) for message in body.get("messages", [])
+    )
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        count = _requested_count(prompt)
+        return json.dumps({"storylets": [_storylet(i) for i in range(count)]})
+    if "storylets in this JSON format" in prompt:
+        count = _requested_count(prompt, default=5)
+        # Chunked world generation: give each batch its own titles
+        batch = re.search(r"batch (\d+) of \d+", prompt)
+        offset = (int(batch.group(1)) - 1) * 100 if batch else 0
+        return json.dumps([_storylet(offset + i) for i in range(count)])
+    # Single storylets (e.g. a world's opening) must not reuse batch titles
+    return json.dumps({**_storylet(0), "title": "Stub Opening"})
+
+
+class StubState:
+    """Counters shared by every handler thread."""
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        stream_delay_seconds: float = 0.0,
+        stream_piece_chars: int = 16,
+    ):
+        self.latency_seconds = latency_seconds
+        self.stream_delay_seconds = stream_delay_seconds
+        self.stream_piece_chars = stream_piece_chars
+        self.requests = 0
+        self.connections = 0
+        self.bodies: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, body: Dict[str, Any]):
+        with self._lock:
+            self.requests += 1
+            self.bodies.append(body)
+
+    def connected(self):
+        with self._lock:
+            self.connections += 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send headers and body in one segment; split writes on a kept-alive
+    # connection would otherwise stall on delayed ACKs
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    state: StubState
+
+    def setup(self):
+        super().setup()
+        self.state.connected()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "invalid JSON"}})
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+            return
+
+        self.state.record(body)
+        if self.state.latency_seconds:
+            time.sleep(self.state.latency_seconds)
+        content = canned_content(body)
+        if body.get("stream"):
+            self._send_stream(body, content)
+        else:
+            self._send_json(200, self._completion(body, content))
+
+    def _send_stream(self, body: Dict[str, Any], content: str):
+        """Server-sent events in OpenAI's chunk format, one piece at a time."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        size = self.state.stream_piece_chars
+        pieces = [content[i : i + size] for i in range(0, len(content), size)]
+        for index, piece in enumerate(pieces):
+            if index and self.state.stream_delay_seconds:
+                time.sleep(self.state.stream_delay_seconds)
+            self._write_event(self._chunk(body, {"content": piece}, None))
+        self._write_event(self._chunk(body, {}, "stop"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _chunk(self, body: Dict[str, Any], delta: Dict[str, Any], finish_reason):
+        return {
+            "id": f"chatcmpl-stub-{self.state.requests}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    def _write_event(self, payload: Dict[str, Any]):
+        self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+
+    def _write_chunk(self, data: bytes):
+        # HTTP/1.1 chunked transfer coding; an empty chunk ends the body
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _completion(self, body: Dict[str, Any], content: str) -> Dict[str, Any]:
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in body.get("messages", []))
+        return {
+            "id": f"chatcmpl-stub-{self.state.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_chars // 4 + len(content) // 4,
+            },
+        }
+
+
+def start_stub_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_seconds: float = 0.0,
+    stream_delay_seconds: float = 0.0,
+):
+    """
+    Start the stub in a background thread.
+
+    ``latency_seconds`` delays each response; streamed responses
+    (``"stream": true``) also wait ``stream_delay_seconds`` between pieces.
+
+    Returns ``(server, state)``; the base URL is
+    ``f"http://{host}:{server.server_port}/v1"``. Call ``server.shutdown()``
+    when done.
+    """
+    state = StubState(latency_seconds, stream_delay_seconds)
+    handler = type("BoundStubHandler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--stream-delay-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, state = start_stub_server(
+        args.host, args.port, args.latency_ms / 1000, args.stream_delay_ms / 1000
+    )
+    print(f"🧪 OpenAI stub listening on http://{args.host}:{server.server_port}/v1")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n📊 Served {state.requests} requests over {state.connections} connections")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,14 @@ import os
 import json
 import logging
 import traceback
-from typing import Dict, Any, Optional, cast
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Any, Iterator, Optional, cast
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..database import get_db
-from ..models import Storylet, SessionVars
+from ..models import DEFAULT_WORLD_ID, Storylet, SessionVars
 from ..models.schemas import (
     SuggestReq,
     SuggestResp,
@@ -17,41 +19,18 @@ from ..models.schemas import (
     GenerateStoryletRequest,
     WorldDescription,
 )
-from ..services.llm_service import llm_suggest_storylets, generate_world_storylets
+from ..services.llm_service import (
+    llm_suggest_storylets,
+    generate_world_storylets,
+    stream_world_storylets,
+)
 from ..services.game_logic import auto_populate_storylets
+from ..services.world_catalog import world_catalogs
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
 
-def save_storylets_with_postprocessing(
-    db: Session,
-    storylets: list,
-    improvement_trigger: str = "",
-    assign_spatial: bool = True,
-    spatial_ids: Optional[list] = None,
-) -> dict:
-    """
-    Save storylets to DB, assign spatial positions, and run auto-improvement.
-
-    Args:
-        db: SQLAlchemy session
-        storylets: List of dicts with storylet data
-        improvement_trigger: String describing the operation for auto-improvement
-        assign_spatial: Whether to assign spatial positions
-        spatial_ids: Optional list of storylet IDs for spatial assignment
-
-    Returns:
-        Dict with results and improvement info
-    """
-    from ..services.spatial_navigator import SpatialNavigator
-    from ..services.auto_improvement import (
-        auto_improve_storylets,
-        should_run_auto_improvement,
-        get_improvement_summary,
-    )
-    from sqlalchemy.exc import IntegrityError
-    from sqlalchemy import func
-    from ..models import Storylet
-
+def _insert_storylets(db: Session, storylets: list, world_id: str) -> list:
+    """Insert valid storylets whose titles are new to the world, then commit."""
     created_storylets = []
     for data in storylets:
         # Validate required fields
@@ -63,23 +42,28 @@ def save_storylets_with_postprocessing(
         normalized = (data.get("title") or "").strip()
         exists = (
             db.query(Storylet)
-            .filter(func.lower(Storylet.title) == func.lower(normalized))
+            .filter(
+                Storylet.world_id == world_id,
+                func.lower(Storylet.title) == func.lower(normalized),
+            )
             .first()
         )
         if exists:
             continue
         storylet = Storylet(
+            world_id=world_id,
             title=normalized,
             text_template=data["text_template"],
             requires=data["requires"],
             choices=data["choices"],
             weight=float(data["weight"]),
         )
-        db.add(storylet)
+        # A savepoint per storylet: a conflict drops only that one, not the
+        # earlier inserts of this batch
         try:
-            db.flush()
+            with db.begin_nested():
+                db.add(storylet)
         except IntegrityError:
-            db.rollback()
             continue
         created_storylets.append(
             {
@@ -91,13 +75,49 @@ def save_storylets_with_postprocessing(
             }
         )
     db.commit()
+    if created_storylets:
+        world_catalogs.invalidate(world_id)
+    return created_storylets
+
+
+def save_storylets_with_postprocessing(
+    db: Session,
+    storylets: list,
+    improvement_trigger: str = "",
+    assign_spatial: bool = True,
+    spatial_ids: Optional[list] = None,
+    world_id: str = DEFAULT_WORLD_ID,
+) -> dict:
+    """
+    Save storylets to DB, assign spatial positions, and run auto-improvement.
+
+    Args:
+        db: SQLAlchemy session
+        storylets: List of dicts with storylet data
+        improvement_trigger: String describing the operation for auto-improvement
+        assign_spatial: Whether to assign spatial positions
+        spatial_ids: Optional list of storylet IDs for spatial assignment
+        world_id: World the storylets belong to
+
+    Returns:
+        Dict with results and improvement info
+    """
+    from ..services.spatial_navigator import SpatialNavigator
+    from ..services.auto_improvement import (
+        auto_improve_storylets,
+        should_run_auto_improvement,
+        get_improvement_summary,
+    )
+
+    created_storylets = _insert_storylets(db, storylets, world_id)
 
     # Assign spatial positions
     updates = 0
     if assign_spatial and created_storylets:
         new_storylet_ids = []
         for storylet in db.query(Storylet).filter(
-            Storylet.title.in_([s["title"] for s in created_storylets])
+            Storylet.world_id == world_id,
+            Storylet.title.in_([s["title"] for s in created_storylets]),
         ):
             new_storylet_ids.append(storylet.id)
         updates = SpatialNavigator.auto_assign_coordinates(
@@ -105,6 +125,7 @@ def save_storylets_with_postprocessing(
         )
         if updates > 0:
             print(f"📍 Auto-assigned coordinates to {updates} storylets")
+            world_catalogs.invalidate(world_id)
 
     # Auto-improve storylets
     improvement_results = None
@@ -115,6 +136,8 @@ def save_storylets_with_postprocessing(
             run_smoothing=True,
             run_deepening=True,
         )
+        # Auto-improvement edits the whole storylet table, not just this world
+        world_catalogs.invalidate_all()
 
     return {
         "added": len(created_storylets),
@@ -217,6 +240,8 @@ def populate_storylets(target_count: int = 20, db: Session = Depends(get_db)):
     try:
         added = auto_populate_storylets(db, target_count)
         current_count = db.query(Storylet).count()
+        if added > 0:
+            world_catalogs.invalidate(DEFAULT_WORLD_ID)
 
         # Auto-assign spatial coordinates to any storylets that need them
         if added > 0:
@@ -247,6 +272,7 @@ def populate_storylets(target_count: int = 20, db: Session = Depends(get_db)):
                 run_smoothing=True,
                 run_deepening=True,
             )
+            world_catalogs.invalidate_all()
 
             base_response["auto_improvements"] = get_improvement_summary(
                 improvement_results
@@ -288,6 +314,45 @@ def debug_game_state(db: Session = Depends(get_db)):
         return {"error": str(e)}
 
 
+@router.get("/spatial-reachability")
+def get_spatial_reachability(
+    world_id: str = Query(default=DEFAULT_WORLD_ID),
+    start: Optional[int] = Query(default=None, description="Start storylet id"),
+    db: Session = Depends(get_db),
+):
+    """
+    Connected components of a world's spatial grid.
+
+    Flags storylets that cannot be walked to from the start storylet (by
+    default the one at (0, 0)) with 8-directional moves.
+    """
+    try:
+        from .game import get_spatial_navigator
+
+        spatial_nav = get_spatial_navigator(db, world_id)
+        report = spatial_nav.analyze_reachability(start)
+        summaries = spatial_nav.get_storylet_summaries(report.unreachable_ids)
+        result = report.to_dict()
+        result["world_id"] = world_id
+        result["unreachable_storylets"] = [
+            {
+                "id": storylet_id,
+                "title": summaries.get(storylet_id, {}).get("title"),
+                "position": {
+                    "x": spatial_nav.storylet_positions[storylet_id].x,
+                    "y": spatial_nav.storylet_positions[storylet_id].y,
+                },
+            }
+            for storylet_id in report.unreachable_ids
+        ]
+        return result
+    except Exception as e:
+        logging.error(f"❌ Reachability analysis failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Reachability analysis failed: {str(e)}"
+        )
+
+
 @router.post("/generate-intelligent")
 def generate_intelligent_storylets(
     request: GenerateStoryletRequest, db: Session = Depends(get_db)
@@ -468,199 +533,309 @@ def generate_targeted_storylets(db: Session = Depends(get_db)):
         return {"error": f"Failed to generate targeted storylets: {str(e)}"}
 
 
-@router.post("/generate-world")
-def generate_world_from_description(
-    world_description: WorldDescription, db: Session = Depends(get_db)
-):
-    """Generate a complete storylet ecosystem from a world description."""
+def _clear_world(db: Session, world_id: str):
+    """Delete a world's storylets and location registry before its replacement is saved."""
+    from ..services.location_registry import clear_locations
+
+    existing_count = db.query(Storylet).filter(Storylet.world_id == world_id).count()
+    if existing_count > 0:
+        db.query(Storylet).filter(Storylet.world_id == world_id).delete(
+            synchronize_session=False
+        )
+    # Old coordinates would not match the regenerated layout
+    cleared_locations = clear_locations(db, world_id)
+    if existing_count > 0 or cleared_locations:
+        db.commit()
+        world_catalogs.invalidate(world_id)
+        print(f"🗑️ Cleared {existing_count} existing storylets in world '{world_id}'")
+
+
+def _world_storylet_dict(storylet_data: dict) -> dict:
+    """Generated world storylet in save_storylets_with_postprocessing format."""
+    return {
+        "title": storylet_data.get("title"),
+        "text_template": storylet_data.get("text"),
+        "choices": storylet_data.get("choices", []),
+        "requires": storylet_data.get("requires", {}),
+        "weight": float(storylet_data.get("weight", 1.0)),
+    }
+
+
+def _ndjson(event: dict) -> str:
+    return json.dumps(jsonable_encoder(event)) + "\n"
+
+
+def _stream_world_generation(
+    world_description: WorldDescription, db: Session
+) -> Iterator[str]:
+    """
+    NDJSON events for a streamed world generation.
+
+    Each storylet is saved and sent as soon as the model finishes it
+    (``{"event": "storylet", ...}``); the world is only cleared once the
+    first one arrives. The final line is the usual response with
+    ``"event": "complete"``, or ``{"event": "error", ...}``.
+    """
+    world_id = world_description.world_id
+    storylets: list = []
+    created_storylets: list = []
+    cleared = False
     try:
-        # Clear existing storylets for fresh start
-        existing_count = db.query(Storylet).count()
-        if existing_count > 0:
-            db.query(Storylet).delete()
-            db.commit()
-            print(f"🗑️ Cleared {existing_count} existing storylets")
-
-        # Generate world-specific storylets using AI
-        storylets = generate_world_storylets(
+        for storylet_data in stream_world_storylets(
             description=world_description.description,
             theme=world_description.theme,
             player_role=world_description.player_role,
             key_elements=world_description.key_elements,
             tone=world_description.tone,
             count=world_description.storylet_count,
-        )
-
-        # Normalize generated storylets to helper format
-        storylet_dicts = []
-        for storylet_data in storylets:
+        ):
             if not storylet_data.get("title"):
                 continue
-            storylet_dicts.append(
-                {
-                    "title": storylet_data.get("title"),
-                    "text_template": storylet_data.get("text"),
-                    "choices": storylet_data.get("choices", []),
-                    "requires": storylet_data.get("requires", {}),
-                    "weight": float(storylet_data.get("weight", 1.0)),
-                }
-            )
+            if not cleared:
+                _clear_world(db, world_id)
+                cleared = True
+            storylets.append(storylet_data)
+            for created in _insert_storylets(
+                db, [_world_storylet_dict(storylet_data)], world_id
+            ):
+                created_storylets.append(created)
+                yield _ndjson(
+                    {
+                        "event": "storylet",
+                        "index": len(created_storylets),
+                        "storylet": created,
+                    }
+                )
 
-        # Save generated storylets to DB (delay spatial assignment so we can place them with the world layout)
-        save_result = save_storylets_with_postprocessing(
-            db=db, storylets=storylet_dicts, improvement_trigger="", assign_spatial=False
+        if not cleared:
+            _clear_world(db, world_id)
+        result = _finish_world_generation(
+            db, world_description, storylets, created_storylets
         )
+        yield _ndjson({"event": "complete", **result})
+    except Exception as e:
+        db.rollback()
+        yield _ndjson({"event": "error", "detail": f"World generation failed: {str(e)}"})
 
-        # Use the helper's created storylets for later spatial placement
-        created_storylets = save_result.get("storylets", [])
-
-        # Analyze the generated world to create a perfect starting storylet
-        generated_locations = set()
-        generated_themes = set()
 
-        for storylet_data in storylets:
-            # Extract locations from requirements
-            requires = storylet_data.get("requires", {})
-            if "location" in requires:
-                generated_locations.add(requires["location"])
+def _finish_world_generation(
+    db: Session,
+    world_description: WorldDescription,
+    storylets: list,
+    created_storylets: list,
+) -> dict:
+    """Add the starting storylet, place the world on the grid and auto-improve it."""
+    world_id = world_description.world_id
+
+    # Analyze the generated world to create a perfect starting storylet
+    generated_locations = set()
+    generated_themes = set()
+
+    for storylet_data in storylets:
+        # Extract locations from requirements
+        requires = storylet_data.get("requires", {})
+        if "location" in requires:
+            generated_locations.add(requires["location"])
+
+        # Extract themes from titles and content
+        title_lower = storylet_data["title"].lower()
+        text_lower = storylet_data["text"].lower()
+
+        # Identify key themes
+        if any(
+            word in title_lower or word in text_lower
+            for word in ["forge", "craft", "create", "build"]
+        ):
+            generated_themes.add("crafting")
+        if any(
+            word in title_lower or word in text_lower
+            for word in ["market", "trade", "vendor", "buy", "sell"]
+        ):
+            generated_themes.add("commerce")
+        if any(
+            word in title_lower or word in text_lower
+            for word in ["ancient", "artifact", "old", "relic"]
+        ):
+            generated_themes.add("history")
+        if any(
+            word in title_lower or word in text_lower
+            for word in ["danger", "threat", "risk", "escape"]
+        ):
+            generated_themes.add("danger")
+        if any(
+            word in title_lower or word in text_lower
+            for word in ["clan", "rival", "family", "group"]
+        ):
+            generated_themes.add("social")
 
-            # Extract themes from titles and content
-            title_lower = storylet_data["title"].lower()
-            text_lower = storylet_data["text"].lower()
+    # Generate a contextual starting storylet
+    from ..services.llm_service import generate_starting_storylet
 
-            # Identify key themes
-            if any(
-                word in title_lower or word in text_lower
-                for word in ["forge", "craft", "create", "build"]
-            ):
-                generated_themes.add("crafting")
-            if any(
-                word in title_lower or word in text_lower
-                for word in ["market", "trade", "vendor", "buy", "sell"]
-            ):
-                generated_themes.add("commerce")
-            if any(
-                word in title_lower or word in text_lower
-                for word in ["ancient", "artifact", "old", "relic"]
-            ):
-                generated_themes.add("history")
-            if any(
-                word in title_lower or word in text_lower
-                for word in ["danger", "threat", "risk", "escape"]
-            ):
-                generated_themes.add("danger")
-            if any(
-                word in title_lower or word in text_lower
-                for word in ["clan", "rival", "family", "group"]
-            ):
-                generated_themes.add("social")
+    starting_storylet_data = generate_starting_storylet(
+        world_description=world_description,
+        available_locations=list(generated_locations),
+        world_themes=list(generated_themes),
+    )
 
-        # Generate a contextual starting storylet
-        from ..services.llm_service import generate_starting_storylet
+    # Create the dynamic starting storylet
+    starting_storylet = Storylet(
+        world_id=world_id,
+        title=starting_storylet_data["title"],
+        text_template=starting_storylet_data["text"],
+        choices=starting_storylet_data["choices"],
+        requires={},  # No requirements - always accessible
+        weight=2.0,  # Higher weight to be chosen more often
+        position={"x": 0, "y": 0},  # Consistent position field for spatial navigation
+    )
+    db.add(starting_storylet)
+    created_storylets.append(
+        {
+            "title": starting_storylet.title,
+            "text_template": starting_storylet.text_template,
+            "requires": {},
+            "choices": starting_storylet.choices,
+            "weight": starting_storylet.weight,
+        }
+    )
 
-        starting_storylet_data = generate_starting_storylet(
-            world_description=world_description,
-            available_locations=list(generated_locations),
-            world_themes=list(generated_themes),
-        )
+    db.commit()
 
-        # Create the dynamic starting storylet
-        starting_storylet = Storylet(
-            title=starting_storylet_data["title"],
-            text_template=starting_storylet_data["text"],
-            choices=starting_storylet_data["choices"],
-            requires={},  # No requirements - always accessible
-            weight=2.0,  # Higher weight to be chosen more often
-            position={"x": 0, "y": 0},  # Consistent position field for spatial navigation
-        )
-        db.add(starting_storylet)
-        created_storylets.append(
-            {
-                "title": starting_storylet.title,
-                "text_template": starting_storylet.text_template,
-                "requires": {},
-                "choices": starting_storylet.choices,
-                "weight": starting_storylet.weight,
-            }
-        )
+    # Get the IDs of newly created storylets for spatial assignment
+    new_storylet_ids = []
+    for storylet in db.query(Storylet).filter(
+        Storylet.world_id == world_id,
+        Storylet.title.in_([s["title"] for s in created_storylets]),
+    ):
+        new_storylet_ids.append(storylet.id)
 
-        db.commit()
+    # Assign spatial positions to the generated storylets
+    from ..services.spatial_navigator import SpatialNavigator
 
-        # Get the IDs of newly created storylets for spatial assignment
-        new_storylet_ids = []
-        for storylet in db.query(Storylet).filter(
-            Storylet.title.in_([s["title"] for s in created_storylets])
-        ):
-            new_storylet_ids.append(storylet.id)
+    try:
+        spatial_nav = SpatialNavigator(db, world_id=world_id)
+        positions = spatial_nav.assign_spatial_positions(created_storylets)
+        print(f"📍 Assigned spatial positions to {len(positions)} storylets")
 
-        # Assign spatial positions to the generated storylets
-        from ..services.spatial_navigator import SpatialNavigator
+        # Auto-assign coordinates to any storylets that still need them
+        additional_updates = SpatialNavigator.auto_assign_coordinates(
+            db, new_storylet_ids
+        )
+        if additional_updates > 0:
+            print(
+                f"📍 Auto-assigned coordinates to {additional_updates} additional storylets"
+            )
 
+    except Exception as e:
+        print(f"⚠️ Warning: Could not assign spatial positions: {e}")
+        # Try just the auto-assignment as fallback
         try:
-            spatial_nav = SpatialNavigator(db)
-            positions = spatial_nav.assign_spatial_positions(created_storylets)
-            print(f"📍 Assigned spatial positions to {len(positions)} storylets")
-
-            # Auto-assign coordinates to any storylets that still need them
-            additional_updates = SpatialNavigator.auto_assign_coordinates(
-                db, new_storylet_ids
-            )
-            if additional_updates > 0:
+            updates = SpatialNavigator.auto_assign_coordinates(db, new_storylet_ids)
+            if updates > 0:
                 print(
-                    f"📍 Auto-assigned coordinates to {additional_updates} additional storylets"
+                    f"📍 Fallback: Auto-assigned coordinates to {updates} storylets"
                 )
+        except Exception as e2:
+            print(f"⚠️ Fallback also failed: {e2}")
 
-        except Exception as e:
-            print(f"⚠️ Warning: Could not assign spatial positions: {e}")
-            # Try just the auto-assignment as fallback
-            try:
-                updates = SpatialNavigator.auto_assign_coordinates(db, new_storylet_ids)
-                if updates > 0:
-                    print(
-                        f"📍 Fallback: Auto-assigned coordinates to {updates} storylets"
-                    )
-            except Exception as e2:
-                print(f"⚠️ Fallback also failed: {e2}")
-
-        print(
-            f"🌍 Generated world with {len(generated_locations)} locations: {', '.join(generated_locations)}"
+    world_catalogs.invalidate(world_id)
+
+    print(
+        f"🌍 Generated world with {len(generated_locations)} locations: {', '.join(generated_locations)}"
+    )
+    print(f"🎭 Identified themes: {', '.join(generated_themes)}")
+
+    # Auto-improve storylets after world generation
+    from ..services.auto_improvement import (
+        auto_improve_storylets,
+        should_run_auto_improvement,
+        get_improvement_summary,
+    )
+
+    total_storylets = len(storylets) + 1
+    base_response = {
+        "success": True,
+        "message": f"🎉 Generated {total_storylets} storylets for your {world_description.theme} world!",
+        "storylets_created": total_storylets,
+        "world_id": world_id,
+        "theme": world_description.theme,
+        "player_role": world_description.player_role,
+        "tone": world_description.tone,
+        "storylets": created_storylets[:3],  # Return first 3 as preview
+    }
+
+    if should_run_auto_improvement(total_storylets, "world-generation"):
+        improvement_results = auto_improve_storylets(
+            db=db,
+            trigger=f"world-generation ({total_storylets} storylets)",
+            run_smoothing=True,
+            run_deepening=True,
         )
-        print(f"🎭 Identified themes: {', '.join(generated_themes)}")
+        world_catalogs.invalidate_all()
 
-        # Auto-improve storylets after world generation
-        from ..services.auto_improvement import (
-            auto_improve_storylets,
-            should_run_auto_improvement,
-            get_improvement_summary,
+        base_response["auto_improvements"] = get_improvement_summary(
+            improvement_results
         )
+        base_response["improvement_details"] = improvement_results
 
-        total_storylets = len(storylets) + 1
-        base_response = {
-            "success": True,
-            "message": f"🎉 Generated {total_storylets} storylets for your {world_description.theme} world!",
-            "storylets_created": total_storylets,
-            "theme": world_description.theme,
-            "player_role": world_description.player_role,
-            "tone": world_description.tone,
-            "storylets": created_storylets[:3],  # Return first 3 as preview
-        }
+        print(f"🤖 {get_improvement_summary(improvement_results)}")
 
-        if should_run_auto_improvement(total_storylets, "world-generation"):
-            improvement_results = auto_improve_storylets(
-                db=db,
-                trigger=f"world-generation ({total_storylets} storylets)",
-                run_smoothing=True,
-                run_deepening=True,
-            )
+    return base_response
 
-            base_response["auto_improvements"] = get_improvement_summary(
-                improvement_results
-            )
-            base_response["improvement_details"] = improvement_results
 
-            print(f"🤖 {get_improvement_summary(improvement_results)}")
+@router.post("/generate-world")
+def generate_world_from_description(
+    world_description: WorldDescription,
+    stream: bool = Query(
+        False, description="Stream storylets as NDJSON while they are generated"
+    ),
+    db: Session = Depends(get_db),
+):
+    """Generate a complete storylet ecosystem from a world description."""
+    if stream:
+        return StreamingResponse(
+            _stream_world_generation(world_description, db),
+            media_type="application/x-ndjson",
+        )
 
-        return base_response
+    world_id = world_description.world_id
+    try:
+        # Generate world-specific storylets using AI before touching the
+        # existing catalog, so players keep their world until the swap
+        storylets = generate_world_storylets(
+            description=world_description.description,
+            theme=world_description.theme,
+            player_role=world_description.player_role,
+            key_elements=world_description.key_elements,
+            tone=world_description.tone,
+            count=world_description.storylet_count,
+        )
+
+        # Clear this world's existing storylets for a fresh start; other
+        # worlds and their caches are left untouched
+        _clear_world(db, world_id)
+
+        # Normalize generated storylets to helper format
+        storylet_dicts = [
+            _world_storylet_dict(storylet_data)
+            for storylet_data in storylets
+            if storylet_data.get("title")
+        ]
+
+        # Save generated storylets to DB (delay spatial assignment so we can place them with the world layout)
+        save_result = save_storylets_with_postprocessing(
+            db=db,
+            storylets=storylet_dicts,
+            improvement_trigger="",
+            assign_spatial=False,
+            world_id=world_id,
+        )
+
+        # Use the helper's created storylets for later spatial placement
+        created_storylets = save_result.get("storylets", [])
+
+        return _finish_world_generation(
+            db, world_description, storylets, created_storylets
+        )
 
     except Exception as e:
         db.rollback()
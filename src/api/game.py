@@ -2,44 +2,93 @@
 
 import logging
 import traceback
-from typing import Any, Dict, List, cast
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Dict, List, Literal, Optional, Tuple, cast
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel
 from fastapi import Body, Query
 from sqlalchemy.orm import Session
+import copy
 import json
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 
 from ..database import get_db, SessionLocal
-from ..models import SessionVars, Storylet
+from ..models import DEFAULT_WORLD_ID, SessionVars, Storylet
 from ..models.schemas import NextReq, NextResp, ChoiceOut
 from ..services.game_logic import pick_storylet, render
-from ..services.state_manager import AdvancedStateManager
-from ..services.spatial_navigator import SpatialNavigator, DIRECTIONS
+from ..services.state_manager import AdvancedStateManager, merge_variable_changes
+from ..services.spatial_navigator import (
+    DIRECTIONS,
+    SpatialNavigator,
+    SpatialNavigatorRegistry,
+)
+from ..services.spatial_map_cache import (
+    EncodedPayload,
+    EncodedPayloadCache,
+    columnar_map,
+)
+from ..services.llm_guard import get_llm_guard
+from ..services.llm_usage import llm_usage
+from ..services.session_reaper import SessionReaper
+from ..services.session_store import SessionStore, create_session_store
+from ..services.world_catalog import CatalogStorylet, world_catalogs
 
 router = APIRouter()
 
-# Cache for state managers and spatial navigators (in production, use Redis or similar)
+# Per-worker cache of state managers, validated against the shared session
+# store on every request (see DW_SESSION_STORE for multi-worker deployments)
 _state_managers: Dict[str, AdvancedStateManager] = {}
-_spatial_navigators: Dict[str, SpatialNavigator] = {}
+_state_versions: Dict[str, int] = {}
+_session_store: SessionStore = create_session_store()
+# Last persisted (version, vars) per session: the base for compare-and-swap
+# saves. The version is None while the session has no row yet.
+_db_snapshots: Dict[str, Tuple[Optional[int], Dict[str, Any]]] = {}
+_SAVE_MAX_RETRIES = 5
+# One shared navigator per world, refreshed when the world's catalog changes
+_spatial_navigators = SpatialNavigatorRegistry(ttl_seconds=world_catalogs.ttl_seconds)
+# Encoded /spatial/map responses keyed by (world, catalog version, encoding);
+# the TTL picks up position changes made by other workers
+_spatial_map_cache = EncodedPayloadCache(ttl_seconds=world_catalogs.ttl_seconds)
+
+
+def get_spatial_navigator(
+    db: Session, world_id: str = DEFAULT_WORLD_ID
+) -> SpatialNavigator:
+    """Get the shared spatial navigator for a world, bound to this request."""
+    return _spatial_navigators.get(db, world_id, world_catalogs.version(world_id))
+
+
+def get_state_manager(
+    session_id: str, db: Session, world_id: str | None = None
+) -> AdvancedStateManager:
+    """
+    Get or create a state manager for the session.
+
+    ``world_id`` only applies to a session that has never been saved;
+    existing sessions stay in their own world.
+    """
+    version = _session_store.get_version(session_id)
+    cached = _state_managers.get(session_id)
+    if cached is not None and _state_versions.get(session_id, 0) == version:
+        never_saved = not version and _db_snapshots.get(session_id, (None,))[0] is None
+        if world_id and never_saved:
+            cached.world_id = world_id
+        return cached
 
+    row = db.get(SessionVars, session_id)
+    manager = AdvancedStateManager(
+        session_id,
+        world_id=cast(str, row.world_id) if row else world_id or DEFAULT_WORLD_ID,
+    )
+    _remember_db_snapshot(session_id, row)
 
-def get_spatial_navigator(db: Session) -> SpatialNavigator:
-    """Get or create a spatial navigator."""
-    # Use a single navigator per database connection
-    db_key = str(id(db))
-    if db_key not in _spatial_navigators:
-        # Pass the SQLAlchemy session directly
-        _spatial_navigators[db_key] = SpatialNavigator(db)
-    return _spatial_navigators[db_key]
-
-
-def get_state_manager(session_id: str, db: Session) -> AdvancedStateManager:
-    """Get or create a state manager for the session."""
-    if session_id not in _state_managers:
-        manager = AdvancedStateManager(session_id)
-
+    # Another worker may have saved a newer version; read it through
+    stored = _session_store.get(session_id) if version else None
+    if stored is not None:
+        manager.import_state(stored.state)
+        version = stored.version
+    else:
         # Load existing state from database if available
-        row = db.get(SessionVars, session_id)
         if row is not None and row.vars is not None:
             # Convert old vars format to new state format
             legacy_vars = cast(Dict[str, Any], row.vars or {})
@@ -50,9 +99,10 @@ def get_state_manager(session_id: str, db: Session) -> AdvancedStateManager:
             manager.variables.setdefault("danger", 0)
             manager.variables.setdefault("has_pickaxe", True)
 
-        _state_managers[session_id] = manager
+    _state_managers[session_id] = manager
+    _state_versions[session_id] = version
 
-    return _state_managers[session_id]
+    return manager
 
 
 def _norm_choices(c: Dict[str, Any]) -> ChoiceOut:
@@ -66,7 +116,13 @@ def _norm_choices(c: Dict[str, Any]) -> ChoiceOut:
 def api_next(payload: NextReq, db: Session = Depends(get_db)):
     """Get the next storylet for a session with Advanced State Management."""
     # Get the advanced state manager
-    state_manager = get_state_manager(payload.session_id, db)
+    state_manager = get_state_manager(payload.session_id, db, world_id=payload.world_id)
+    if payload.world_id and payload.world_id != state_manager.world_id:
+        # Moving a session would carry its variables into another world
+        raise HTTPException(
+            status_code=409,
+            detail=f"Session belongs to world '{state_manager.world_id}'",
+        )
 
     # Update state with any new variables from client
     for key, value in (payload.vars or {}).items():
@@ -105,15 +161,11 @@ def api_next(payload: NextReq, db: Session = Depends(get_db)):
 
 def pick_storylet_enhanced(
     db: Session, state_manager: AdvancedStateManager
-) -> Storylet | None:
+) -> CatalogStorylet | None:
     """Enhanced storylet picking using the new state manager."""
-    all_storylets = db.query(Storylet).all()
-    eligible = []
-
-    for storylet in all_storylets:
-        requirements = cast(Dict[str, Any], storylet.requires or {})
-        if state_manager.evaluate_condition(requirements):
-            eligible.append(storylet)
+    # Eligibility is cached per world catalog until the session state changes
+    catalog = world_catalogs.get(db, state_manager.world_id)
+    eligible = catalog.eligible_storylets(state_manager)
 
     if not eligible:
         return None
@@ -121,23 +173,116 @@ def pick_storylet_enhanced(
     # Use existing weight-based selection
     import random
 
-    weights = [max(0.0, cast(float, s.weight or 0.0)) for s in eligible]
+    weights = [max(0.0, s.weight or 0.0) for s in eligible]
     return random.choices(eligible, weights=weights, k=1)[0]
 
 
+def _remember_db_snapshot(session_id: str, row: SessionVars | None):
+    """Record the persisted version/vars that the next save must build on."""
+    if row is None:
+        _db_snapshots[session_id] = (None, {})
+    else:
+        _db_snapshots[session_id] = (
+            cast(int, row.version or 0),
+            copy.deepcopy(cast(Dict[str, Any], row.vars or {})),
+        )
+
+
+def _forget_session(session_id: str):
+    _state_managers.pop(session_id, None)
+    _state_versions.pop(session_id, None)
+    _db_snapshots.pop(session_id, None)
+    world_catalogs.forget_session(session_id)
+
+
 def save_state_to_db(state_manager: AdvancedStateManager, db: Session):
-    """Save the enhanced state back to the database."""
+    """
+    Save the enhanced state back to the database.
+
+    Uses compare-and-swap on ``session_vars.version``. If another request saved
+    first, non-conflicting variable changes are merged onto the latest row and
+    the write is retried; conflicting changes to the same key raise 409.
+    """
     session_id = state_manager.session_id
+    if session_id not in _db_snapshots:
+        _remember_db_snapshot(session_id, db.get(SessionVars, session_id))
+    base_version, base_vars = _db_snapshots[session_id]
+
+    for _ in range(_SAVE_MAX_RETRIES):
+        # For now, save just the basic variables (could extend to save full state)
+        new_vars = copy.deepcopy(state_manager.variables)
+        if base_version is None:
+            try:
+                db.execute(
+                    insert(SessionVars).values(
+                        session_id=session_id,
+                        world_id=state_manager.world_id,
+                        vars=new_vars,
+                        version=1,
+                    )
+                )
+                db.commit()
+                saved = True
+            except IntegrityError:
+                db.rollback()
+                saved = False
+        else:
+            result = db.execute(
+                update(SessionVars)
+                .where(
+                    SessionVars.session_id == session_id,
+                    SessionVars.version == base_version,
+                )
+                .values(
+                    vars=new_vars,
+                    version=base_version + 1,
+                    world_id=state_manager.world_id,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            saved = result.rowcount == 1
 
-    # Get or create session vars row
-    row = db.get(SessionVars, session_id)
-    if row is None:
-        row = SessionVars(session_id=session_id, vars={})
-        db.add(row)
+        if saved:
+            _db_snapshots[session_id] = ((base_version or 0) + 1, new_vars)
+            break
+
+        # Lost the race: merge our changes onto the latest row and retry
+        latest = db.execute(
+            select(SessionVars.version, SessionVars.vars).where(
+                SessionVars.session_id == session_id
+            )
+        ).first()
+        if latest is None:
+            # Row was removed (e.g. reaped); recreate it from our state
+            base_version, base_vars = None, {}
+            continue
+        their_version = cast(int, latest.version)
+        their_vars = dict(latest.vars or {})
+        merged, conflicts = merge_variable_changes(
+            base_vars, state_manager.variables, their_vars
+        )
+        if conflicts:
+            _forget_session(session_id)
+            logging.warning(
+                f"⚠️ Concurrent update conflict for session {session_id}: {conflicts}"
+            )
+            raise HTTPException(
+                status_code=409,
+                detail=f"Concurrent update conflict on: {', '.join(conflicts)}",
+            )
+        state_manager.replace_variables(merged)
+        base_version, base_vars = their_version, their_vars
+    else:
+        _forget_session(session_id)
+        raise HTTPException(
+            status_code=409, detail="Session is being updated concurrently; retry"
+        )
 
-    # For now, save just the basic variables (could extend to save full state)
-    row.vars = state_manager.variables  # type: ignore
-    db.commit()
+    # Write the full state through to the shared store for other workers
+    _state_versions[session_id] = _session_store.put(
+        session_id, state_manager.export_state()
+    )
 
 
 @router.get("/state/{session_id}")
@@ -234,53 +379,40 @@ def _seed_if_test_db():
 _seed_if_test_db()
 
 
-@router.post("/cleanup-sessions")
-def cleanup_old_sessions(db: Session = Depends(get_db)):
-    """Clean up sessions older than 24 hours."""
-    from datetime import datetime, timedelta, timezone
-    from sqlalchemy import text
+def _evict_cached_sessions(session_ids: List[str]) -> int:
+    """Drop cached state managers for sessions removed from the database."""
+    removed = 0
+    for session_id in session_ids:
+        _state_versions.pop(session_id, None)
+        _db_snapshots.pop(session_id, None)
+        world_catalogs.forget_session(session_id)
+        _spatial_navigators.forget_session(session_id)
+        if _state_managers.pop(session_id, None) is not None:
+            removed += 1
+    _session_store.delete(session_ids)
+    return removed
 
-    try:
-        # Calculate cutoff time (24 hours ago)
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
-
-        # Get session IDs that will be deleted (for precise cache cleanup)
-        sessions_to_delete_result = db.execute(
-            text("SELECT session_id FROM session_vars WHERE updated_at < :cutoff"),
-            {"cutoff": cutoff_time},
-        ).fetchall()
-
-        # Extract the actual session IDs
-        deleted_session_ids = [row[0] for row in sessions_to_delete_result]
-        sessions_to_delete_count = len(deleted_session_ids)
-
-        # Delete old sessions
-        result = db.execute(
-            text("DELETE FROM session_vars WHERE updated_at < :cutoff"),
-            {"cutoff": cutoff_time},
-        )
 
-        db.commit()
+# Background reaper for expired sessions; started from the app lifespan
+session_reaper = SessionReaper(evict=_evict_cached_sessions)
 
-        # Clear state manager cache for deleted sessions (precise matching)
-        global _state_managers
-        removed_from_cache = 0
 
-        # Remove only the specific session IDs that were deleted from the database
-        for session_id in deleted_session_ids:
-            if session_id in _state_managers:
-                _state_managers.pop(session_id, None)
-                removed_from_cache += 1
+@router.post("/cleanup-sessions")
+def cleanup_old_sessions(db: Session = Depends(get_db)):
+    """Clean up sessions older than the retention window (default 24 hours)."""
+    try:
+        stats = session_reaper.run_once(db, trigger="manual")
 
         logging.info(
-            f"🧹 Cleaned up {sessions_to_delete_count} old sessions ({removed_from_cache} removed from cache)"
+            f"🧹 Cleaned up {stats.sessions_removed} old sessions ({stats.cache_entries_removed} removed from cache)"
         )
 
         return {
             "success": True,
-            "sessions_removed": sessions_to_delete_count,
-            "cache_entries_removed": removed_from_cache,
-            "message": f"Cleaned up {sessions_to_delete_count} sessions older than 24 hours",
+            "sessions_removed": stats.sessions_removed,
+            "cache_entries_removed": stats.cache_entries_removed,
+            "chunks": stats.chunks,
+            "message": f"Cleaned up {stats.sessions_removed} sessions older than {session_reaper.retention_hours:g} hours",
         }
 
     except Exception as e:
@@ -289,16 +421,37 @@ def cleanup_old_sessions(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Session cleanup failed: {str(e)}")
 
 
+@router.get("/admin/session-reaper")
+def get_session_reaper_stats():
+    """Get session reaper configuration and per-run statistics."""
+    return session_reaper.get_stats()
+
+
+@router.get("/admin/llm-usage")
+def get_llm_usage_stats():
+    """Get prompt and completion token counts for recent LLM calls."""
+    return llm_usage.get_stats()
+
+
+@router.get("/admin/llm-guard")
+def get_llm_guard_stats():
+    """Get LLM concurrency, deadline and circuit breaker state and transitions."""
+    return get_llm_guard().get_stats()
+
+
 @router.get("/spatial/navigation/{session_id}")
 def get_spatial_navigation(session_id: str, db: Session = Depends(get_db)):
     """Get 8-directional navigation options from current location."""
     try:
         state_manager = get_state_manager(session_id, db)
-        spatial_nav = get_spatial_navigator(db)
+        world_id = state_manager.world_id
+        spatial_nav = get_spatial_navigator(db, world_id)
         current_location = state_manager.get_variable("location", "start")
         logging.info(f"📍 Current location: {current_location}")
         available_storylets = (
-            db.query(Storylet).filter(Storylet.requires.isnot(None)).all()
+            db.query(Storylet)
+            .filter(Storylet.world_id == world_id, Storylet.requires.isnot(None))
+            .all()
         )
         valid_locations = set()
         for s in available_storylets:
@@ -326,7 +479,10 @@ def get_spatial_navigation(session_id: str, db: Session = Depends(get_db)):
             current_location = new_location
         current_storylet = (
             db.query(Storylet)
-            .filter(Storylet.requires.contains(f'"location": "{current_location}"'))
+            .filter(
+                Storylet.world_id == world_id,
+                Storylet.requires.contains(f'"location": "{current_location}"'),
+            )
             .first()
         )
         if not current_storylet:
@@ -347,7 +503,11 @@ def get_spatial_navigation(session_id: str, db: Session = Depends(get_db)):
                 available_directions[direction] = None
             else:
                 can_access = spatial_nav.can_move_to_direction(
-                    current_id, direction, player_vars
+                    current_id,
+                    direction,
+                    player_vars,
+                    session_id=session_id,
+                    state_revision=state_manager.state_revision,
                 )
                 available_directions[direction] = {
                     **target,
@@ -389,7 +549,8 @@ def move_in_direction(
         )
 
         state_manager = get_state_manager(session_id, db)
-        spatial_nav = get_spatial_navigator(db)
+        world_id = state_manager.world_id
+        spatial_nav = get_spatial_navigator(db, world_id)
 
         # Validate direction from either JSON or query
         if direction is None and payload is not None:
@@ -421,7 +582,10 @@ def move_in_direction(
         # First try: exact location match
         current_storylet = (
             db.query(Storylet)
-            .filter(Storylet.requires.contains(f'"location": "{current_location}"'))
+            .filter(
+                Storylet.world_id == world_id,
+                Storylet.requires.contains(f'"location": "{current_location}"'),
+            )
             .first()
         )
 
@@ -454,7 +618,13 @@ def move_in_direction(
 
         # Check if movement is allowed
         player_vars = state_manager.get_contextual_variables()
-        if not spatial_nav.can_move_to_direction(current_id, direction, player_vars):
+        if not spatial_nav.can_move_to_direction(
+            current_id,
+            direction,
+            player_vars,
+            session_id=session_id,
+            state_revision=state_manager.state_revision,
+        ):
             logging.warning(f"⛔ Movement blocked: {direction}")
             raise HTTPException(status_code=403, detail="Cannot move in that direction")
 
@@ -500,20 +670,198 @@ def move_in_direction(
         raise HTTPException(status_code=500, detail=f"Movement failed: {str(e)}")
 
 
-@router.get("/spatial/map")
-def get_spatial_map(db: Session = Depends(get_db)):
-    """Get the full spatial map data for rendering."""
+def _positioned_storylet_for_location(
+    db: Session, spatial_nav: SpatialNavigator, world_id: str, location: str
+) -> int | None:
+    """Id of a positioned storylet set at ``location`` in the world."""
+    candidates = (
+        db.query(Storylet.id)
+        .filter(
+            Storylet.world_id == world_id,
+            Storylet.requires.contains(f'"location": "{location}"'),
+        )
+        .all()
+    )
+    for (storylet_id,) in candidates:
+        if storylet_id in spatial_nav.storylet_positions:
+            return storylet_id
+    return None
+
+
+@router.get("/spatial/path/{session_id}")
+def get_spatial_path(
+    session_id: str,
+    to: str = Query(..., description="Target storylet id or location name"),
+    db: Session = Depends(get_db),
+):
+    """Find the cheapest route the player can walk to a storylet or location."""
     try:
-        spatial_nav = get_spatial_navigator(db)
-        map_data = spatial_nav.get_spatial_map_data()
-        storylets = []
-        for s in map_data.get("storylets", []):
-            storylets.append({
-                "id": s["id"],
-                "title": s["title"],
-                "position": s["position"]
+        state_manager = get_state_manager(session_id, db)
+        world_id = state_manager.world_id
+        spatial_nav = get_spatial_navigator(db, world_id)
+
+        current_location = state_manager.get_variable("location", "start")
+        start_id = _positioned_storylet_for_location(
+            db, spatial_nav, world_id, current_location
+        )
+        if start_id is None:
+            raise HTTPException(
+                status_code=404, detail="Current location is not on the map"
+            )
+
+        if to.isdigit():
+            goal_id: int | None = int(to)
+        else:
+            goal_id = _positioned_storylet_for_location(db, spatial_nav, world_id, to)
+        if goal_id is None or goal_id not in spatial_nav.storylet_positions:
+            raise HTTPException(status_code=404, detail="Target is not on the map")
+
+        result = spatial_nav.find_path(
+            start_id, goal_id, state_manager.get_contextual_variables()
+        )
+        if result is None:
+            raise HTTPException(status_code=404, detail="No accessible route to target")
+
+        summaries = spatial_nav.get_storylet_summaries(result.route)
+        route = []
+        for storylet_id in result.route:
+            position = spatial_nav.storylet_positions[storylet_id]
+            route.append({
+                "id": storylet_id,
+                "title": summaries.get(storylet_id, {}).get("title"),
+                "position": {"x": position.x, "y": position.y},
             })
-        return {"storylets": storylets}
+        return {
+            "from": start_id,
+            "to": goal_id,
+            "route": route,
+            "steps": len(route) - 1,
+            "cost": round(result.cost, 4),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"❌ Pathfinding failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Pathfinding failed: {str(e)}")
+
+
+@router.get("/spatial/nearby/{session_id}")
+def get_nearby_storylets(
+    session_id: str,
+    radius: float = Query(3.0, gt=0, le=256, description="Euclidean grid distance"),
+    limit: int | None = Query(None, ge=1, le=500, description="Nearest k only"),
+    db: Session = Depends(get_db),
+):
+    """List storylets within ``radius`` of the player's position, nearest first."""
+    try:
+        state_manager = get_state_manager(session_id, db)
+        world_id = state_manager.world_id
+        spatial_nav = get_spatial_navigator(db, world_id)
+
+        current_location = state_manager.get_variable("location", "start")
+        current_id = _positioned_storylet_for_location(
+            db, spatial_nav, world_id, current_location
+        )
+        if current_id is None:
+            raise HTTPException(
+                status_code=404, detail="Current location is not on the map"
+            )
+        center = spatial_nav.storylet_positions[current_id]
+
+        # One extra so the current storylet can be dropped
+        hits = spatial_nav.nearby(
+            center, radius, limit + 1 if limit is not None else None
+        )
+        hits = [hit for hit in hits if hit[0] != current_id][:limit]
+
+        summaries = spatial_nav.get_storylet_summaries([sid for sid, _, _ in hits])
+        return {
+            "from": current_id,
+            "position": {"x": center.x, "y": center.y},
+            "radius": radius,
+            "storylets": [
+                {
+                    "id": storylet_id,
+                    "title": summaries.get(storylet_id, {}).get("title"),
+                    "position": {"x": pos.x, "y": pos.y},
+                    "distance": round(distance, 4),
+                }
+                for storylet_id, pos, distance in hits
+            ],
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"❌ Nearby storylet lookup failed: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Nearby storylet lookup failed: {str(e)}"
+        )
+
+
+def _encoded_response(payload: EncodedPayload, request: Request) -> Response:
+    """Serve a pre-encoded payload, honouring If-None-Match and gzip."""
+    headers = {"ETag": payload.etag, "Vary": "Accept-Encoding"}
+    if payload.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=payload.gzip_body, media_type="application/json", headers=headers
+        )
+    return Response(content=payload.body, media_type="application/json", headers=headers)
+
+
+def _parse_bbox(bbox: str) -> Tuple[int, int, int, int]:
+    """Parse a ``minx,miny,maxx,maxy`` query value."""
+    try:
+        min_x, min_y, max_x, max_y = (int(part) for part in bbox.split(","))
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="bbox must be four integers: minx,miny,maxx,maxy"
+        )
+    if min_x > max_x or min_y > max_y:
+        raise HTTPException(status_code=400, detail="bbox minimum exceeds maximum")
+    return min_x, min_y, max_x, max_y
+
+
+@router.get("/spatial/map")
+def get_spatial_map(
+    request: Request,
+    world_id: str = Query(default=DEFAULT_WORLD_ID),
+    encoding: Literal["rows", "columnar"] = Query(default="rows"),
+    bbox: str | None = Query(default=None),
+    zoom: int | None = Query(default=None, ge=0),
+    db: Session = Depends(get_db),
+):
+    """Get the spatial map data for rendering, optionally for one viewport."""
+    bounds = _parse_bbox(bbox) if bbox is not None else None
+    try:
+
+        def build_map() -> Dict[str, Any]:
+            spatial_nav = get_spatial_navigator(db, world_id)
+            if bounds is not None:
+                tile = spatial_nav.get_map_tile(*bounds, zoom=zoom)
+                if encoding == "columnar" and "storylets" in tile:
+                    tile.update(columnar_map(tile.pop("storylets")))
+                return tile
+            map_data = spatial_nav.get_spatial_map_data()
+            storylets = []
+            for s in map_data.get("storylets", []):
+                storylets.append({
+                    "id": s["id"],
+                    "title": s["title"],
+                    "position": s["position"]
+                })
+            if encoding == "columnar":
+                return columnar_map(storylets)
+            return {"storylets": storylets}
+
+        # Maps only change with the world's catalog version
+        version = world_catalogs.version(world_id)
+        payload = _spatial_map_cache.get_or_build(
+            (world_id, version, encoding, bounds, zoom), build_map
+        )
+        return _encoded_response(payload, request)
     except Exception as e:
         logging.error(f"❌ Map generation failed: {e}")
         raise HTTPException(status_code=500, detail=f"Map generation failed: {str(e)}")
@@ -524,12 +872,13 @@ def assign_spatial_positions(payload: dict = Body(...), db: Session = Depends(ge
     """Assign spatial positions to all storylets (useful after world generation)."""
     try:
         positions_payload = payload.get("positions", [])
-        valid_ids = {s.id for s in db.query(Storylet).all()}
+        world_id = payload.get("world_id") or DEFAULT_WORLD_ID
+        storylets = db.query(Storylet).filter(Storylet.world_id == world_id).all()
+        valid_ids = {s.id for s in storylets}
         for pos in positions_payload:
             if pos["storylet_id"] not in valid_ids:
                 raise HTTPException(status_code=404, detail=f"Storylet ID {pos['storylet_id']} not found")
-        spatial_nav = get_spatial_navigator(db)
-        storylets = db.query(Storylet).all()
+        spatial_nav = get_spatial_navigator(db, world_id)
         storylet_data = []
         for s in storylets:
             storylet_data.append(
@@ -540,6 +889,7 @@ def assign_spatial_positions(payload: dict = Body(...), db: Session = Depends(ge
                 }
             )
         positions = spatial_nav.assign_spatial_positions(storylet_data)
+        world_catalogs.invalidate(world_id)
         assigned = [
             {"storylet_id": int(storylet_id), "x": pos.x, "y": pos.y}
             for storylet_id, pos in positions.items()
@@ -5,7 +5,7 @@ defaults to test_database.db unless DW_DB_PATH is set.
 """
 
 from typing import Generator
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, func, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session, Session
 import os
 
@@ -37,6 +37,96 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+# Columns added after the initial schema. create_all() never alters existing
+# tables, so these are added in place on startup (idempotent).
+_ADDED_COLUMNS = {
+    "session_vars": {
+        "version": "INTEGER NOT NULL DEFAULT 0",
+        "world_id": "VARCHAR(64) NOT NULL DEFAULT 'default'",
+    },
+    "storylets": {"world_id": "VARCHAR(64) NOT NULL DEFAULT 'default'"},
+}
+
+
+def _add_missing_columns(bind=None):
+    """Add any columns from _ADDED_COLUMNS that an older database lacks."""
+    bind = bind or engine
+    inspector = inspect(bind)
+    with bind.begin() as conn:
+        for table, columns in _ADDED_COLUMNS.items():
+            if not inspector.has_table(table):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table)}
+            for name, ddl in columns.items():
+                if name not in existing:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+        if inspector.has_table("storylets"):
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_storylets_world_id "
+                    "ON storylets (world_id)"
+                )
+            )
+
+
+def _has_global_title_unique(conn) -> bool:
+    """Whether storylets still carries the pre-world UNIQUE(title)."""
+    # The inspector misses column-level UNIQUE, so ask SQLite directly
+    for index in conn.execute(text("PRAGMA index_list(storylets)")).mappings():
+        if not index["unique"]:
+            continue
+        columns = [
+            row["name"]
+            for row in conn.execute(
+                text(f'PRAGMA index_info("{index["name"]}")')
+            ).mappings()
+        ]
+        if columns == ["title"]:
+            return True
+    return False
+
+
+def _rebuild_storylets_table(bind=None):
+    """
+    Replace an older database's UNIQUE(title) with UNIQUE(world_id, title).
+
+    SQLite cannot drop a constraint, so the table is recreated from the
+    current model and its rows copied across (idempotent).
+    """
+    from .models import Storylet
+
+    bind = bind or engine
+    inspector = inspect(bind)
+    if not inspector.has_table("storylets"):
+        return
+    with bind.connect() as conn:
+        if not _has_global_title_unique(conn):
+            return
+    columns = [
+        col["name"]
+        for col in inspector.get_columns("storylets")
+        if col["name"] in Storylet.__table__.columns
+    ]
+    column_list = ", ".join(columns)
+    # Index names stay with the renamed table and would clash
+    indexes = [i["name"] for i in inspector.get_indexes("storylets") if i.get("name")]
+    with bind.begin() as conn:
+        conn.execute(text("ALTER TABLE storylets RENAME TO storylets_old"))
+        for name in indexes:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+        Storylet.__table__.create(conn)
+        conn.execute(
+            text(
+                f"INSERT INTO storylets ({column_list}) "
+                f"SELECT {column_list} FROM storylets_old"
+            )
+        )
+        conn.execute(text("DROP TABLE storylets_old"))
+    print("🔧 Rebuilt storylets table: titles are now unique per world")
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(engine)
+    _add_missing_columns()
+    _rebuild_storylets_table()
@@ -1,18 +1,39 @@
 """Database models."""
 
 from datetime import datetime
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String, Text, func
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from ..database import Base
 
+# World that storylets and sessions belong to unless one is given explicitly
+DEFAULT_WORLD_ID = "default"
+
 
 class Storylet(Base):
     """Model for interactive fiction storylets."""
 
     __tablename__ = "storylets"
+    # Title should be unique within a world to prevent accidental duplicates
+    __table_args__ = (UniqueConstraint("world_id", "title"),)
 
     id = Column(Integer, primary_key=True)
-    # Title should be unique to prevent accidental duplicate storylets
-    title = Column(String(200), nullable=False, unique=True)
+    world_id = Column(
+        String(64),
+        nullable=False,
+        default=DEFAULT_WORLD_ID,
+        server_default=DEFAULT_WORLD_ID,
+        index=True,
+    )
+    title = Column(String(200), nullable=False)
     text_template = Column(Text, nullable=False)
     requires = Column(JSON, default=dict)
     choices = Column(JSON, default=list)
@@ -26,5 +47,32 @@ class SessionVars(Base):
     __tablename__ = "session_vars"
 
     session_id = Column(String(64), primary_key=True)
+    world_id = Column(
+        String(64),
+        nullable=False,
+        default=DEFAULT_WORLD_ID,
+        server_default=DEFAULT_WORLD_ID,
+    )
     vars = Column(JSON, default=dict)
+    # Bumped on every save; used for compare-and-swap updates
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class Location(Base):
+    """Registered coordinates of a named location within a world."""
+
+    __tablename__ = "locations"
+    # Names are stored normalised (lower-cased, trimmed)
+    __table_args__ = (UniqueConstraint("world_id", "name"),)
+
+    id = Column(Integer, primary_key=True)
+    world_id = Column(
+        String(64),
+        nullable=False,
+        default=DEFAULT_WORLD_ID,
+        server_default=DEFAULT_WORLD_ID,
+    )
+    name = Column(String(200), nullable=False)
+    x = Column(Integer, nullable=False)
+    y = Column(Integer, nullable=False)
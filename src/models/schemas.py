@@ -1,6 +1,6 @@
 """Pydantic models for API schemas."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -9,6 +9,11 @@ class NextReq(BaseModel):
 
     session_id: str
     vars: Dict[str, Any]
+    world_id: Optional[str] = Field(
+        default=None,
+        max_length=64,
+        description="World for a new session; must match an existing session's world",
+    )
 
 
 class ChoiceOut(BaseModel):
@@ -100,3 +105,10 @@ class WorldDescription(BaseModel):
     storylet_count: int = Field(
         default=15, ge=5, le=50, description="Number of storylets to generate"
     )
+    world_id: str = Field(
+        default="default",
+        min_length=1,
+        max_length=64,
+        pattern=r"^[A-Za-z0-9_.-]+$",
+        description="World to (re)generate; other worlds are left untouched",
+    )
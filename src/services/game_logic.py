@@ -1,10 +1,11 @@
 """Core game logic and utilities."""
 
 import random
+from functools import partial
 from typing import Any, Dict, List, Optional, cast
 from sqlalchemy.orm import Session
 
-from ..models import Storylet
+from ..models import DEFAULT_WORLD_ID, Storylet
 
 
 class SafeDict(dict):
@@ -149,6 +150,7 @@ def auto_populate_storylets(db: Session, target_count: int = 20) -> int:
         return 0
 
     try:
+        from ..services.llm_fanout import fan_out, merge_storylets
         from ..services.llm_service import llm_suggest_storylets
 
         # Generate storylets with better thematic and logical coherence
@@ -200,30 +202,51 @@ def auto_populate_storylets(db: Session, target_count: int = 20) -> int:
             },
         ]
 
-        added_count = 0
-        for theme_set in themes_sets:
-            if current_count + added_count >= target_count:
-                break
+        needed = target_count - current_count
+        existing_titles = [
+            title
+            for (title,) in db.query(Storylet.title)
+            .filter(Storylet.world_id == DEFAULT_WORLD_ID)
+            .all()
+        ]
 
-            new_storylets = llm_suggest_storylets(
-                3, theme_set["themes"], theme_set["bible"]
+        # Ask only as many theme sets as the gap needs (3 storylets each),
+        # all at once; titles already in the catalog are skipped. Failed
+        # chunks or repeated titles are made up from the unused theme sets.
+        new_storylets: List[Dict[str, Any]] = []
+        remaining_sets = list(themes_sets)
+        while remaining_sets and len(new_storylets) < needed:
+            shortfall = needed - len(new_storylets)
+            round_count = -(-shortfall // 3)
+            theme_sets = remaining_sets[:round_count]
+            remaining_sets = remaining_sets[round_count:]
+            batches = fan_out(
+                [
+                    partial(
+                        llm_suggest_storylets, 3, theme_set["themes"], theme_set["bible"]
+                    )
+                    for theme_set in theme_sets
+                ]
+            )
+            new_storylets += merge_storylets(
+                batches,
+                limit=shortfall,
+                existing_titles=existing_titles + [s["title"] for s in new_storylets],
             )
 
-            for storylet_data in new_storylets:
-                if current_count + added_count >= target_count:
-                    break
-
-                new_storylet = Storylet(
-                    title=storylet_data.get("title", "Generated Story"),
-                    text_template=storylet_data.get(
-                        "text_template", "Something happens..."
-                    ),
-                    requires=storylet_data.get("requires", {}),
-                    choices=storylet_data.get("choices", []),
-                    weight=storylet_data.get("weight", 1.0),
-                )
-                db.add(new_storylet)
-                added_count += 1
+        added_count = 0
+        for storylet_data in new_storylets:
+            new_storylet = Storylet(
+                title=storylet_data.get("title", "Generated Story"),
+                text_template=storylet_data.get(
+                    "text_template", "Something happens..."
+                ),
+                requires=storylet_data.get("requires", {}),
+                choices=storylet_data.get("choices", []),
+                weight=storylet_data.get("weight", 1.0),
+            )
+            db.add(new_storylet)
+            added_count += 1
 
         db.commit()
 
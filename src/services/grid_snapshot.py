@@ -0,0 +1,194 @@
+"""Binary snapshot of a world's storylet grid, loaded through ``mmap``.
+
+Layout (little-endian)::
+
+    header   magic "DWGS", format version, row count, table size,
+             fingerprint (row count, max id, position checksum)
+    ids      int32[count]
+    xs       int32[count]
+    ys       int32[count]
+    table    int32[table size]  open-addressed cell hash -> row, -1 if empty
+
+A snapshot is a faster loader, not shared memory: ``SpatialNavigator``
+maps the file, copies every row into its own dicts and indexes, and closes
+the mapping, so each worker still holds a private copy of the grid. What it
+saves is the row transfer and JSON parsing of every ``position`` column;
+rebuilding the navigator's derived indexes (connectivity above all) costs
+the same either way. ``py_scripts/benchmark_grid_snapshot.py`` measured
+about 740 ms instead of 870 ms for 90,000 storylets, and 97 ms instead of
+122 ms for 10,000.
+
+A snapshot records a fingerprint of the rows it was built from; callers
+compare it with ``position_fingerprint`` (one aggregate query over the
+world's rows, about 50 ms at 90,000) and fall back to the database when it
+no longer matches. The cell hash table lets tools look up single cells
+(``storylet_at``) without reading the arrays; the navigator does not use it.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+Fingerprint = Tuple[int, int, float]
+
+MAGIC = b"DWGS"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIIIqqd")
+_EMPTY = -1
+
+
+def position_fingerprint(db: Session, world_id: Optional[str] = None) -> Fingerprint:
+    """
+    Cheap summary of a world's positions, computed inside the database.
+
+    Any added, removed or moved storylet changes it (up to checksum
+    collisions), without transferring or parsing the rows themselves.
+    """
+    query = """
+        SELECT COUNT(*), COALESCE(MAX(id), 0),
+               TOTAL((json_extract(position, '$.x') * 7919
+                      + json_extract(position, '$.y')) * (id % 104729 + 1))
+        FROM storylets
+        WHERE position IS NOT NULL
+    """
+    params: Dict[str, str] = {}
+    if world_id is not None:
+        query += " AND world_id = :world_id"
+        params["world_id"] = world_id
+    count, max_id, checksum = db.execute(text(query), params).one()
+    return (int(count), int(max_id), float(checksum or 0.0))
+
+
+def _cell_hash(x: int, y: int, mask: int) -> int:
+    return ((x * 73856093) ^ (y * 19349663)) & mask
+
+
+def _table_size(count: int) -> int:
+    size = 8
+    while size < count * 2:
+        size *= 2
+    return size
+
+
+def write_snapshot(
+    path: str, positions: Dict[int, Tuple[int, int]], fingerprint: Fingerprint
+):
+    """Write ``positions`` (id -> (x, y)) atomically to ``path``."""
+    rows = sorted(positions.items())
+    ids = array("i", (storylet_id for storylet_id, _ in rows))
+    xs = array("i", (cell[0] for _, cell in rows))
+    ys = array("i", (cell[1] for _, cell in rows))
+    size = _table_size(len(rows))
+    mask = size - 1
+    table = array("i", [_EMPTY]) * size
+    for row, (_, (x, y)) in enumerate(rows):
+        slot = _cell_hash(x, y, mask)
+        while table[slot] != _EMPTY:
+            slot = (slot + 1) & mask
+        table[slot] = row
+    if sys.byteorder != "little":
+        for part in (ids, xs, ys, table):
+            part.byteswap()
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(rows), size, fingerprint[0], fingerprint[1], fingerprint[2]
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Write beside the target and rename, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(header)
+            for part in (ids, xs, ys, table):
+                part.tofile(handle)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class GridSnapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little" or array("i").itemsize != 4:
+            raise ValueError("grid snapshots need a little-endian 32-bit int platform")
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, count, size, fp_count, fp_max_id, fp_checksum = (
+                _HEADER.unpack_from(self._mmap, 0)
+            )
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a grid snapshot")
+            if len(self._mmap) != _HEADER.size + 4 * (3 * count + size):
+                raise ValueError(f"{path} is truncated")
+        except Exception:
+            self._mmap.close()
+            raise
+        self.count = count
+        self.fingerprint: Fingerprint = (fp_count, fp_max_id, fp_checksum)
+        self._mask = size - 1
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+
+        def section(length: int) -> memoryview:
+            nonlocal offset
+            part = view[offset : offset + 4 * length].cast("i")
+            offset += 4 * length
+            return part
+
+        self.ids = section(count)
+        self.xs = section(count)
+        self.ys = section(count)
+        self._table = section(size)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "GridSnapshot":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for part in ("ids", "xs", "ys", "_table"):
+            getattr(self, part).release()
+        self._mmap.close()
+
+    def items(self) -> Iterator[Tuple[int, int, int]]:
+        """(id, x, y) for every row, in id order."""
+        return zip(self.ids, self.xs, self.ys)
+
+    def storylet_at(self, x: int, y: int) -> Optional[int]:
+        """Id of the storylet occupying (x, y), if any."""
+        table, mask = self._table, self._mask
+        slot = _cell_hash(x, y, mask)
+        while True:
+            row = table[slot]
+            if row == _EMPTY:
+                return None
+            if self.xs[row] == x and self.ys[row] == y:
+                return self.ids[row]
+            slot = (slot + 1) & mask
+
+
+def load_snapshot(path: str) -> Optional[GridSnapshot]:
+    """Open ``path`` if it holds a readable snapshot, else None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return GridSnapshot(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"⚠️ Warning: Ignoring unreadable grid snapshot {path}: {e}")
+        return None
@@ -0,0 +1,110 @@
+"""Incremental parsing of a JSON array that arrives in pieces.
+
+Streamed completions deliver a JSON array of storylets a few characters at
+a time. ``JSONArrayStream`` tracks string and nesting state across pieces
+and hands back each top-level element as soon as its closing bracket
+arrives, so callers can act on the first storylet long before the last one
+is written. Text before the opening ``[`` (prose, code fences) is skipped.
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Only these characters change parser state; everything else is copied through
+_STRUCTURAL = re.compile(r'[\[\]{}"\\]')
+_CONTROL_CHARS = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+
+
+class JSONArrayStream:
+    """Feed text pieces in; get back completed top-level array elements."""
+
+    def __init__(self):
+        self.started = False
+        self.done = False
+        self.skipped = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Text of the element in progress, from earlier pieces
+        self._pending: List[str] = []
+
+    def feed(self, text: str) -> List[Any]:
+        elements: List[Any] = []
+        if self.done or not text:
+            return elements
+        # Offset in ``text`` where the element in progress starts, if any
+        start: Optional[int] = 0 if self._depth else None
+        i = 0
+        if self._escape:
+            # The previous piece ended on a backslash inside a string
+            self._escape = False
+            i = 1
+
+        while True:
+            match = _STRUCTURAL.search(text, i)
+            if match is None:
+                break
+            char = match.group()
+            i = match.end()
+
+            if self._in_string:
+                if char == "\\":
+                    if i >= len(text):
+                        self._escape = True
+                        break
+                    i += 1
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if not self.started:
+                # Quotes in leading prose are not JSON strings
+                if char == "[":
+                    self.started = True
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 0:
+                    start = match.start()
+                self._depth += 1
+            elif char in "]}":
+                if self._depth == 0:
+                    if char == "]":
+                        self.done = True
+                        break
+                    continue
+                self._depth -= 1
+                if self._depth == 0 and start is not None:
+                    self._pending.append(text[start:i])
+                    element = self._parse("".join(self._pending))
+                    self._pending = []
+                    start = None
+                    if element is not None:
+                        elements.append(element)
+
+        if self._depth and start is not None:
+            self._pending.append(text[start:])
+        return elements
+
+    def _parse(self, fragment: str) -> Any:
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError:
+            pass
+        try:
+            # Models sometimes emit raw control characters inside strings
+            return json.loads(_CONTROL_CHARS.sub("", fragment))
+        except json.JSONDecodeError as e:
+            self.skipped += 1
+            print(f"⚠️ Skipping unparseable array element: {e}")
+            return None
+
+
+def iter_json_array(pieces: Iterable[str]) -> Iterator[Any]:
+    """Yield elements of the JSON array spread over ``pieces`` as they complete."""
+    parser = JSONArrayStream()
+    for piece in pieces:
+        yield from parser.feed(piece)
+        if parser.done:
+            break
@@ -0,0 +1,300 @@
+"""Graph-aware placement of locations on the integer grid.
+
+Choices that ``set`` a new ``location`` imply a transition graph between
+locations. This lays that graph out with a force-directed simulation
+(Fruchterman-Reingold) and then snaps it to grid cells so that connected
+locations end up adjacent where there is room.
+
+Repulsion is only computed between nodes in neighbouring bins of a spatial
+hash, so each iteration is linear in the number of nodes and edges rather
+than quadratic.
+"""
+
+import hashlib
+import math
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .occupancy import OccupancyGrid
+
+Cell = Tuple[int, int]
+Graph = Dict[str, Set[str]]
+
+_NEIGHBOUR_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def location_transition_graph(storylets: Iterable[Dict]) -> Graph:
+    """
+    Undirected graph of locations joined by choices that change location.
+
+    Names are normalised (lower-cased, trimmed). Every location a storylet
+    requires is a node, even without edges.
+    """
+    graph: Graph = {}
+    for storylet in storylets:
+        location = (storylet.get("requires") or {}).get("location")
+        if not isinstance(location, str):
+            continue
+        source = location.lower().strip()
+        graph.setdefault(source, set())
+        for choice in storylet.get("choices") or []:
+            if not isinstance(choice, dict):
+                continue
+            set_vars = choice.get("set") or choice.get("set_vars") or {}
+            target = set_vars.get("location") if isinstance(set_vars, dict) else None
+            if not isinstance(target, str):
+                continue
+            target = target.lower().strip()
+            if target and target != source:
+                graph[source].add(target)
+                graph.setdefault(target, set()).add(source)
+    return graph
+
+
+def _jitter(name: str) -> Tuple[float, float]:
+    """Deterministic offset in [-0.5, 0.5) for breaking symmetric starts."""
+    digest = hashlib.md5(name.encode()).digest()
+    return (digest[0] / 256 - 0.5, digest[1] / 256 - 0.5)
+
+
+def _components(graph: Graph, roots_first: Iterable[str] = ()) -> List[List[str]]:
+    """
+    Connected components, each in breadth-first order from its best-connected
+    node (or from a node in ``roots_first``).
+    """
+    components: List[List[str]] = []
+    seen: Set[str] = set()
+    roots = sorted(roots_first) + sorted(graph, key=lambda name: (-len(graph[name]), name))
+    for root in roots:
+        if root in seen:
+            continue
+        seen.add(root)
+        order = [root]
+        queue = deque([root])
+        while queue:
+            name = queue.popleft()
+            for neighbour in sorted(graph[name]):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    order.append(neighbour)
+                    queue.append(neighbour)
+        components.append(order)
+    return components
+
+
+def _radial_start(
+    graph: Graph, seeds: Dict[str, Tuple[float, float]], k: float
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Radial layout of each component's breadth-first tree.
+
+    Children share their parent's angular wedge in proportion to subtree
+    size, one ring per depth, so the force simulation starts close to an
+    untangled layout and needs few iterations.
+    """
+    start: Dict[str, Tuple[float, float]] = {}
+    components = _components(graph)
+    # Components without a seed are spread along a line next to the origin
+    offset = 0.0
+    for order in components:
+        root = order[0]
+        parent: Dict[str, Optional[str]] = {root: None}
+        depth = {root: 0}
+        children: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for neighbour in sorted(graph[name]):
+                if neighbour not in parent:
+                    parent[neighbour] = name
+                    depth[neighbour] = depth[name] + 1
+                    children[name].append(neighbour)
+        size = {name: 1 for name in order}
+        for name in reversed(order):
+            if parent[name] is not None:
+                size[parent[name]] += size[name]
+
+        radius = max(depth.values()) * k
+        if root in seeds:
+            cx, cy = seeds[root]
+            # Keep seeded components apart in proportion to their extent
+            cx, cy = cx * (radius + k), cy * (radius + k)
+        else:
+            cx, cy = offset + radius, 0.0
+            offset += 2 * radius + 2 * k
+
+        wedge = {root: (0.0, 2 * math.pi)}
+        for name in order:
+            low, high = wedge[name]
+            r = depth[name] * k
+            angle = (low + high) / 2
+            start[name] = (cx + r * math.cos(angle), cy + r * math.sin(angle))
+            cursor = low
+            for child in children[name]:
+                share = (high - low) * size[child] / max(1, size[name] - 1)
+                wedge[child] = (cursor, cursor + share)
+                cursor += share
+    return start
+
+
+def force_directed_layout(
+    graph: Graph,
+    seeds: Optional[Dict[str, Tuple[float, float]]] = None,
+    iterations: Optional[int] = None,
+    ideal_length: float = 1.0,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Continuous coordinates for every node of ``graph``.
+
+    ``seeds`` places components by their best-connected node (for example
+    keyword-based direction hints). By default larger graphs get fewer
+    iterations, keeping the cost roughly flat. Results are deterministic.
+    """
+    names = sorted(graph)
+    n = len(names)
+    if n == 0:
+        return {}
+    if iterations is None:
+        iterations = max(8, min(50, 40000 // n))
+    index = {name: i for i, name in enumerate(names)}
+    edges = [
+        (index[a], index[b]) for a in names for b in graph[a] if index[a] < index[b]
+    ]
+    k = ideal_length
+    k2 = k * k
+
+    start = _radial_start(graph, seeds or {}, k)
+    xs: List[float] = []
+    ys: List[float] = []
+    for name in names:
+        jx, jy = _jitter(name)
+        xs.append(start[name][0] + jx * k / 4)
+        ys.append(start[name][1] + jy * k / 4)
+
+    temperature = 2 * k
+    cooling = temperature / (iterations + 1)
+    bin_size = 1.5 * k
+    cutoff2 = bin_size * bin_size
+    # Each pair of bins is visited once: the bin itself plus half its neighbours
+    forward = [(1, -1), (1, 0), (1, 1), (0, 1)]
+
+    for _ in range(iterations):
+        dx = [0.0] * n
+        dy = [0.0] * n
+
+        # Repulsion between nearby nodes, found through a spatial hash
+        bins: Dict[Cell, List[int]] = {}
+        for i in range(n):
+            bins.setdefault((int(xs[i] // bin_size), int(ys[i] // bin_size)), []).append(i)
+        for (bx, by), members in bins.items():
+            others = [(members, True)]
+            for ox, oy in forward:
+                other = bins.get((bx + ox, by + oy))
+                if other:
+                    others.append((other, False))
+            for position, i in enumerate(members):
+                xi, yi = xs[i], ys[i]
+                for group, same_bin in others:
+                    for j in group[position + 1 :] if same_bin else group:
+                        ddx = xi - xs[j]
+                        ddy = yi - ys[j]
+                        d2 = ddx * ddx + ddy * ddy
+                        if d2 >= cutoff2:
+                            continue
+                        if d2 < 1e-9:
+                            ddx, ddy = _jitter(f"{i}:{j}")
+                            d2 = ddx * ddx + ddy * ddy
+                        # |F| = k^2 / d along the unit vector
+                        scale = k2 / d2
+                        fx = ddx * scale
+                        fy = ddy * scale
+                        dx[i] += fx
+                        dy[i] += fy
+                        dx[j] -= fx
+                        dy[j] -= fy
+
+        # Attraction along edges: |F| = d^2 / k
+        for i, j in edges:
+            ddx = xs[i] - xs[j]
+            ddy = ys[i] - ys[j]
+            scale = math.sqrt(ddx * ddx + ddy * ddy) / k
+            fx = ddx * scale
+            fy = ddy * scale
+            dx[i] -= fx
+            dy[i] -= fy
+            dx[j] += fx
+            dy[j] += fy
+
+        # Move at most the current temperature
+        for i in range(n):
+            length = math.sqrt(dx[i] * dx[i] + dy[i] * dy[i])
+            if length > 1e-9:
+                step = min(length, temperature) / length
+                xs[i] += dx[i] * step
+                ys[i] += dy[i] * step
+        temperature = max(temperature - cooling, k / 10)
+
+    return {name: (xs[i], ys[i]) for i, name in enumerate(names)}
+
+
+def _placement_order(graph: Graph, fixed: Iterable[str] = ()) -> List[str]:
+    """Breadth-first from fixed nodes, then from each component's best-connected node."""
+    return [name for order in _components(graph, fixed) for name in order]
+
+
+def snap_to_grid(
+    graph: Graph,
+    coordinates: Dict[str, Tuple[float, float]],
+    occupancy: Optional[OccupancyGrid] = None,
+    fixed: Optional[Dict[str, Cell]] = None,
+) -> Dict[str, Cell]:
+    """
+    Give every node its own grid cell, close to its layout coordinates.
+
+    A node goes next to an already placed neighbour if one has a free
+    adjacent cell; otherwise to the nearest free cell. ``fixed`` nodes keep
+    their cells, and their neighbours are placed first. ``occupancy`` holds
+    cells that are already taken and is updated in place.
+    """
+    occupancy = occupancy if occupancy is not None else OccupancyGrid()
+    cells: Dict[str, Cell] = dict(fixed or {})
+    for cell in cells.values():
+        occupancy.occupy(cell)
+    for name in _placement_order(graph, cells):
+        if name in cells:
+            continue
+        fx, fy = coordinates[name]
+        target = (round(fx), round(fy))
+        best: Optional[Cell] = None
+        best_distance = math.inf
+        for neighbour in graph[name]:
+            placed = cells.get(neighbour)
+            if placed is None:
+                continue
+            for ox, oy in _NEIGHBOUR_OFFSETS:
+                cell = (placed[0] + ox, placed[1] + oy)
+                if cell in occupancy:
+                    continue
+                distance = (cell[0] - fx) ** 2 + (cell[1] - fy) ** 2
+                if distance < best_distance:
+                    best, best_distance = cell, distance
+        if best is None:
+            best = occupancy.nearest_free(*target)
+        occupancy.occupy(best)
+        cells[name] = best
+    return cells
+
+
+def layout_locations(
+    graph: Graph,
+    seeds: Optional[Dict[str, Tuple[float, float]]] = None,
+    occupied: Iterable[Cell] = (),
+    fixed: Optional[Dict[str, Cell]] = None,
+    iterations: Optional[int] = None,
+) -> Dict[str, Cell]:
+    """
+    Lay out ``graph`` and snap it to free grid cells.
+
+    ``fixed`` nodes (already placed locations) keep their cells; the rest
+    avoid ``occupied`` cells.
+    """
+    coordinates = force_directed_layout(graph, seeds, iterations=iterations)
+    return snap_to_grid(graph, coordinates, OccupancyGrid(occupied), fixed)
@@ -0,0 +1,204 @@
+"""Disk-backed cache of chat-completion responses.
+
+Entries are keyed by a hash of the model, sampling settings and the
+canonicalized messages, so identical (or whitespace-different) generation
+requests are answered from SQLite instead of the API. The cache is bounded
+by entry count and total size, evicting least recently used entries, and
+entries expire after a TTL.
+
+Sampled calls are cached too: world and suggestion generation run at
+temperature 0.7/0.8, yet an identical request replays the same stored output
+until its entry expires. Repeated auto-population of the same world therefore
+yields nothing new within the TTL once duplicate titles are dropped; set
+``DW_LLM_CACHE=0`` or a short ``DW_LLM_CACHE_TTL_SECONDS`` when fresh variety
+matters.
+
+Settings: ``DW_LLM_CACHE`` (``0`` disables), ``DW_LLM_CACHE_PATH`` (defaults to
+``db/llm_cache.db`` in the project root), ``DW_LLM_CACHE_TTL_SECONDS``,
+``DW_LLM_CACHE_MAX_ENTRIES``, ``DW_LLM_CACHE_MAX_BYTES``.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "db",
+    "llm_cache.db",
+)
+
+
+def _canonical_content(content: Any) -> Any:
+    if isinstance(content, str):
+        # Collapse whitespace so re-indented JSON prompts share an entry
+        return " ".join(content.split())
+    return content
+
+
+def cache_key(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: Optional[float] = None,
+    **options: Any,
+) -> str:
+    """Content address of one chat-completion request."""
+    canonical = {
+        "model": model,
+        "temperature": temperature,
+        "options": {k: v for k, v in options.items() if v is not None},
+        "messages": [
+            {"role": m.get("role"), "content": _canonical_content(m.get("content"))}
+            for m in messages
+        ],
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed LRU of completion texts with a TTL and size caps."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: float = 86400,
+        max_entries: int = 5000,
+        max_bytes: int = 50 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL commits without fsync; a crash can only lose recent cache entries
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_cache_last_used ON llm_cache (last_used)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            content, created_at = row
+            if now - created_at >= self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return content
+
+    def put(self, key: str, content: str):
+        size = len(content.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, content, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones over the caps."""
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE created_at <= ?",
+            (time.time() - self.ttl_seconds,),
+        )
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), TOTAL(size) FROM llm_cache"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY last_used"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """The process-wide response cache, or None when disabled."""
+    global _cache
+    if os.getenv("DW_LLM_CACHE", "1") == "0":
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(
+                    os.getenv("DW_LLM_CACHE_PATH", DEFAULT_CACHE_PATH),
+                    ttl_seconds=float(os.getenv("DW_LLM_CACHE_TTL_SECONDS", "86400")),
+                    max_entries=int(os.getenv("DW_LLM_CACHE_MAX_ENTRIES", "5000")),
+                    max_bytes=int(
+                        os.getenv("DW_LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024))
+                    ),
+                )
+    return _cache
+
+
+def reset_llm_cache():
+    """Close the shared cache; the next lookup reopens it from current settings."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
@@ -0,0 +1,276 @@
+"""Process-wide OpenAI client with a pooled, keep-alive HTTP connection.
+
+Creating an ``OpenAI`` client per call pays DNS, TCP and TLS setup every
+time. One client is created lazily per process and shared by every caller;
+its connection pool and timeouts are tuned through environment variables:
+
+- ``DW_LLM_BASE_URL`` (or ``OPENAI_BASE_URL``): point at any OpenAI-compatible
+  server, e.g. ``py_scripts/openai_stub_server.py`` for offline runs
+- ``DW_LLM_TIMEOUT_SECONDS`` / ``DW_LLM_CONNECT_TIMEOUT_SECONDS``
+- ``DW_LLM_MAX_CONNECTIONS`` / ``DW_LLM_MAX_KEEPALIVE``
+
+Concurrency, per-call deadlines and the circuit breaker are configured in
+``llm_guard``. The client itself never retries: a retry would run past the
+guard's deadline, and failures feed the circuit breaker instead.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .llm_guard import LLMUnavailableError, get_llm_guard
+from .single_flight import SingleFlight
+
+_client: Optional[Any] = None
+_client_lock = threading.Lock()
+
+# Coalesces identical chat completions that are in flight at the same time
+llm_flights = SingleFlight()
+
+
+def llm_base_url() -> Optional[str]:
+    return os.getenv("DW_LLM_BASE_URL") or os.getenv("OPENAI_BASE_URL") or None
+
+
+def _build_client() -> Any:
+    import httpx
+    from openai import OpenAI
+
+    timeout = httpx.Timeout(
+        float(os.getenv("DW_LLM_TIMEOUT_SECONDS", "60")),
+        connect=float(os.getenv("DW_LLM_CONNECT_TIMEOUT_SECONDS", "5")),
+    )
+    limits = httpx.Limits(
+        max_connections=int(os.getenv("DW_LLM_MAX_CONNECTIONS", "20")),
+        max_keepalive_connections=int(os.getenv("DW_LLM_MAX_KEEPALIVE", "10")),
+        keepalive_expiry=30.0,
+    )
+    return OpenAI(
+        # Local OpenAI-compatible servers usually accept any key
+        api_key=os.getenv("OPENAI_API_KEY") or "not-needed",
+        base_url=llm_base_url(),
+        timeout=timeout,
+        max_retries=0,
+        http_client=httpx.Client(timeout=timeout, limits=limits),
+    )
+
+
+def get_llm_client() -> Any:
+    """The shared OpenAI client, created on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = _build_client()
+    return _client
+
+
+def reset_llm_client():
+    """Close the shared client; the next call builds one from current settings."""
+    global _client
+    with _client_lock:
+        client, _client = _client, None
+    if client is not None:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"⚠️ Warning: Could not close LLM client: {e}")
+
+
+def _cached_request(
+    model: str,
+    messages: List[Dict[str, Any]],
+    temperature: float,
+    max_tokens: Optional[int],
+    response_format: Optional[Dict[str, Any]],
+) -> Tuple[Optional[Any], str, Optional[str]]:
+    """
+    ``(cache, key, cached_text)`` for a request; the cache may be None.
+
+    The key identifies the normalized request whether or not caching is on.
+    """
+    from .llm_cache import cache_key, get_llm_cache
+
+    key = cache_key(
+        model,
+        messages,
+        temperature,
+        max_tokens=max_tokens,
+        response_format=response_format,
+    )
+    try:
+        cache = get_llm_cache()
+    except Exception as e:
+        print(f"⚠️ Warning: LLM response cache unavailable: {e}")
+        return None, key, None
+    if cache is None:
+        return None, key, None
+    return cache, key, cache.get(key)
+
+
+def _request_options(
+    max_tokens: Optional[int], response_format: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    options: Dict[str, Any] = {}
+    if max_tokens is not None:
+        options["max_tokens"] = max_tokens
+    if response_format is not None:
+        options["response_format"] = response_format
+    return options
+
+
+def _record_usage(
+    model: str,
+    messages: List[Dict[str, Any]],
+    content: str,
+    usage: Optional[Any] = None,
+    cached: bool = False,
+    coalesced: bool = False,
+    streamed: bool = False,
+    started: Optional[float] = None,
+):
+    """Record token counts for one call, estimating what the API didn't report."""
+    from .llm_usage import LLMCallUsage, llm_usage
+    from .prompt_budget import count_message_tokens, count_tokens
+
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    estimated = not isinstance(prompt_tokens, int) or not isinstance(
+        completion_tokens, int
+    )
+    if estimated:
+        prompt_tokens = count_message_tokens(messages)
+        completion_tokens = count_tokens(content)
+    llm_usage.record(
+        LLMCallUsage(
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached=cached,
+            coalesced=coalesced,
+            streamed=streamed,
+            estimated=estimated,
+            duration_ms=(time.perf_counter() - started) * 1000 if started else 0.0,
+        )
+    )
+
+
+def chat_completion(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+    cacheable: Callable[[str], bool] = bool,
+) -> str:
+    """
+    Run one chat completion through the shared client and return its text.
+
+    Responses are served from the disk cache when an identical request was
+    answered before (see llm_cache); a new response is only cached if
+    ``cacheable`` accepts it, so unparseable output is retried next time.
+    Identical requests made while one is already in flight wait for and
+    share its response instead of calling the API again. API calls go
+    through the LLM guard (see llm_guard) and raise LLMUnavailableError
+    when it refuses them.
+    """
+    model = model or os.getenv("MODEL", "gpt-4o")
+    cache, key, cached = _cached_request(
+        model, messages, temperature, max_tokens, response_format
+    )
+    if cached is not None:
+        _record_usage(model, messages, cached, cached=True)
+        return cached
+
+    def fetch() -> str:
+        with get_llm_guard().call() as timeout:
+            started = time.perf_counter()
+            response = get_llm_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                timeout=timeout,
+                **_request_options(max_tokens, response_format),
+            )
+        content = response.choices[0].message.content or ""
+        _record_usage(
+            model,
+            messages,
+            content,
+            usage=getattr(response, "usage", None),
+            started=started,
+        )
+        if cache is not None and cacheable(content):
+            cache.put(key, content)
+        return content
+
+    # Waiting on another caller's request is bounded by the same deadline
+    deadline_seconds = get_llm_guard().deadline_seconds
+    try:
+        content, shared = llm_flights.do(key, fetch, timeout=deadline_seconds)
+    except TimeoutError as e:
+        raise LLMUnavailableError("deadline", str(e)) from e
+    if shared:
+        _record_usage(model, messages, content, coalesced=True)
+    return content
+
+
+def stream_chat_completion(
+    messages: List[Dict[str, Any]],
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None,
+    response_format: Optional[Dict[str, Any]] = None,
+    cacheable: Callable[[str], bool] = bool,
+) -> Iterator[str]:
+    """
+    Like chat_completion, but yield the text in pieces as it is generated.
+
+    A cached response is yielded whole. The full text is cached once the
+    stream ends; closing the iterator early closes the HTTP response. A
+    stream still running at the guard's deadline is cut off with
+    LLMUnavailableError.
+    """
+    model = model or os.getenv("MODEL", "gpt-4o")
+    cache, key, cached = _cached_request(
+        model, messages, temperature, max_tokens, response_format
+    )
+    if cached is not None:
+        _record_usage(model, messages, cached, cached=True, streamed=True)
+        yield cached
+        return
+
+    parts: List[str] = []
+    # The slot is held until the stream ends or is closed
+    with get_llm_guard().call() as timeout:
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        stream = get_llm_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            timeout=timeout,
+            **_request_options(max_tokens, response_format),
+        )
+        try:
+            for chunk in stream:
+                # The read timeout alone never ends a stream that keeps trickling
+                if time.monotonic() > deadline:
+                    raise LLMUnavailableError(
+                        "deadline", "LLM stream ran past its deadline"
+                    )
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        finally:
+            stream.response.close()
+
+    content = "".join(parts)
+    _record_usage(model, messages, content, streamed=True, started=started)
+    if cache is not None and cacheable(content):
+        cache.put(key, content)
@@ -0,0 +1,151 @@
+"""Bounded-parallel fan-out for multi-call storylet generation.
+
+Generation paths that need several completions (theme sets, targeted gap
+prompts, chunks of a large world) submit them together to a thread pool, so
+wall-clock time follows the slowest call rather than the sum. The
+generation functions are synchronous and already run on FastAPI's
+threadpool, so threads are used rather than asyncio. Results are merged in
+submission order, de-duplicated by title and validated; streaming tasks
+can instead be consumed item by item as they arrive (``fan_out_stream``).
+
+``DW_LLM_MAX_PARALLEL`` bounds the calls in flight per fan-out (default 4).
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+Storylet = Dict[str, Any]
+
+
+def max_parallel_calls() -> int:
+    return max(1, int(os.getenv("DW_LLM_MAX_PARALLEL", "4")))
+
+
+def fan_out(
+    tasks: List[Callable[[], List[Storylet]]], max_workers: Optional[int] = None
+) -> List[List[Storylet]]:
+    """
+    Run generation tasks concurrently; one result list per task, in order.
+
+    A task that raises contributes an empty list, so one failed chunk does
+    not lose the others.
+    """
+    if not tasks:
+        return []
+
+    def guarded(task: Callable[[], List[Storylet]]) -> List[Storylet]:
+        try:
+            return list(task() or [])
+        except Exception as e:
+            print(f"⚠️ Generation chunk failed: {e}")
+            return []
+
+    workers = min(len(tasks), max_workers or max_parallel_calls())
+    if workers == 1:
+        return [guarded(task) for task in tasks]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-fanout") as pool:
+        return list(pool.map(guarded, tasks))
+
+
+def title_key(title: Any) -> str:
+    return " ".join(str(title).split()).casefold()
+
+
+def is_valid_storylet(storylet: Any) -> bool:
+    """Has a title, some text and a list of choices."""
+    if not isinstance(storylet, dict):
+        return False
+    title = storylet.get("title")
+    text = storylet.get("text_template") or storylet.get("text")
+    choices = storylet.get("choices", [])
+    return (
+        isinstance(title, str)
+        and bool(title.strip())
+        and isinstance(text, str)
+        and bool(text.strip())
+        and isinstance(choices, list)
+    )
+
+
+class StoryletMerger:
+    """
+    Accepts storylets one at a time, dropping invalid ones and repeated titles.
+
+    Titles are compared case- and whitespace-insensitively, also against
+    ``existing_titles`` (e.g. storylets already in the world).
+    """
+
+    def __init__(self, existing_titles: Iterable[str] = ()):
+        self._seen: Set[str] = {title_key(title) for title in existing_titles}
+        self.merged: List[Storylet] = []
+
+    def add(self, storylet: Any) -> bool:
+        if not is_valid_storylet(storylet):
+            return False
+        key = title_key(storylet["title"])
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        self.merged.append(storylet)
+        return True
+
+
+def merge_storylets(
+    batches: Iterable[List[Storylet]],
+    limit: Optional[int] = None,
+    existing_titles: Iterable[str] = (),
+) -> List[Storylet]:
+    """Flatten batches in order through a StoryletMerger."""
+    merger = StoryletMerger(existing_titles)
+    for batch in batches:
+        for storylet in batch:
+            if merger.add(storylet) and limit is not None and len(merger.merged) >= limit:
+                return merger.merged
+    return merger.merged
+
+
+def fan_out_stream(
+    tasks: List[Callable[[], Iterable[Storylet]]], max_workers: Optional[int] = None
+) -> Iterator[Storylet]:
+    """
+    Run streaming generation tasks concurrently, yielding each item as soon
+    as any task produces it.
+
+    A task that raises just stops contributing. When the caller stops
+    iterating, running tasks stop at their next item.
+    """
+    if not tasks:
+        return
+    results: "queue.Queue[Any]" = queue.Queue()
+    finished = object()
+    stop = threading.Event()
+
+    def run(task: Callable[[], Iterable[Storylet]]):
+        try:
+            for item in task():
+                if stop.is_set():
+                    break
+                results.put(item)
+        except Exception as e:
+            print(f"⚠️ Generation chunk failed: {e}")
+        finally:
+            results.put(finished)
+
+    workers = min(len(tasks), max_workers or max_parallel_calls())
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm-fanout")
+    try:
+        for task in tasks:
+            pool.submit(run, task)
+        remaining = len(tasks)
+        while remaining:
+            item = results.get()
+            if item is finished:
+                remaining -= 1
+            else:
+                yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
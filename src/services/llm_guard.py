@@ -0,0 +1,294 @@
+"""Back-pressure and failure isolation for LLM calls.
+
+Every completion passes through one process-wide ``LLMGuard``:
+
+- a concurrency limit with a bounded wait queue, so a slow upstream can
+  hold at most ``DW_LLM_MAX_CONCURRENT`` threadpool threads and further
+  callers are turned away instead of piling up;
+- a per-call wall-clock deadline (``DW_LLM_DEADLINE_SECONDS``) covering
+  the wait for a slot and the request itself, including a whole stream;
+- a circuit breaker that opens when the recent error or slow-call rate
+  crosses ``DW_LLM_BREAKER_FAILURE_RATE``, failing fast so callers use
+  their local fallback storylets, and probes again after a cool-down.
+
+Rejections raise ``LLMUnavailableError``. Breaker state transitions and
+rejection counts are served at ``/api/admin/llm-guard``.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class LLMUnavailableError(RuntimeError):
+    """The call was refused locally (circuit open, queue full or deadline)."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class ConcurrencyLimiter:
+    """A semaphore that refuses new waiters once ``max_queue`` are waiting."""
+
+    def __init__(self, max_concurrent: int, max_queue: int):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self.in_flight >= self.max_concurrent:
+                if self.waiting >= self.max_queue:
+                    self.rejected_queue_full += 1
+                    raise LLMUnavailableError(
+                        "queue_full", f"LLM queue full ({self.waiting} waiting)"
+                    )
+                self.waiting += 1
+                try:
+                    while self.in_flight >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self.rejected_timeout += 1
+                            raise LLMUnavailableError(
+                                "deadline", "Timed out waiting for an LLM slot"
+                            )
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.in_flight += 1
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "rejected_queue_full": self.rejected_queue_full,
+                "rejected_timeout": self.rejected_timeout,
+            }
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker over a sliding window of recent calls.
+
+    A call counts as bad if it raised or took longer than
+    ``slow_call_seconds``. Once at least ``min_calls`` are in the window and
+    the bad share reaches ``failure_rate`` the breaker opens; after
+    ``open_seconds`` one trial call is let through (half-open) and its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        slow_call_seconds: float = 20.0,
+        open_seconds: float = 30.0,
+        history_size: int = 50,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.state = CLOSED
+        self.rejected = 0
+        self.transitions: Dict[str, int] = {}
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state: str, reason: str):
+        key = f"{self.state}->{state}"
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+        self.history.append(
+            {
+                "from": self.state,
+                "to": state,
+                "reason": reason,
+                "at": datetime.now(timezone.utc).isoformat(),
+            }
+        )
+        print(f"⚡ LLM circuit {self.state} -> {state} ({reason})")
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; counts refusals."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at >= self.open_seconds:
+                    self._transition(HALF_OPEN, "cool-down elapsed")
+                else:
+                    self.rejected += 1
+                    return False
+            if self.state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def cancel(self):
+        """Give back a half-open trial that was allowed but never ran."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record(self, success: bool, duration: float):
+        with self._lock:
+            bad = not success or duration > self.slow_call_seconds
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+                if bad:
+                    self._transition(OPEN, "trial call failed")
+                else:
+                    self._transition(CLOSED, "trial call succeeded")
+                return
+            self._outcomes.append(bad)
+            if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                rate = sum(self._outcomes) / len(self._outcomes)
+                if rate >= self.failure_rate:
+                    self._transition(
+                        OPEN,
+                        f"{rate:.0%} of last {len(self._outcomes)} calls failed or slow",
+                    )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            outcomes = len(self._outcomes)
+            return {
+                "state": self.state,
+                "failure_rate": sum(self._outcomes) / outcomes if outcomes else 0.0,
+                "window_calls": outcomes,
+                "rejected": self.rejected,
+                "transitions": dict(self.transitions),
+                "recent_transitions": list(reversed(self.history)),
+            }
+
+
+class LLMGuard:
+    """Concurrency limit, deadline and circuit breaker around each LLM call."""
+
+    def __init__(
+        self,
+        limiter: ConcurrencyLimiter,
+        breaker: CircuitBreaker,
+        deadline_seconds: float = 60.0,
+    ):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.deadline_seconds = deadline_seconds
+
+    @contextmanager
+    def call(self) -> Iterator[float]:
+        """
+        Hold a slot for one call, yielding the seconds left before its
+        deadline. The block must stop by then: use it as the request
+        timeout and check it between stream chunks. Raising inside the block
+        counts as a failure; leaving it normally, or closing a stream
+        early, as a success.
+        """
+        started = time.monotonic()
+        # Fail fast while the circuit is open instead of queueing for a slot
+        if not self.breaker.allow():
+            raise LLMUnavailableError("circuit_open", "LLM circuit breaker is open")
+        try:
+            self.limiter.acquire(self.deadline_seconds)
+        except LLMUnavailableError:
+            self.breaker.cancel()
+            raise
+        try:
+            remaining = self.deadline_seconds - (time.monotonic() - started)
+            if remaining <= 0:
+                self.breaker.record(False, time.monotonic() - started)
+                raise LLMUnavailableError("deadline", "LLM deadline passed while queued")
+            call_started = time.monotonic()
+            failed = False
+            try:
+                yield remaining
+            except Exception:
+                failed = True
+                self.breaker.record(False, time.monotonic() - call_started)
+                raise
+            finally:
+                if not failed:
+                    self.breaker.record(True, time.monotonic() - call_started)
+        finally:
+            self.limiter.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "deadline_seconds": self.deadline_seconds,
+            "limiter": self.limiter.get_stats(),
+            "circuit": self.breaker.get_stats(),
+        }
+
+
+_guard: Optional[LLMGuard] = None
+_guard_lock = threading.Lock()
+
+
+def get_llm_guard() -> LLMGuard:
+    """The process-wide guard, configured from the environment on first use."""
+    global _guard
+    if _guard is None:
+        with _guard_lock:
+            if _guard is None:
+                _guard = LLMGuard(
+                    ConcurrencyLimiter(
+                        max(1, int(_env_float("DW_LLM_MAX_CONCURRENT", 8))),
+                        max(0, int(_env_float("DW_LLM_MAX_QUEUE", 16))),
+                    ),
+                    CircuitBreaker(
+                        failure_rate=_env_float("DW_LLM_BREAKER_FAILURE_RATE", 0.5),
+                        min_calls=max(
+                            1, int(_env_float("DW_LLM_BREAKER_MIN_CALLS", 5))
+                        ),
+                        window=max(1, int(_env_float("DW_LLM_BREAKER_WINDOW", 20))),
+                        slow_call_seconds=_env_float("DW_LLM_SLOW_CALL_SECONDS", 20.0),
+                        open_seconds=_env_float("DW_LLM_BREAKER_OPEN_SECONDS", 30.0),
+                    ),
+                    deadline_seconds=_env_float("DW_LLM_DEADLINE_SECONDS", 60.0),
+                )
+    return _guard
+
+
+def reset_llm_guard():
+    """Drop the shared guard; the next call builds one from current settings."""
+    global _guard
+    with _guard_lock:
+        _guard = None
@@ -2,7 +2,15 @@
 
 import os
 import json
-from typing import Any, Dict, List
+import logging
+from functools import partial
+from typing import Any, Dict, Iterator, List
+
+from .json_stream import iter_json_array
+from .llm_guard import LLMUnavailableError
+from .llm_fanout import StoryletMerger, fan_out, fan_out_stream, merge_storylets
+
+logger = logging.getLogger(__name__)
 
 
 def generate_contextual_storylets(
@@ -77,6 +85,33 @@ def generate_contextual_storylets(
     return llm_suggest_storylets(n, themes, bible)
 
 
+def _fallback_storylets(n: int) -> List[Dict[str, Any]]:
+    """Local storylets used when AI is disabled or unavailable."""
+    base = [
+        {
+            "title": "Quantum Whispers",
+            "text_template": "🌌 {name} senses subtle vibrations in the cosmic frequencies. Resonance: {resonance}.",
+            "requires": {"resonance": {"lte": 1}},
+            "choices": [
+                {"label": "Attune deeper", "set": {"resonance": {"inc": 1}}},
+                {"label": "Stabilize flow", "set": {"resonance": {"dec": 1}}},
+            ],
+            "weight": 1.2,
+        },
+        {
+            "title": "Stellar Resonance",
+            "text_template": "✨ Crystalline formations pulse with cosmic energy, singing in harmonic frequencies.",
+            "requires": {"has_crystal": True},
+            "choices": [
+                {"label": "Attune to frequencies", "set": {"energy": {"inc": 1}}},
+                {"label": "Preserve the harmony", "set": {}},
+            ],
+            "weight": 1.0,
+        },
+    ]
+    return base[: max(1, int(n or 1))]
+
+
 def llm_suggest_storylets(
     n: int, themes: List[str], bible: Dict[str, Any]
 ) -> List[Dict[str, Any]]:
@@ -97,60 +132,52 @@ def llm_suggest_storylets(
         or os.getenv("DW_DISABLE_AI") == "1"
         or os.getenv("PYTEST_CURRENT_TEST")
     ):
-        base = [
-            {
-                "title": "Quantum Whispers",
-                "text_template": "\U0001f30c {name} senses subtle vibrations in the cosmic frequencies. Resonance: {resonance}.",
-                "requires": {"resonance": {"lte": 1}},
-                "choices": [
-                    {"label": "Attune deeper", "set": {"resonance": {"inc": 1}}},
-                    {"label": "Stabilize flow", "set": {"resonance": {"dec": 1}}},
-                ],
-                "weight": 1.2,
-            },
-            {
-                "title": "Stellar Resonance",
-                "text_template": "✨ Crystalline formations pulse with cosmic energy, singing in harmonic frequencies.",
-                "requires": {"has_crystal": True},
-                "choices": [
-                    {"label": "Attune to frequencies", "set": {"energy": {"inc": 1}}},
-                    {"label": "Preserve the harmony", "set": {}},
-                ],
-                "weight": 1.0,
-            },
-        ]
-        return base[: max(1, int(n or 1))]
+        return _fallback_storylets(n)
 
     if not os.getenv("OPENAI_API_KEY"):
         # Fallback storylets when no API key is available
-        base = [
-            {
-                "title": "Quantum Whispers",
-                "text_template": "🌌 {name} senses subtle vibrations in the cosmic frequencies. Resonance: {resonance}.",
-                "requires": {"resonance": {"lte": 1}},
-                "choices": [
-                    {"label": "Attune deeper", "set": {"resonance": {"inc": 1}}},
-                    {"label": "Stabilize flow", "set": {"resonance": {"dec": 1}}},
-                ],
-                "weight": 1.2,
-            },
-            {
-                "title": "Stellar Resonance",
-                "text_template": "✨ Crystalline formations pulse with cosmic energy, singing in harmonic frequencies.",
-                "requires": {"has_crystal": True},
-                "choices": [
-                    {"label": "Attune to frequencies", "set": {"energy": {"inc": 1}}},
-                    {"label": "Preserve the harmony", "set": {}},
-                ],
-                "weight": 1.0,
-            },
-        ]
-        return base[: max(1, int(n or 1))]
+        return _fallback_storylets(n)
 
     # Call OpenAI API with enhanced feedback-aware prompting
-    from openai import OpenAI
+    from .llm_client import chat_completion
+    from .prompt_budget import count_message_tokens, fit_to_budget, prompt_token_budget
+
+    # Compact the bible until the whole prompt fits the per-call budget
+    budget = prompt_token_budget()
+    prompt_bible, prompt_tokens = fit_to_budget(
+        bible,
+        budget,
+        measure=lambda candidate: count_message_tokens(
+            _suggest_messages(n, themes, candidate)
+        ),
+    )
+    if prompt_bible is not bible:
+        print(f"✂️ Compacted storylet prompt to ~{prompt_tokens} tokens (budget {budget})")
 
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    try:
+        content = chat_completion(
+            model=os.getenv("MODEL", "gpt-4o"),
+            response_format={"type": "json_object"},
+            messages=_suggest_messages(n, themes, prompt_bible),
+            temperature=0.7,
+            # Keep responses smaller in non-production contexts
+            max_tokens=1000 if os.getenv("DW_FAST_TEST") == "1" else 2500,
+            cacheable=_is_json,
+        )
+    except LLMUnavailableError as e:
+        # Upstream is overloaded or failing: fail fast to local storylets
+        print(f"⚠️ LLM unavailable ({e.reason}), using fallback storylets")
+        return _fallback_storylets(n)
+
+    data = json.loads(content or "{}")
+    return data.get("storylets", [])
+
+
+def _suggest_messages(
+    n: int, themes: List[str], bible: Dict[str, Any]
+) -> List[Dict[str, str]]:
+    """System and user messages asking for ``n`` storylets."""
+    from .prompt_budget import to_prompt_json
 
     # Build context-aware system prompt
     system_prompt = build_feedback_aware_prompt(bible)
@@ -163,21 +190,25 @@ def llm_suggest_storylets(
         "feedback_integration": extract_feedback_requirements(bible),
         "requirements": "Each storylet should address identified gaps while maintaining narrative quality",
     }
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": to_prompt_json(user_prompt)},
+    ]
 
-    response = client.chat.completions.create(
-        model=os.getenv("MODEL", "gpt-4o"),
-        response_format={"type": "json_object"},
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": json.dumps(user_prompt, indent=2)},
-        ],
-        temperature=0.7,
-        # Keep responses smaller in non-production contexts
-        max_tokens=1000 if os.getenv("DW_FAST_TEST") == "1" else 2500,
-    )
 
-    data = json.loads(response.choices[0].message.content or "{}")
-    return data.get("storylets", [])
+def _is_json(text: str) -> bool:
+    """Whether a completion parses as JSON (only those are worth caching)."""
+    try:
+        json.loads(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _contains_json(text: str, open_char: str, close_char: str) -> bool:
+    """Whether the outermost ``open_char``...``close_char`` span parses as JSON."""
+    start, end = text.find(open_char), text.rfind(close_char)
+    return start != -1 and end > start and _is_json(text[start : end + 1])
 
 
 def build_feedback_aware_prompt(bible: Dict[str, Any]) -> str:
@@ -342,48 +373,48 @@ def generate_learning_enhanced_storylets(
     return llm_suggest_storylets(n, themes, enhanced_bible)
 
 
-def generate_world_storylets(
-    description: str,
-    theme: str,
-    player_role: str = "adventurer",
-    key_elements: List[str] | None = None,
-    tone: str = "adventure",
-    count: int = 15,
-) -> List[Dict[str, Any]]:
-    """Generate a complete storylet ecosystem from a world description."""
+WORLD_CHUNK_FOCUS = [
+    "arrivals and first impressions",
+    "exploration and discovery",
+    "conflict and rising stakes",
+    "allies, rivals and relationships",
+    "secrets and revelations",
+    "turning points and resolutions",
+]
 
-    if key_elements is None:
-        key_elements = []
 
-    # Fast path: avoid network during tests or when AI is disabled
-    if (
-        os.getenv("DW_FAST_TEST") == "1"
-        or os.getenv("DW_DISABLE_AI") == "1"
-        or os.getenv("PYTEST_CURRENT_TEST")
-    ):
-        return [
-            {
-                "title": f"A New {theme.title()} Beginning",
-                "text": f"You arrive as a {player_role} in a world themed {theme}.",
-                "choices": [
-                    {
-                        "label": "Explore the area",
-                        "set": {"location": "start", "exploration": 1},
-                    },
-                    {"label": "Gather information", "set": {"knowledge": 1}},
-                ],
-                "requires": {"location": "start"},
-                "weight": 1.0,
-            }
-        ]
+def world_chunk_size() -> int:
+    """Storylets requested per world-generation call (``DW_WORLD_CHUNK_SIZE``)."""
+    return max(1, int(os.getenv("DW_WORLD_CHUNK_SIZE", "8")))
+
+
+def _world_chunk_sizes(count: int) -> List[int]:
+    chunk = world_chunk_size()
+    return [min(chunk, count - start) for start in range(0, count, chunk)]
 
-    try:
-        from openai import OpenAI
 
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+def _world_messages(
+    description: str,
+    theme: str,
+    player_role: str,
+    key_elements: List[str],
+    tone: str,
+    count: int,
+    batch: int = 1,
+    batches: int = 1,
+) -> List[Dict[str, str]]:
+    """Chat messages asking for one batch of ``count`` world storylets."""
+    batch_note = ""
+    if batches > 1:
+        # Each batch gets its own focus so concurrent calls don't repeat each other
+        focus = WORLD_CHUNK_FOCUS[(batch - 1) % len(WORLD_CHUNK_FOCUS)]
+        batch_note = (
+            f" This is batch {batch} of {batches} for the same world; "
+            f"focus these storylets on {focus} and give them distinct titles."
+        )
 
-        # Build the world generation prompt
-        world_prompt = f"""You are a master interactive fiction writer creating a dynamic, interconnected story world.
+    # Build the world generation prompt
+    world_prompt = f"""You are a master interactive fiction writer creating a dynamic, interconnected story world.
 
 WORLD DESCRIPTION: {description}
 THEME: {theme}
@@ -391,7 +422,7 @@ PLAYER ROLE: {player_role}
 KEY ELEMENTS: {', '.join(key_elements) if key_elements else 'To be determined from description'}
 TONE: {tone}
 
-Create {count} interconnected storylets that form a cohesive, immersive experience. Each storylet should:
+Create {count} interconnected storylets that form a cohesive, immersive experience.{batch_note} Each storylet should:
 
 1. FIT THE WORLD: Match the theme, tone, and setting described
 2. CREATE WORLD VARIABLES: Establish key world-specific variables that matter to this universe
@@ -425,80 +456,186 @@ Return EXACTLY {count} storylets in this JSON format:
 
 Focus on creating an interconnected web of storylets where choices in one storylet unlock or influence others. Make the world feel alive and responsive to player choices."""
 
-        response = client.chat.completions.create(
-            model=os.getenv("MODEL", "gpt-4o"),
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert interactive fiction world builder. Create interconnected storylets that form a cohesive narrative ecosystem.",
-                },
-                {"role": "user", "content": world_prompt},
-            ],
-            temperature=0.8,  # More creative for world building
-            max_tokens=4000,
+    return [
+        {
+            "role": "system",
+            "content": "You are an expert interactive fiction world builder. Create interconnected storylets that form a cohesive narrative ecosystem.",
+        },
+        {"role": "user", "content": world_prompt},
+    ]
+
+
+def _world_max_tokens(count: int) -> int:
+    return min(4000, 600 + 250 * count)
+
+
+def _normalize_world_storylet(storylet: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in defaults and coerce choices to ``{"label", "set"}``."""
+    normalized = {
+        "title": storylet.get("title", "Untitled Adventure"),
+        "text": storylet.get("text", "An adventure awaits..."),
+        "choices": storylet.get("choices", [{"label": "Continue", "set": {}}]),
+        "requires": storylet.get("requires", {}),
+        "weight": float(storylet.get("weight", 1.0)),
+    }
+
+    # Ensure choices have proper format
+    normalized_choices = []
+    for choice in normalized["choices"]:
+        normalized_choice = {
+            "label": choice.get("label") or choice.get("text", "Continue"),
+            "set": choice.get("set") or choice.get("set_vars", {}),
+        }
+        normalized_choices.append(normalized_choice)
+
+    normalized["choices"] = normalized_choices
+    return normalized
+
+
+def _generate_world_chunk(
+    description: str,
+    theme: str,
+    player_role: str,
+    key_elements: List[str],
+    tone: str,
+    count: int,
+    batch: int = 1,
+    batches: int = 1,
+) -> List[Dict[str, Any]]:
+    """One world-generation call for ``count`` storylets; raises on bad output."""
+    from .llm_client import chat_completion
+
+    response_text = chat_completion(
+        model=os.getenv("MODEL", "gpt-4o"),
+        messages=_world_messages(
+            description, theme, player_role, key_elements, tone, count, batch, batches
+        ),
+        temperature=0.8,  # More creative for world building
+        max_tokens=_world_max_tokens(count),
+        cacheable=lambda text: _contains_json(text, "[", "]"),
+    ).strip()
+
+    # Chunks run in parallel worker threads; keep full responses off stdout
+    logger.debug(
+        "World chunk response (%d chars): %s", len(response_text), response_text
+    )
+
+    # Extract JSON from response
+    json_start = response_text.find("[")
+    json_end = response_text.rfind("]") + 1
+
+    if json_start == -1 or json_end == 0:
+        print(f"❌ No JSON array brackets found in response")
+        raise ValueError("No JSON array found in response")
+
+    json_text = response_text[json_start:json_end]
+
+    logger.debug("Parsing world chunk JSON (%d chars)", len(json_text))
+
+    try:
+        storylets = json.loads(json_text)
+    except json.JSONDecodeError as e:
+        print(f"❌ JSON Decode Error: {e}")
+        logger.debug(
+            "Context around error: %s", json_text[max(0, e.pos - 50) : e.pos + 50]
         )
 
-        response_text = (response.choices[0].message.content or "").strip()
+        # Try to clean common JSON issues
+        cleaned_json = (
+            json_text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+        )
+        # Remove any control characters
+        import re
 
-        # Debug: Print the raw response to understand what's happening
-        print(f"🔍 DEBUG: Raw response length: {len(response_text)}")
-        print(f"🔍 DEBUG: Full response: {response_text}")
+        cleaned_json = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", cleaned_json)
 
-        # Extract JSON from response
-        json_start = response_text.find("[")
-        json_end = response_text.rfind("]") + 1
+        print(f"🔧 Attempting to parse cleaned JSON...")
+        storylets = json.loads(cleaned_json)
 
-        if json_start == -1 or json_end == 0:
-            print(f"❌ No JSON array brackets found in response")
-            raise ValueError("No JSON array found in response")
+    # Validate and normalize the storylets
+    return [_normalize_world_storylet(storylet) for storylet in storylets]
 
-        json_text = response_text[json_start:json_end]
 
-        # Debug: Print the JSON text to see what's causing the parsing error
-        print(f"🔍 DEBUG: Attempting to parse JSON (length: {len(json_text)})")
-        print(f"🔍 DEBUG: First 200 chars: {json_text[:200]}")
+def _fast_world_storylets(theme: str, player_role: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": f"A New {theme.title()} Beginning",
+            "text": f"You arrive as a {player_role} in a world themed {theme}.",
+            "choices": [
+                {
+                    "label": "Explore the area",
+                    "set": {"location": "start", "exploration": 1},
+                },
+                {"label": "Gather information", "set": {"knowledge": 1}},
+            ],
+            "requires": {"location": "start"},
+            "weight": 1.0,
+        }
+    ]
+
 
-        try:
-            storylets = json.loads(json_text)
-        except json.JSONDecodeError as e:
-            print(f"❌ JSON Decode Error: {e}")
-            print(f"🔍 Error position: {e.pos}")
-            print(f"🔍 Context around error: {json_text[max(0, e.pos-50):e.pos+50]}")
+def _fallback_world_storylets(theme: str, player_role: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "title": "A New Beginning",
+            "text": f"You find yourself in the world of {theme}. Your journey as a {player_role} begins here.",
+            "choices": [
+                {"label": "Explore the area", "set": {"exploration": 1}},
+                {"label": "Gather information", "set": {"knowledge": 1}},
+            ],
+            "requires": {},
+            "weight": 1.0,
+        }
+    ]
 
-            # Try to clean common JSON issues
-            cleaned_json = (
-                json_text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
-            )
-            # Remove any control characters
-            import re
 
-            cleaned_json = re.sub(r"[\x00-\x1f\x7f-\x9f]", "", cleaned_json)
+def _ai_disabled() -> bool:
+    return bool(
+        os.getenv("DW_FAST_TEST") == "1"
+        or os.getenv("DW_DISABLE_AI") == "1"
+        or os.getenv("PYTEST_CURRENT_TEST")
+    )
 
-            print(f"🔧 Attempting to parse cleaned JSON...")
-            storylets = json.loads(cleaned_json)
 
-        # Validate and normalize the storylets
-        normalized_storylets = []
-        for storylet in storylets:
-            normalized = {
-                "title": storylet.get("title", "Untitled Adventure"),
-                "text": storylet.get("text", "An adventure awaits..."),
-                "choices": storylet.get("choices", [{"label": "Continue", "set": {}}]),
-                "requires": storylet.get("requires", {}),
-                "weight": float(storylet.get("weight", 1.0)),
-            }
-
-            # Ensure choices have proper format
-            normalized_choices = []
-            for choice in normalized["choices"]:
-                normalized_choice = {
-                    "label": choice.get("label") or choice.get("text", "Continue"),
-                    "set": choice.get("set") or choice.get("set_vars", {}),
-                }
-                normalized_choices.append(normalized_choice)
-
-            normalized["choices"] = normalized_choices
-            normalized_storylets.append(normalized)
+def generate_world_storylets(
+    description: str,
+    theme: str,
+    player_role: str = "adventurer",
+    key_elements: List[str] | None = None,
+    tone: str = "adventure",
+    count: int = 15,
+) -> List[Dict[str, Any]]:
+    """Generate a complete storylet ecosystem from a world description."""
+
+    if key_elements is None:
+        key_elements = []
+
+    # Fast path: avoid network during tests or when AI is disabled
+    if _ai_disabled():
+        return _fast_world_storylets(theme, player_role)
+
+    try:
+        # Large worlds are requested in chunks that run concurrently
+        sizes = _world_chunk_sizes(count)
+        batches = fan_out(
+            [
+                partial(
+                    _generate_world_chunk,
+                    description,
+                    theme,
+                    player_role,
+                    key_elements,
+                    tone,
+                    size,
+                    batch,
+                    len(sizes),
+                )
+                for batch, size in enumerate(sizes, start=1)
+            ]
+        )
+        normalized_storylets = merge_storylets(batches, limit=count)
+        if not normalized_storylets:
+            raise ValueError("No storylets generated")
 
         print(
             f"✅ Generated {len(normalized_storylets)} world storylets for theme: {theme}"
@@ -508,18 +645,91 @@ Focus on creating an interconnected web of storylets where choices in one storyl
     except Exception as e:
         print(f"❌ Error generating world storylets: {e}")
         # Return a fallback set of generic storylets
-        return [
-            {
-                "title": "A New Beginning",
-                "text": f"You find yourself in the world of {theme}. Your journey as a {player_role} begins here.",
-                "choices": [
-                    {"label": "Explore the area", "set": {"exploration": 1}},
-                    {"label": "Gather information", "set": {"knowledge": 1}},
-                ],
-                "requires": {},
-                "weight": 1.0,
-            }
+        return _fallback_world_storylets(theme, player_role)
+
+
+def _stream_world_chunk(
+    description: str,
+    theme: str,
+    player_role: str,
+    key_elements: List[str],
+    tone: str,
+    count: int,
+    batch: int = 1,
+    batches: int = 1,
+) -> Iterator[Dict[str, Any]]:
+    """Streamed world-generation call; yields each storylet as its object closes."""
+    from .llm_client import stream_chat_completion
+
+    pieces = stream_chat_completion(
+        model=os.getenv("MODEL", "gpt-4o"),
+        messages=_world_messages(
+            description, theme, player_role, key_elements, tone, count, batch, batches
+        ),
+        temperature=0.8,  # More creative for world building
+        max_tokens=_world_max_tokens(count),
+        cacheable=lambda text: _contains_json(text, "[", "]"),
+    )
+    for storylet in iter_json_array(pieces):
+        if isinstance(storylet, dict):
+            yield _normalize_world_storylet(storylet)
+
+
+def stream_world_storylets(
+    description: str,
+    theme: str,
+    player_role: str = "adventurer",
+    key_elements: List[str] | None = None,
+    tone: str = "adventure",
+    count: int = 15,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming variant of generate_world_storylets.
+
+    Chunks are streamed concurrently and each unique, valid storylet is
+    yielded as soon as the model finishes writing it. Falls back to the
+    generic storylets if nothing usable arrives.
+    """
+    if key_elements is None:
+        key_elements = []
+
+    # Fast path: avoid network during tests or when AI is disabled
+    if _ai_disabled():
+        yield from _fast_world_storylets(theme, player_role)
+        return
+
+    merger = StoryletMerger()
+    sizes = _world_chunk_sizes(count)
+    storylets = fan_out_stream(
+        [
+            partial(
+                _stream_world_chunk,
+                description,
+                theme,
+                player_role,
+                key_elements,
+                tone,
+                size,
+                batch,
+                len(sizes),
+            )
+            for batch, size in enumerate(sizes, start=1)
         ]
+    )
+    try:
+        for storylet in storylets:
+            if merger.add(storylet):
+                yield storylet
+                if len(merger.merged) >= count:
+                    break
+    finally:
+        storylets.close()
+
+    if merger.merged:
+        print(f"✅ Streamed {len(merger.merged)} world storylets for theme: {theme}")
+    else:
+        print("❌ Error generating world storylets: no storylets streamed")
+        yield from _fallback_world_storylets(theme, player_role)
 
 
 def generate_starting_storylet(
@@ -565,9 +775,7 @@ def generate_starting_storylet(
         }
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        from .llm_client import chat_completion
 
         # Build context about the generated world
         locations_text = (
@@ -612,7 +820,7 @@ Return EXACTLY this JSON format:
 
 Make this feel like a natural, immersive beginning to THIS specific world, not a generic adventure start."""
 
-        response = client.chat.completions.create(
+        response_text = chat_completion(
             model=os.getenv("MODEL", "gpt-4o"),
             messages=[
                 {
@@ -623,9 +831,8 @@ Make this feel like a natural, immersive beginning to THIS specific world, not a
             ],
             temperature=0.7,
             max_tokens=800,
-        )
-
-        response_text = (response.choices[0].message.content or "").strip()
+            cacheable=lambda text: _contains_json(text, "{", "}"),
+        ).strip()
 
         # Debug: Print the raw response to understand what's happening
         print(f"🔍 DEBUG Starting Storylet: Raw response length: {len(response_text)}")
@@ -0,0 +1,81 @@
+"""Per-call token accounting for LLM requests.
+
+Every chat completion records its prompt and completion token counts (from
+the API's ``usage`` when it reports one, otherwise the local estimate) so
+prompt growth, cache savings and coalesced requests show up in
+``/api/admin/llm-usage``.
+"""
+
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict
+
+
+@dataclass
+class LLMCallUsage:
+    """Token counts for a single completion."""
+
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    cached: bool = False
+    # Shared another caller's identical in-flight request
+    coalesced: bool = False
+    streamed: bool = False
+    # True when counts are local estimates rather than API-reported usage
+    estimated: bool = False
+    duration_ms: float = 0.0
+    at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["at"] = self.at.isoformat()
+        return data
+
+
+class LLMUsageTracker:
+    """Totals and recent history of LLM calls in this process."""
+
+    def __init__(self, history_size: int = 100):
+        self.history: Deque[LLMCallUsage] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.cached_calls = 0
+            self.coalesced_calls = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.history.clear()
+
+    def record(self, usage: LLMCallUsage):
+        with self._lock:
+            self.calls += 1
+            # Cached and coalesced calls are served locally; nothing was spent
+            if usage.cached:
+                self.cached_calls += 1
+            elif usage.coalesced:
+                self.coalesced_calls += 1
+            else:
+                self.prompt_tokens += usage.prompt_tokens
+                self.completion_tokens += usage.completion_tokens
+            self.history.append(usage)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals and recent calls for admin endpoints."""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "cached_calls": self.cached_calls,
+                "coalesced_calls": self.coalesced_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "recent_calls": [usage.to_dict() for usage in reversed(self.history)],
+            }
+
+
+llm_usage = LLMUsageTracker()
@@ -2,9 +2,15 @@
 
 import hashlib
 import re
-from typing import Dict, Tuple, List, Optional
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, List, Optional, Union
 from dataclasses import dataclass
 
+from .layout_engine import layout_locations, location_transition_graph
+from .occupancy import OccupancyGrid, nearest_free
+
 
 @dataclass
 class LocationInfo:
@@ -16,14 +22,58 @@ class LocationInfo:
     adjacency_hints: List[str]
 
 
+class _PatternIndex:
+    """
+    Location patterns tokenized into a token -> pattern inverted index, plus
+    an LRU of resolved partial matches.
+
+    The default patterns are indexed once per process and shared by every
+    LocationMapper, so the cache survives across the short-lived mappers
+    created for each placement.
+    """
+
+    def __init__(self, patterns: Mapping[str, LocationInfo]):
+        self.patterns = MappingProxyType(dict(patterns))
+        # Patterns in declaration order, with their word counts; the order
+        # breaks score ties exactly as the original linear scan did
+        self.entries: List[Tuple[LocationInfo, int]] = []
+        self.tokens: Dict[str, List[int]] = {}
+        for order, (pattern_name, pattern_info) in enumerate(self.patterns.items()):
+            pattern_words = set(re.findall(r"\w+", pattern_name.lower()))
+            self.entries.append((pattern_info, len(pattern_words)))
+            for word in pattern_words:
+                self.tokens.setdefault(word, []).append(order)
+        self.matches: "OrderedDict[str, Tuple[int, int]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+
 class LocationMapper:
     """Maps location names to spatial coordinates using semantic rules."""
 
+    # Resolved partial matches kept per pattern set (generated worlds repeat names)
+    PARTIAL_MATCH_CACHE_SIZE = 4096
+
     def __init__(self):
         self.location_cache: Dict[str, Tuple[int, int]] = {}
-        self.location_patterns = self._initialize_location_patterns()
+        self._index = _default_index()
+        self.location_patterns = self._index.patterns
+
+    def _build_pattern_index(self):
+        """
+        Index ``location_patterns`` for this mapper only.
 
-    def _initialize_location_patterns(self) -> Dict[str, LocationInfo]:
+        Call after replacing ``location_patterns``; mappers that keep the
+        default patterns share one process-wide index.
+        """
+        self._index = _PatternIndex(self.location_patterns)
+        self.location_patterns = self._index.patterns
+
+    @property
+    def _partial_matches(self) -> "OrderedDict[str, Tuple[int, int]]":
+        return self._index.matches
+
+    @staticmethod
+    def _initialize_location_patterns() -> Dict[str, LocationInfo]:
         """Initialize semantic patterns for common location types."""
         return {
             # Central/Hub locations (origin area)
@@ -118,9 +168,19 @@ class LocationMapper:
             "cascade": LocationInfo("cascade", "water", (3, -2), ["waterfall"]),
         }
 
-    def assign_coordinates_to_storylets(self, storylets: List[Dict]) -> List[Dict]:
-        """Assign spatial coordinates to storylets based on their location requirements."""
-        self.location_cache.clear()  # Fresh start for each world
+    def assign_coordinates_to_storylets(
+        self,
+        storylets: List[Dict],
+        known_locations: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> List[Dict]:
+        """
+        Assign spatial coordinates to storylets based on their location requirements.
+
+        ``known_locations`` (normalised name -> coordinates) are reused as-is
+        and their cells treated as taken; only other names are placed.
+        """
+        # Fresh start for each world, seeded with already registered locations
+        self.location_cache = dict(known_locations or {})
 
         # First pass: identify all unique locations
         locations = set()
@@ -131,13 +191,20 @@ class LocationMapper:
                 locations.add(location.lower().strip())
 
         # Assign coordinates to each location
-        location_coords = {}
-        used_positions = set()
+        graph = location_transition_graph(storylets)
+        if any(graph.values()):
+            # Choices move between locations: lay out that graph so that
+            # connected locations end up next to each other
+            location_coords = self._layout_locations(graph)
+        else:
+            location_coords = {}
+            used_positions = OccupancyGrid(self.location_cache.values())
 
-        for location in locations:
-            coords = self._get_coordinates_for_location(location, used_positions)
-            location_coords[location] = coords
-            used_positions.add(coords)
+            # Sorted so that placement does not depend on set iteration order
+            for location in sorted(locations):
+                coords = self._get_coordinates_for_location(location, used_positions)
+                location_coords[location] = coords
+                used_positions.occupy(coords)
 
         # Second pass: update storylets with coordinates
         updated_storylets = []
@@ -159,7 +226,7 @@ class LocationMapper:
         return updated_storylets
 
     def _get_coordinates_for_location(
-        self, location: str, used_positions: set
+        self, location: str, used_positions: Union[set, OccupancyGrid]
     ) -> Tuple[int, int]:
         """Get coordinates for a specific location name."""
         location = location.lower().strip()
@@ -185,27 +252,80 @@ class LocationMapper:
 
     def _find_partial_match(self, location: str) -> Tuple[int, int]:
         """Find coordinates using partial string matching."""
+        index = self._index
+        with index.lock:
+            cached = index.matches.get(location)
+            if cached is not None:
+                index.matches.move_to_end(location)
+                return cached
+
+        best_match = self._best_partial_match(location)
+        if best_match:
+            coords = best_match.suggested_position
+        else:
+            # Fallback: generate deterministic coordinates from hash
+            coords = self._hash_to_coordinates(location)
+        with index.lock:
+            index.matches[location] = coords
+            while len(index.matches) > self.PARTIAL_MATCH_CACHE_SIZE:
+                index.matches.popitem(last=False)
+        return coords
+
+    def _best_partial_match(self, location: str) -> Optional[LocationInfo]:
+        """
+        Pick the pattern with the largest share of its words in the location.
+
+        Only patterns sharing a word with the location are scored; ties go to
+        the earliest declared pattern.
+        """
         location_words = set(re.findall(r"\w+", location.lower()))
 
+        # pattern order -> number of words in common with the location
+        index = self._index
+        common_counts: Dict[int, int] = {}
+        for word in location_words:
+            for order in index.tokens.get(word, ()):
+                common_counts[order] = common_counts.get(order, 0) + 1
+
         best_match = None
         best_score = 0
-
-        for pattern_name, pattern_info in self.location_patterns.items():
-            pattern_words = set(re.findall(r"\w+", pattern_name.lower()))
-
-            # Calculate word overlap score
-            common_words = location_words.intersection(pattern_words)
-            if common_words:
-                score = len(common_words) / len(pattern_words)
-                if score > best_score:
-                    best_score = score
-                    best_match = pattern_info
-
-        if best_match:
-            return best_match.suggested_position
-
-        # Fallback: generate deterministic coordinates from hash
-        return self._hash_to_coordinates(location)
+        for order in sorted(common_counts):
+            pattern_info, word_count = index.entries[order]
+            score = common_counts[order] / word_count
+            if score > best_score:
+                best_score = score
+                best_match = pattern_info
+        return best_match
+
+    def _pattern_position(self, location: str) -> Optional[Tuple[int, int]]:
+        """Keyword-suggested coordinates, or None if no pattern matches."""
+        if location in self.location_patterns:
+            return self.location_patterns[location].suggested_position
+        best_match = self._best_partial_match(location)
+        return best_match.suggested_position if best_match else None
+
+    def _layout_locations(self, graph: Dict[str, set]) -> Dict[str, Tuple[int, int]]:
+        """
+        Place the locations of a transition graph with the layout engine.
+
+        Already known locations keep their cells; keyword hints steer where
+        each group of connected locations goes.
+        """
+        fixed = {
+            name: self.location_cache[name]
+            for name in graph
+            if name in self.location_cache
+        }
+        seeds = {}
+        for name in graph:
+            hint = self._pattern_position(name)
+            if hint is not None:
+                seeds[name] = hint
+        cells = layout_locations(
+            graph, seeds, occupied=self.location_cache.values(), fixed=fixed
+        )
+        self.location_cache.update(cells)
+        return cells
 
     def _hash_to_coordinates(self, location: str) -> Tuple[int, int]:
         """Generate deterministic coordinates from location name hash."""
@@ -220,25 +340,13 @@ class LocationMapper:
         return (x, y)
 
     def _find_free_position(
-        self, preferred: Tuple[int, int], used_positions: set
+        self, preferred: Tuple[int, int], used_positions: Union[set, OccupancyGrid]
     ) -> Tuple[int, int]:
         """Find the nearest free position to the preferred coordinates."""
         x, y = preferred
-
-        if (x, y) not in used_positions:
-            return (x, y)
-
-        # Spiral outward to find free position
-        for radius in range(1, 20):
-            for dx in range(-radius, radius + 1):
-                for dy in range(-radius, radius + 1):
-                    if abs(dx) == radius or abs(dy) == radius:  # Only check perimeter
-                        candidate = (x + dx, y + dy)
-                        if candidate not in used_positions:
-                            return candidate
-
-        # Ultimate fallback
-        return (x + 20, y + 20)
+        if isinstance(used_positions, OccupancyGrid):
+            return used_positions.nearest_free(x, y)
+        return nearest_free(x, y, lambda cx, cy: (cx, cy) not in used_positions)
 
     def get_location_map(self) -> Dict[str, Tuple[int, int]]:
         """Get the current location to coordinate mapping."""
@@ -277,3 +385,19 @@ class LocationMapper:
         lines.extend(location_list)
 
         return "\n".join(lines)
+
+
+_DEFAULT_INDEX: Optional[_PatternIndex] = None
+_DEFAULT_INDEX_LOCK = threading.Lock()
+
+
+def _default_index() -> _PatternIndex:
+    """The shared index of the built-in location patterns."""
+    global _DEFAULT_INDEX
+    if _DEFAULT_INDEX is None:
+        with _DEFAULT_INDEX_LOCK:
+            if _DEFAULT_INDEX is None:
+                _DEFAULT_INDEX = _PatternIndex(
+                    LocationMapper._initialize_location_patterns()
+                )
+    return _DEFAULT_INDEX
@@ -0,0 +1,71 @@
+"""Persistent per-world registry of location coordinates.
+
+Once a location name has been placed, its coordinates are stored in the
+``locations`` table and reused by later batches, so they stay stable across
+calls, workers and restarts. A full re-layout of a world (world generation,
+``assign_spatial_positions``) replaces the world's registry instead.
+"""
+
+from typing import Dict, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+
+def normalize_location(name: str) -> str:
+    return name.lower().strip()
+
+
+def load_locations(db_session: Session, world_id: str) -> Dict[str, Tuple[int, int]]:
+    """Registered location name -> (x, y) for one world."""
+    rows = db_session.execute(
+        text("SELECT name, x, y FROM locations WHERE world_id = :world_id"),
+        {"world_id": world_id},
+    )
+    return {name: (x, y) for name, x, y in rows.fetchall()}
+
+
+def register_locations(
+    db_session: Session, world_id: str, coordinates: Dict[str, Tuple[int, int]]
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Record newly placed locations and return the world's full registry.
+
+    If another writer registered one of the names first, its coordinates
+    win; the returned mapping is what ended up stored. The caller commits.
+    """
+    if coordinates:
+        db_session.execute(
+            text(
+                """
+            INSERT OR IGNORE INTO locations (world_id, name, x, y)
+            VALUES (:world_id, :name, :x, :y)
+        """
+            ),
+            [
+                {"world_id": world_id, "name": name, "x": x, "y": y}
+                for name, (x, y) in coordinates.items()
+            ],
+        )
+    return load_locations(db_session, world_id)
+
+
+def clear_locations(db_session: Session, world_id: str) -> int:
+    """Forget every registered location of a world. The caller commits."""
+    result = db_session.execute(
+        text("DELETE FROM locations WHERE world_id = :world_id"),
+        {"world_id": world_id},
+    )
+    return result.rowcount or 0
+
+
+def replace_locations(
+    db_session: Session, world_id: str, coordinates: Dict[str, Tuple[int, int]]
+) -> Dict[str, Tuple[int, int]]:
+    """Make ``coordinates`` the world's whole registry. The caller commits."""
+    clear_locations(db_session, world_id)
+    return register_locations(
+        db_session,
+        world_id,
+        {normalize_location(name): coords for name, coords in coordinates.items()},
+    )
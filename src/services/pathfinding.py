@@ -0,0 +1,248 @@
+"""Requirement-aware A* routing over the 8-directional storylet grid.
+
+Moving one step along an axis costs 1 and a diagonal step costs sqrt(2), the
+same metric as ``Position.distance_to`` for neighbouring cells. A step is
+only allowed if ``SpatialNavigator.can_move_to_direction`` would allow it:
+the target's requirements must be met, except ``location``, which the move
+itself satisfies.
+
+Goals that are requested often ("hubs") get a distance field: the exact
+distance from every connected cell to the hub, ignoring requirements. If
+the session can walk that field's shortest route, no search is needed.
+Otherwise the field is a perfect heuristic for A*.
+"""
+
+import heapq
+import itertools
+import math
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .spatial_navigator import DIRECTIONS, NeighbourEntry, Position, SpatialNavigator
+
+_DIAGONAL = math.sqrt(2)
+_STEP_COSTS = {
+    name: _DIAGONAL if direction.dx and direction.dy else 1.0
+    for name, direction in DIRECTIONS.items()
+}
+
+
+def octile_distance(a: Position, b: Position) -> float:
+    """Cheapest possible 8-directional travel cost between two cells."""
+    dx, dy = abs(a.x - b.x), abs(a.y - b.y)
+    return max(dx, dy) + (_DIAGONAL - 1) * min(dx, dy)
+
+
+@dataclass
+class PathResult:
+    """A route between two storylets."""
+
+    route: List[int]
+    cost: float
+    expanded: int = 0
+    used_distance_field: bool = False
+
+
+@dataclass
+class DistanceField:
+    """Unconstrained travel cost from every connected cell to one goal."""
+
+    goal: Position
+    layout_version: int
+    distances: Dict[Position, float]
+
+
+class PathPlanner:
+    """Routes between storylets on one navigator's grid."""
+
+    def __init__(
+        self,
+        navigator: SpatialNavigator,
+        hub_threshold: Optional[int] = None,
+        max_fields: Optional[int] = None,
+    ):
+        self.navigator = navigator
+        # Goals requested this many times get a precomputed distance field
+        self.hub_threshold = (
+            hub_threshold
+            if hub_threshold is not None
+            else int(os.getenv("DW_PATH_HUB_THRESHOLD", "3"))
+        )
+        self.max_fields = (
+            max_fields
+            if max_fields is not None
+            else int(os.getenv("DW_PATH_MAX_FIELDS", "32"))
+        )
+        self.max_tracked_goals = max(256, 8 * self.max_fields)
+        # Request counts for goals without a field yet, least recent first
+        self._target_counts: "OrderedDict[int, int]" = OrderedDict()
+        self._fields: "OrderedDict[int, DistanceField]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find_path(
+        self, start_id: int, goal_id: int, player_vars: Dict[str, Any]
+    ) -> Optional[PathResult]:
+        """Cheapest accessible route, or None if the goal cannot be reached."""
+        positions = self.navigator.storylet_positions
+        start, goal = positions.get(start_id), positions.get(goal_id)
+        if start is None or goal is None:
+            return None
+        if start_id == goal_id:
+            return PathResult(route=[start_id], cost=0.0)
+
+        field = self._field_for(goal_id, goal)
+        if field is not None:
+            if start not in field.distances:
+                # Not connected to the goal even ignoring requirements
+                return None
+            route = self._follow_field(field, start, player_vars)
+            if route is not None:
+                return PathResult(
+                    route=route,
+                    cost=field.distances[start],
+                    expanded=len(route),
+                    used_distance_field=True,
+                )
+            distances = field.distances
+            return self._astar(
+                start,
+                goal,
+                player_vars,
+                lambda cell: distances.get(cell, math.inf),
+                used_field=True,
+            )
+        return self._astar(
+            start, goal, player_vars, lambda cell: octile_distance(cell, goal)
+        )
+
+    def _edges(self, cell: Position) -> Iterator[Tuple[NeighbourEntry, float]]:
+        storylet_id = self.navigator.position_storylets.get(cell)
+        if storylet_id is None:
+            return
+        neighbours = self.navigator._neighbours(storylet_id) or {}
+        for direction, entry in neighbours.items():
+            if entry is not None:
+                yield entry, _STEP_COSTS[direction]
+
+    def _astar(
+        self,
+        start: Position,
+        goal: Position,
+        player_vars: Dict[str, Any],
+        heuristic: Callable[[Position], float],
+        used_field: bool = False,
+    ) -> Optional[PathResult]:
+        tie = itertools.count()
+        best: Dict[Position, float] = {start: 0.0}
+        came_from: Dict[Position, Position] = {}
+        closed = set()
+        frontier = [(heuristic(start), 0.0, next(tie), start)]
+        expanded = 0
+
+        while frontier:
+            _, cost, _, cell = heapq.heappop(frontier)
+            if cell in closed:
+                continue
+            if cell == goal:
+                return PathResult(
+                    route=self._route(came_from, cell),
+                    cost=cost,
+                    expanded=expanded,
+                    used_distance_field=used_field,
+                )
+            closed.add(cell)
+            expanded += 1
+            for entry, step in self._edges(cell):
+                target = entry.position
+                if target in closed or not entry.predicate(player_vars):
+                    continue
+                new_cost = cost + step
+                if new_cost < best.get(target, math.inf):
+                    estimate = heuristic(target)
+                    if estimate == math.inf:
+                        continue
+                    best[target] = new_cost
+                    came_from[target] = cell
+                    heapq.heappush(
+                        frontier, (new_cost + estimate, new_cost, next(tie), target)
+                    )
+        return None
+
+    def _route(self, came_from: Dict[Position, Position], cell: Position) -> List[int]:
+        cells = [cell]
+        while cell in came_from:
+            cell = came_from[cell]
+            cells.append(cell)
+        cells.reverse()
+        return [self.navigator.position_storylets[c] for c in cells]
+
+    def _follow_field(
+        self, field: DistanceField, start: Position, player_vars: Dict[str, Any]
+    ) -> Optional[List[int]]:
+        """Walk the field's shortest route if every step is accessible."""
+        distances = field.distances
+        cell = start
+        cells = [start]
+        while cell != field.goal:
+            remaining = distances[cell]
+            next_cell = None
+            for entry, step in self._edges(cell):
+                target_distance = distances.get(entry.position)
+                if (
+                    target_distance is not None
+                    and abs(target_distance + step - remaining) < 1e-9
+                    and entry.predicate(player_vars)
+                ):
+                    next_cell = entry.position
+                    break
+            if next_cell is None:
+                return None
+            cell = next_cell
+            cells.append(cell)
+        return [self.navigator.position_storylets[c] for c in cells]
+
+    def _field_for(self, goal_id: int, goal: Position) -> Optional[DistanceField]:
+        layout_version = self.navigator.layout_version
+        with self._lock:
+            field = self._fields.get(goal_id)
+            if field is not None:
+                if field.goal == goal and field.layout_version == layout_version:
+                    self._fields.move_to_end(goal_id)
+                    return field
+                del self._fields[goal_id]
+            count = self._target_counts.pop(goal_id, 0) + 1
+            if count < self.hub_threshold:
+                self._target_counts[goal_id] = count
+                # Rarely requested goals are forgotten rather than kept forever
+                while len(self._target_counts) > self.max_tracked_goals:
+                    self._target_counts.popitem(last=False)
+                return None
+
+        field = DistanceField(goal, layout_version, self._distances_to(goal))
+        with self._lock:
+            self._fields[goal_id] = field
+            while len(self._fields) > self.max_fields:
+                self._fields.popitem(last=False)
+        return field
+
+    def _distances_to(self, goal: Position) -> Dict[Position, float]:
+        """Dijkstra outward from the goal over every occupied cell."""
+        occupied = self.navigator.position_storylets
+        distances: Dict[Position, float] = {goal: 0.0}
+        frontier = [(0.0, goal.x, goal.y)]
+        while frontier:
+            cost, x, y = heapq.heappop(frontier)
+            if cost > distances.get(Position(x, y), math.inf):
+                continue
+            for name, direction in DIRECTIONS.items():
+                neighbour = Position(x + direction.dx, y + direction.dy)
+                if neighbour not in occupied:
+                    continue
+                new_cost = cost + _STEP_COSTS[name]
+                if new_cost < distances.get(neighbour, math.inf):
+                    distances[neighbour] = new_cost
+                    heapq.heappush(frontier, (new_cost, neighbour.x, neighbour.y))
+        return distances
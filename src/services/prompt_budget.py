@@ -0,0 +1,122 @@
+"""Token budgeting for generation prompts.
+
+Generation bibles embed the player's variables and catalog analysis, which
+grow with the world. Prompts are measured with a local token estimate and,
+when over budget, the JSON context is compacted deterministically: lists
+keep their first items, nested objects their first keys and long strings
+their beginning, at progressively tighter levels until the prompt fits.
+The same input always yields the same prompt, so compacted prompts still
+hit the response cache.
+
+``DW_PROMPT_TOKEN_BUDGET`` caps the prompt side of each call (default 3000).
+"""
+
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Word pieces of up to six characters and single punctuation marks: close
+# to (slightly above) BPE token counts for English prose and JSON, without
+# needing a tokenizer
+_TOKEN_PATTERN = re.compile(r"\w{1,6}|[^\w\s]")
+
+# (max_items, max_chars) from gentlest to tightest; None means unlimited
+COMPACTION_LEVELS: List[Tuple[Optional[int], Optional[int]]] = [
+    (None, None),
+    (20, 400),
+    (10, 200),
+    (5, 120),
+    (3, 60),
+    (1, 40),
+]
+
+# Per-message overhead of the chat format
+_MESSAGE_OVERHEAD = 4
+
+
+def prompt_token_budget() -> int:
+    return max(1, int(os.getenv("DW_PROMPT_TOKEN_BUDGET", "3000")))
+
+
+def count_tokens(text: str) -> int:
+    """Local estimate of the tokens in ``text``."""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def count_message_tokens(messages: List[Dict[str, Any]]) -> int:
+    return sum(
+        count_tokens(str(message.get("content") or "")) + _MESSAGE_OVERHEAD
+        for message in messages
+    )
+
+
+def to_prompt_json(value: Any) -> str:
+    """Compact JSON for prompts; indentation only costs tokens."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def compact(
+    value: Any,
+    max_items: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    _depth: int = 0,
+) -> Any:
+    """
+    Deterministically shrink ``value``.
+
+    Lists keep their first ``max_items`` entries (lists of strings also get
+    a note of how many were dropped); nested objects keep their first ``max_items`` keys (the
+    top level keeps all of them); strings are cut to ``max_chars``.
+    """
+    if isinstance(value, str):
+        if max_chars is not None and len(value) > max_chars:
+            return value[: max(0, max_chars - 1)].rstrip() + "…"
+        return value
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # Sets have no stable order across processes
+        items = sorted(value, key=str) if isinstance(value, (set, frozenset)) else list(value)
+        kept = items if max_items is None else items[:max_items]
+        result = [compact(item, max_items, max_chars, _depth + 1) for item in kept]
+        # Only note the cut in lists of strings, where readers expect text
+        if len(kept) < len(items) and all(isinstance(item, str) for item in kept):
+            result.append(f"... {len(items) - len(kept)} more")
+        return result
+    if isinstance(value, dict):
+        keys = list(value)
+        if _depth > 0 and max_items is not None:
+            kept_keys = keys[:max_items]
+        else:
+            kept_keys = keys
+        result = {
+            key: compact(value[key], max_items, max_chars, _depth + 1)
+            for key in kept_keys
+        }
+        if len(kept_keys) < len(keys):
+            result["_omitted_keys"] = len(keys) - len(kept_keys)
+        return result
+    return value
+
+
+def fit_to_budget(
+    value: Any, budget: int, measure: Optional[Callable[[Any], int]] = None
+) -> Tuple[Any, int]:
+    """
+    ``value`` compacted just enough to fit ``budget`` tokens, with its size.
+
+    ``measure`` gives the token count of a candidate (by default its prompt
+    JSON), so callers can budget the whole prompt a value is rendered into.
+    Returns the tightest level if none fit.
+    """
+    if measure is None:
+        measure = lambda candidate: count_tokens(to_prompt_json(candidate))
+    compacted, tokens = value, 0
+    for max_items, max_chars in COMPACTION_LEVELS:
+        if max_items is None and max_chars is None:
+            compacted = value
+        else:
+            compacted = compact(value, max_items, max_chars)
+        tokens = measure(compacted)
+        if tokens <= budget:
+            break
+    return compacted, tokens
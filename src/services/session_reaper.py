@@ -0,0 +1,233 @@
+"""Background reaper for expired session rows.
+
+Deletes stale ``session_vars`` rows in small keyset-paginated chunks so the
+SQLite write lock is only ever held for one short transaction at a time.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class ReaperRunStats:
+    """Statistics for a single reaper pass."""
+
+    started_at: datetime
+    cutoff: datetime
+    trigger: str = "scheduled"
+    finished_at: Optional[datetime] = None
+    sessions_removed: int = 0
+    cache_entries_removed: int = 0
+    chunks: int = 0
+    duration_ms: float = 0.0
+    error: Optional[str] = None
+    removed_session_ids: List[str] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("removed_session_ids", None)
+        for key in ("started_at", "cutoff", "finished_at"):
+            if data[key] is not None:
+                data[key] = data[key].isoformat()
+        return data
+
+
+class SessionReaper:
+    """
+    Periodically removes sessions that have not been updated within the
+    retention window.
+
+    Each chunk selects at most ``chunk_size`` ids ordered by primary key
+    (resuming after the last id seen), deletes them and commits before moving
+    on. Evicted ids are handed to ``evict`` so in-process caches stay in step
+    with the database.
+    """
+
+    _SELECT_CHUNK = text(
+        """
+        SELECT session_id FROM session_vars
+        WHERE updated_at < :cutoff AND session_id > :after
+        ORDER BY session_id
+        LIMIT :limit
+    """
+    )
+    _DELETE_CHUNK = text(
+        """
+        DELETE FROM session_vars
+        WHERE session_id IN :ids AND updated_at < :cutoff
+    """
+    ).bindparams(bindparam("ids", expanding=True))
+
+    def __init__(
+        self,
+        evict: Optional[Callable[[List[str]], int]] = None,
+        retention_hours: Optional[float] = None,
+        chunk_size: Optional[int] = None,
+        interval_seconds: Optional[float] = None,
+        history_size: int = 20,
+    ):
+        self.evict = evict
+        self.retention_hours = (
+            retention_hours
+            if retention_hours is not None
+            else _env_float("DW_SESSION_RETENTION_HOURS", 24)
+        )
+        self.chunk_size = max(
+            1,
+            int(
+                chunk_size
+                if chunk_size is not None
+                else _env_float("DW_REAPER_CHUNK_SIZE", 500)
+            ),
+        )
+        # An interval of 0 disables the scheduled loop; manual runs still work.
+        self.interval_seconds = (
+            interval_seconds
+            if interval_seconds is not None
+            else _env_float("DW_REAPER_INTERVAL_SECONDS", 3600)
+        )
+        self.history: Deque[ReaperRunStats] = deque(maxlen=history_size)
+        self.total_removed = 0
+        self._run_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event: Optional[asyncio.Event] = None
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Timestamp before which sessions are considered expired."""
+        now = now or datetime.now(timezone.utc)
+        return now - timedelta(hours=self.retention_hours)
+
+    def run_once(self, db: Session, trigger: str = "manual") -> ReaperRunStats:
+        """Run a single chunked reaping pass using the given session."""
+        with self._run_lock:
+            stats = ReaperRunStats(
+                started_at=datetime.now(timezone.utc),
+                cutoff=self.cutoff(),
+                trigger=trigger,
+            )
+            try:
+                after = ""
+                while True:
+                    rows = db.execute(
+                        self._SELECT_CHUNK,
+                        {
+                            "cutoff": stats.cutoff,
+                            "after": after,
+                            "limit": self.chunk_size,
+                        },
+                    ).fetchall()
+                    ids = [row[0] for row in rows]
+                    if not ids:
+                        break
+
+                    db.execute(
+                        self._DELETE_CHUNK, {"ids": ids, "cutoff": stats.cutoff}
+                    )
+                    db.commit()
+
+                    stats.chunks += 1
+                    stats.sessions_removed += len(ids)
+                    stats.removed_session_ids.extend(ids)
+                    if self.evict is not None:
+                        stats.cache_entries_removed += self.evict(ids)
+
+                    if len(ids) < self.chunk_size:
+                        break
+                    after = ids[-1]
+            except Exception as e:
+                stats.error = str(e)
+                raise
+            finally:
+                stats.finished_at = datetime.now(timezone.utc)
+                stats.duration_ms = (
+                    stats.finished_at - stats.started_at
+                ).total_seconds() * 1000
+                self.total_removed += stats.sessions_removed
+                self.history.append(stats)
+
+            return stats
+
+    def _run_in_own_session(self) -> ReaperRunStats:
+        with SessionLocal() as db:
+            try:
+                return self.run_once(db, trigger="scheduled")
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                SessionLocal.remove()
+
+    async def _loop(self):
+        assert self._stop_event is not None
+        while not self._stop_event.is_set():
+            try:
+                stats = await asyncio.to_thread(self._run_in_own_session)
+                if stats.sessions_removed:
+                    logger.info(
+                        f"🧹 Reaper removed {stats.sessions_removed} sessions "
+                        f"in {stats.chunks} chunks ({stats.duration_ms:.1f} ms)"
+                    )
+            except Exception as e:
+                logger.error(f"❌ Session reaper run failed: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._stop_event.wait(), timeout=self.interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> bool:
+        """Start the scheduled loop on the running event loop."""
+        if self.interval_seconds <= 0 or self.is_running:
+            return False
+        self._stop_event = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+        return True
+
+    async def stop(self):
+        """Stop the scheduled loop and wait for the current pass to finish."""
+        if self._task is None:
+            return
+        assert self._stop_event is not None
+        self._stop_event.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+            self._stop_event = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Configuration and recent run statistics for admin endpoints."""
+        return {
+            "running": self.is_running,
+            "retention_hours": self.retention_hours,
+            "chunk_size": self.chunk_size,
+            "interval_seconds": self.interval_seconds,
+            "total_sessions_removed": self.total_removed,
+            "last_run": self.history[-1].to_dict() if self.history else None,
+            "recent_runs": [run.to_dict() for run in reversed(self.history)],
+        }
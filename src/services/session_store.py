@@ -0,0 +1,393 @@
+"""Pluggable session-state stores shared between API workers.
+
+Every store keeps the exported state of an ``AdvancedStateManager`` together
+with a per-session version number that increases on every write. Workers keep
+their own in-process manager cache and compare its version against the store
+on each request (read-through); every save is written straight to the store
+(write-through). Selection is driven by ``DW_SESSION_STORE``:
+
+- ``memory`` (default): process-local, for single-worker deployments
+- ``sqlite`` or ``sqlite:///path/to/file.db``: shared SQLite table
+- ``redis://host:port/db``: any server speaking the Redis protocol
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+
+class SessionVersionConflict(Exception):
+    """Raised when a conditional write finds a newer version in the store."""
+
+    def __init__(self, session_id: str, expected: int, actual: int):
+        super().__init__(
+            f"Session '{session_id}' is at version {actual}, expected {expected}"
+        )
+        self.session_id = session_id
+        self.expected = expected
+        self.actual = actual
+
+
+@dataclass
+class StoredSession:
+    """A versioned snapshot of one session's state."""
+
+    version: int
+    state: Dict[str, Any]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, set):
+        return sorted(value)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_state(state: Dict[str, Any]) -> str:
+    """Serialize exported session state (datetimes and enums included)."""
+    return json.dumps(state, default=_json_default, separators=(",", ":"))
+
+
+class SessionStore(ABC):
+    """Interface for versioned session-state storage."""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[StoredSession]:
+        """Return the stored state and version, or None if unknown."""
+
+    @abstractmethod
+    def get_version(self, session_id: str) -> int:
+        """Return the current version for a session (0 if unknown)."""
+
+    @abstractmethod
+    def put(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> int:
+        """
+        Write state and return the new version.
+
+        When ``expected_version`` is given the write only succeeds if the stored
+        version still matches it; otherwise ``SessionVersionConflict`` is raised.
+        """
+
+    @abstractmethod
+    def delete(self, session_ids: Iterable[str]) -> int:
+        """Remove sessions from the store, returning how many existed."""
+
+
+class InProcessSessionStore(SessionStore):
+    """Process-local store; equivalent to the old module-level cache."""
+
+    def __init__(self):
+        self._data: Dict[str, StoredSession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[StoredSession]:
+        with self._lock:
+            stored = self._data.get(session_id)
+            if stored is None:
+                return None
+            # Hand out a copy so callers cannot mutate the stored snapshot
+            return StoredSession(stored.version, json.loads(encode_state(stored.state)))
+
+    def get_version(self, session_id: str) -> int:
+        with self._lock:
+            stored = self._data.get(session_id)
+            return stored.version if stored else 0
+
+    def put(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> int:
+        snapshot = json.loads(encode_state(state))
+        with self._lock:
+            stored = self._data.get(session_id)
+            current = stored.version if stored else 0
+            if expected_version is not None and expected_version != current:
+                raise SessionVersionConflict(session_id, expected_version, current)
+            self._data[session_id] = StoredSession(current + 1, snapshot)
+            return current + 1
+
+    def delete(self, session_ids: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for session_id in session_ids:
+                if self._data.pop(session_id, None) is not None:
+                    removed += 1
+        return removed
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store backed by a SQLite table that all local workers can share."""
+
+    def __init__(self, db_path: str, table: str = "session_store"):
+        self.db_path = db_path
+        self.table = table
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                session_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; writes use explicit BEGIN IMMEDIATE transactions
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[StoredSession]:
+        row = (
+            self._conn()
+            .execute(
+                f"SELECT version, state FROM {self.table} WHERE session_id = ?",
+                (session_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return StoredSession(row[0], json.loads(row[1]))
+
+    def get_version(self, session_id: str) -> int:
+        row = (
+            self._conn()
+            .execute(
+                f"SELECT version FROM {self.table} WHERE session_id = ?",
+                (session_id,),
+            )
+            .fetchone()
+        )
+        return row[0] if row else 0
+
+    def put(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> int:
+        payload = encode_state(state)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT version FROM {self.table} WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            current = row[0] if row else 0
+            if expected_version is not None and expected_version != current:
+                raise SessionVersionConflict(session_id, expected_version, current)
+            conn.execute(
+                f"""
+                INSERT INTO {self.table} (session_id, version, state, updated_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    version = excluded.version,
+                    state = excluded.state,
+                    updated_at = excluded.updated_at
+            """,
+                (session_id, current + 1, payload, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return current + 1
+
+    def delete(self, session_ids: Iterable[str]) -> int:
+        ids = list(session_ids)
+        if not ids:
+            return 0
+        placeholders = ",".join("?" for _ in ids)
+        cursor = self._conn().execute(
+            f"DELETE FROM {self.table} WHERE session_id IN ({placeholders})", ids
+        )
+        return cursor.rowcount
+
+
+class _RespConnection:
+    """Minimal blocking client for the Redis serialization protocol (RESP2)."""
+
+    def __init__(self, host: str, port: int, db: int = 0, timeout: float = 5.0):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.reader = self.sock.makefile("rb")
+        if db:
+            self.command("SELECT", db)
+
+    def command(self, *args: Any) -> Any:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self.sock.sendall(b"".join(parts))
+        return self._read_reply()
+
+    def _read_reply(self) -> Any:
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by session store server")
+        prefix, body = line[:1], line[1:-2]
+        if prefix == b"+":
+            return body.decode()
+        if prefix == b"-":
+            raise RuntimeError(body.decode())
+        if prefix == b":":
+            return int(body)
+        if prefix == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(body)
+            if length == -1:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise RuntimeError(f"Unexpected reply from session store: {line!r}")
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Store for any Redis-protocol server.
+
+    State and version live under separate keys so version checks are a single
+    cheap GET; conditional writes use WATCH/MULTI/EXEC on the version key.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        key_prefix: str = "dw:session:",
+        max_retries: int = 10,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.key_prefix = key_prefix
+        self.max_retries = max_retries
+        self._local = threading.local()
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisSessionStore":
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        return cls(host=parsed.hostname or "localhost", port=parsed.port or 6379, db=db)
+
+    def _conn(self) -> _RespConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = _RespConnection(self.host, self.port, self.db)
+            self._local.conn = conn
+        return conn
+
+    def _state_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    def _version_key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}:version"
+
+    def get(self, session_id: str) -> Optional[StoredSession]:
+        reply = self._conn().command(
+            "MGET", self._version_key(session_id), self._state_key(session_id)
+        )
+        version, state = reply
+        if version is None or state is None:
+            return None
+        return StoredSession(int(version), json.loads(state))
+
+    def get_version(self, session_id: str) -> int:
+        version = self._conn().command("GET", self._version_key(session_id))
+        return int(version) if version is not None else 0
+
+    def put(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        expected_version: Optional[int] = None,
+    ) -> int:
+        payload = encode_state(state)
+        conn = self._conn()
+        version_key = self._version_key(session_id)
+        for _ in range(self.max_retries):
+            conn.command("WATCH", version_key)
+            current_raw = conn.command("GET", version_key)
+            current = int(current_raw) if current_raw is not None else 0
+            if expected_version is not None and expected_version != current:
+                conn.command("UNWATCH")
+                raise SessionVersionConflict(session_id, expected_version, current)
+            conn.command("MULTI")
+            conn.command("SET", self._state_key(session_id), payload)
+            conn.command("SET", version_key, current + 1)
+            if conn.command("EXEC") is not None:
+                return current + 1
+            # Another worker wrote in between; a conditional write cannot win
+            if expected_version is not None:
+                raise SessionVersionConflict(
+                    session_id, expected_version, self.get_version(session_id)
+                )
+        raise SessionVersionConflict(session_id, current, self.get_version(session_id))
+
+    def delete(self, session_ids: Iterable[str]) -> int:
+        ids = list(session_ids)
+        if not ids:
+            return 0
+        keys: List[str] = []
+        for session_id in ids:
+            keys.append(self._state_key(session_id))
+            keys.append(self._version_key(session_id))
+        removed = self._conn().command("DEL", *keys)
+        return int(removed) // 2
+
+
+def create_session_store(url: Optional[str] = None) -> SessionStore:
+    """Build the store configured by ``url`` or ``DW_SESSION_STORE``."""
+    url = (url or os.getenv("DW_SESSION_STORE") or "memory").strip()
+    if url == "memory":
+        return InProcessSessionStore()
+    if url == "sqlite" or url.startswith("sqlite:///"):
+        path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else ""
+        if not path:
+            from ..database import db_file
+
+            path = db_file
+        return SQLiteSessionStore(path)
+    if url.startswith("redis://"):
+        return RedisSessionStore.from_url(url)
+    raise ValueError(f"Unsupported DW_SESSION_STORE: {url}")
@@ -0,0 +1,84 @@
+"""Coalescing of identical concurrent work.
+
+When several sessions reach the same sparse area at once they issue the
+same generation request. ``SingleFlight`` lets the first caller for a key
+do the work while later callers with the same key wait for and share its
+result (or its exception), so only one completion is paid for.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; duplicates share its outcome."""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+        self.timed_out = 0
+
+    def do(
+        self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Tuple[Any, bool]:
+        """
+        ``(result, shared)``: ``shared`` is True when this caller waited on
+        another caller's in-flight call instead of running ``fn``.
+
+        A waiter gives up with ``TimeoutError`` after ``timeout`` seconds;
+        the in-flight call itself keeps running for its own caller.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                with self._lock:
+                    self.timed_out += 1
+                raise TimeoutError(f"Timed out waiting for in-flight call {key[:16]}")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "timed_out": self.timed_out,
+                "in_flight": len(self._flights),
+            }
@@ -0,0 +1,166 @@
+"""Connected components and reachability over the 8-neighbour storylet grid.
+
+Cells are joined with a union-find structure (path halving, union by size),
+so building the analysis for n cells is effectively linear and adding a cell
+later only touches its 8 neighbours. Removing a cell cannot be undone in a
+union-find; the structure is rebuilt lazily on the next query instead.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+_NEIGHBOUR_OFFSETS = [
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+]
+
+
+class GridConnectivity:
+    """Incremental connected components of occupied grid cells."""
+
+    def __init__(self, cells: Iterable[Cell] = ()):
+        self._cells: Set[Cell] = set()
+        self._parent: Dict[Cell, Cell] = {}
+        self._size: Dict[Cell, int] = {}
+        self._stale = False
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self._cells
+
+    def _find(self, cell: Cell) -> Cell:
+        parent = self._parent
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    def _union(self, a: Cell, b: Cell):
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+
+    def add(self, cell: Cell):
+        """Occupy a cell and merge it with its occupied neighbours."""
+        if cell in self._cells:
+            return
+        self._cells.add(cell)
+        if self._stale:
+            return
+        self._parent[cell] = cell
+        self._size[cell] = 1
+        x, y = cell
+        for dx, dy in _NEIGHBOUR_OFFSETS:
+            neighbour = (x + dx, y + dy)
+            if neighbour in self._parent:
+                self._union(cell, neighbour)
+
+    def remove(self, cell: Cell):
+        """Free a cell; components are recomputed on the next query."""
+        if cell in self._cells:
+            self._cells.discard(cell)
+            self._stale = True
+
+    def _rebuild(self):
+        cells = self._cells
+        self._cells = set()
+        self._parent.clear()
+        self._size.clear()
+        self._stale = False
+        for cell in cells:
+            self.add(cell)
+
+    def component_id(self, cell: Cell) -> Optional[Cell]:
+        """Representative cell of the component containing ``cell``."""
+        if self._stale:
+            self._rebuild()
+        if cell not in self._parent:
+            return None
+        return self._find(cell)
+
+    def connected(self, a: Cell, b: Cell) -> bool:
+        root = self.component_id(a)
+        return root is not None and root == self.component_id(b)
+
+    def components(self) -> List[List[Cell]]:
+        """All components, largest first."""
+        if self._stale:
+            self._rebuild()
+        groups: Dict[Cell, List[Cell]] = {}
+        for cell in self._parent:
+            groups.setdefault(self._find(cell), []).append(cell)
+        return sorted(groups.values(), key=len, reverse=True)
+
+
+@dataclass
+class ReachabilityReport:
+    """Which storylets can be walked to from a start storylet."""
+
+    start_id: Optional[int]
+    total: int
+    component_sizes: List[int] = field(default_factory=list)
+    reachable_ids: List[int] = field(default_factory=list)
+    unreachable_ids: List[int] = field(default_factory=list)
+
+    def to_dict(self) -> Dict:
+        return {
+            "start_id": self.start_id,
+            "total_storylets": self.total,
+            "component_count": len(self.component_sizes),
+            "component_sizes": self.component_sizes,
+            "reachable_count": len(self.reachable_ids),
+            "unreachable_ids": self.unreachable_ids,
+        }
+
+
+def analyze_reachability(
+    positions: Dict[int, Cell],
+    start_id: Optional[int] = None,
+    connectivity: Optional[GridConnectivity] = None,
+) -> ReachabilityReport:
+    """
+    Report the components of ``positions`` (storylet id -> cell) and which
+    storylets share a component with ``start_id``.
+
+    Without a start, the storylet at (0, 0) is used, falling back to the
+    lowest id in the largest component. An up-to-date ``connectivity`` for
+    the same cells can be passed in to skip rebuilding it.
+    """
+    if connectivity is None:
+        connectivity = GridConnectivity(positions.values())
+    components = connectivity.components()
+    if not positions:
+        return ReachabilityReport(start_id=None, total=0)
+
+    if start_id is None or start_id not in positions:
+        at_origin = [sid for sid, cell in positions.items() if cell == (0, 0)]
+        if at_origin:
+            start_id = min(at_origin)
+        else:
+            largest = set(components[0])
+            start_id = min(sid for sid, cell in positions.items() if cell in largest)
+
+    start_root = connectivity.component_id(positions[start_id])
+    reachable, unreachable = [], []
+    for storylet_id, cell in positions.items():
+        if connectivity.component_id(cell) == start_root:
+            reachable.append(storylet_id)
+        else:
+            unreachable.append(storylet_id)
+
+    return ReachabilityReport(
+        start_id=start_id,
+        total=len(positions),
+        component_sizes=[len(component) for component in components],
+        reachable_ids=sorted(reachable),
+        unreachable_ids=sorted(unreachable),
+    )
@@ -0,0 +1,203 @@
+"""Grid-hash index over storylet positions for viewport, radius and k-NN queries.
+
+Distances are Euclidean, as in ``Position.distance_to``.
+"""
+
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .spatial_navigator import Position
+
+Bucket = Tuple[int, int]
+
+
+class GridIndex:
+    """
+    Buckets positions into square cells of ``cell_size`` grid units.
+
+    Bounding-box queries only touch the buckets overlapping the box, so the
+    cost follows the visible area rather than the size of the world.
+    """
+
+    def __init__(self, cell_size: int = 16):
+        if cell_size < 1:
+            raise ValueError("cell_size must be positive")
+        self.cell_size = cell_size
+        self._buckets: Dict[Bucket, Dict[int, Position]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _bucket(self, x: int, y: int) -> Bucket:
+        return (x // self.cell_size, y // self.cell_size)
+
+    def add(self, storylet_id: int, position: Position):
+        bucket = self._buckets.setdefault(self._bucket(position.x, position.y), {})
+        if storylet_id not in bucket:
+            self._count += 1
+        bucket[storylet_id] = position
+
+    def remove(self, storylet_id: int, position: Position):
+        key = self._bucket(position.x, position.y)
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.pop(storylet_id, None) is not None:
+            self._count -= 1
+            if not bucket:
+                del self._buckets[key]
+
+    def clear(self):
+        self._buckets.clear()
+        self._count = 0
+
+    def _overlapping(
+        self, min_x: int, min_y: int, max_x: int, max_y: int
+    ) -> Iterator[Tuple[Bucket, Dict[int, Position], bool]]:
+        """Yield (key, bucket, fully_inside) for buckets touching the box."""
+        min_bx, min_by = self._bucket(min_x, min_y)
+        max_bx, max_by = self._bucket(max_x, max_y)
+        span = (max_bx - min_bx + 1) * (max_by - min_by + 1)
+        if span > len(self._buckets):
+            # Huge boxes over sparse worlds: scanning occupied buckets is cheaper
+            keys = [
+                key
+                for key in self._buckets
+                if min_bx <= key[0] <= max_bx and min_by <= key[1] <= max_by
+            ]
+        else:
+            keys = [
+                (bx, by)
+                for bx in range(min_bx, max_bx + 1)
+                for by in range(min_by, max_by + 1)
+                if (bx, by) in self._buckets
+            ]
+        size = self.cell_size
+        for key in keys:
+            bx, by = key
+            inside = (
+                bx * size >= min_x
+                and by * size >= min_y
+                and (bx + 1) * size - 1 <= max_x
+                and (by + 1) * size - 1 <= max_y
+            )
+            yield key, self._buckets[key], inside
+
+    def query_bbox(
+        self, min_x: int, min_y: int, max_x: int, max_y: int
+    ) -> List[Tuple[int, Position]]:
+        """Storylets inside the inclusive box, ordered by (y, x)."""
+        found: List[Tuple[int, Position]] = []
+        for _, bucket, inside in self._overlapping(min_x, min_y, max_x, max_y):
+            if inside:
+                found.extend(bucket.items())
+            else:
+                found.extend(
+                    (sid, pos)
+                    for sid, pos in bucket.items()
+                    if min_x <= pos.x <= max_x and min_y <= pos.y <= max_y
+                )
+        found.sort(key=lambda item: (item[1].y, item[1].x))
+        return found
+
+    def cluster_counts(
+        self, min_x: int, min_y: int, max_x: int, max_y: int, tile_size: int
+    ) -> List[Dict[str, int]]:
+        """
+        Count storylets per ``tile_size`` square tile inside the box.
+
+        Buckets that lie wholly inside the box and inside one tile are counted
+        without visiting their positions.
+        """
+        counts: Dict[Bucket, int] = {}
+        aligned = tile_size % self.cell_size == 0
+        for (bx, by), bucket, inside in self._overlapping(min_x, min_y, max_x, max_y):
+            if inside and aligned:
+                tile = (
+                    (bx * self.cell_size) // tile_size,
+                    (by * self.cell_size) // tile_size,
+                )
+                counts[tile] = counts.get(tile, 0) + len(bucket)
+                continue
+            for pos in bucket.values():
+                if min_x <= pos.x <= max_x and min_y <= pos.y <= max_y:
+                    tile = (pos.x // tile_size, pos.y // tile_size)
+                    counts[tile] = counts.get(tile, 0) + 1
+        return [
+            {"x": tx * tile_size, "y": ty * tile_size, "size": tile_size, "count": count}
+            for (tx, ty), count in sorted(counts.items(), key=lambda i: (i[0][1], i[0][0]))
+        ]
+
+    def within_radius(
+        self, center: Position, radius: float
+    ) -> List[Tuple[int, Position, float]]:
+        """Storylets within ``radius`` of ``center``, nearest first."""
+        reach = int(math.floor(radius))
+        found = []
+        for storylet_id, pos in self.query_bbox(
+            center.x - reach, center.y - reach, center.x + reach, center.y + reach
+        ):
+            distance = pos.distance_to(center)
+            if distance <= radius:
+                found.append((storylet_id, pos, distance))
+        found.sort(key=lambda item: (item[2], item[1].y, item[1].x))
+        return found
+
+    def nearest(
+        self, center: Position, k: int, max_distance: Optional[float] = None
+    ) -> List[Tuple[int, Position, float]]:
+        """
+        The ``k`` storylets closest to ``center`` (optionally within
+        ``max_distance``), nearest first.
+
+        Buckets are visited in square rings around the centre's bucket; the
+        search stops once no unvisited bucket can hold anything closer than
+        the current k-th result.
+        """
+        if k <= 0 or not self._buckets:
+            return []
+        size = self.cell_size
+        cbx, cby = self._bucket(center.x, center.y)
+        # Ring beyond which no occupied bucket exists
+        last_ring = max(
+            max(abs(bx - cbx), abs(by - cby)) for bx, by in self._buckets
+        )
+        limit = math.inf if max_distance is None else max_distance
+
+        # Max-heap of the best k so far: (-distance, -y, -x, id, position)
+        best: List[Tuple[float, int, int, int, Position]] = []
+        for ring in range(last_ring + 1):
+            # Every cell in this ring is at least this far along one axis
+            ring_floor = 0 if ring == 0 else (ring - 1) * size + 1
+            kth = -best[0][0] if len(best) == k else math.inf
+            if ring_floor > min(kth, limit):
+                break
+            for key in self._ring_keys(cbx, cby, ring):
+                bucket = self._buckets.get(key)
+                if not bucket:
+                    continue
+                for storylet_id, pos in bucket.items():
+                    distance = pos.distance_to(center)
+                    if distance > limit:
+                        continue
+                    item = (-distance, -pos.y, -pos.x, storylet_id, pos)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+        found = [(sid, pos, -neg) for neg, _, _, sid, pos in best]
+        found.sort(key=lambda item: (item[2], item[1].y, item[1].x))
+        return found
+
+    @staticmethod
+    def _ring_keys(cbx: int, cby: int, ring: int) -> Iterator[Bucket]:
+        if ring == 0:
+            yield (cbx, cby)
+            return
+        for bx in range(cbx - ring, cbx + ring + 1):
+            yield (bx, cby - ring)
+            yield (bx, cby + ring)
+        for by in range(cby - ring + 1, cby + ring):
+            yield (cbx - ring, by)
+            yield (cbx + ring, by)
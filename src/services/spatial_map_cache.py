@@ -0,0 +1,100 @@
+"""Pre-serialized spatial map payloads keyed by world catalog version.
+
+Map responses only change when a world's catalog version changes, so they
+are encoded once (JSON bytes, a gzip copy and an ETag) and served as-is until
+the version moves on or the entry ages out.
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+@dataclass
+class EncodedPayload:
+    """A JSON response body encoded once and reused."""
+
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    created_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def from_data(cls, data: Any) -> "EncodedPayload":
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode(
+            "utf-8"
+        )
+        # mtime=0 keeps the compressed bytes identical across rebuilds
+        gzip_body = gzip.compress(body, compresslevel=6, mtime=0)
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        return cls(body=body, gzip_body=gzip_body, etag=etag)
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Whether an ``If-None-Match`` header already names this payload."""
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == "*" or tag == self.etag:
+                return True
+        return False
+
+
+def columnar_map(storylets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Parallel id/x/y/title arrays for clients rendering many nodes."""
+    return {
+        "encoding": "columnar",
+        "count": len(storylets),
+        "id": [s["id"] for s in storylets],
+        "x": [s["position"]["x"] for s in storylets],
+        "y": [s["position"]["y"] for s in storylets],
+        "title": [s["title"] for s in storylets],
+    }
+
+
+class EncodedPayloadCache:
+    """Bounded LRU of encoded payloads with an optional age limit."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, EncodedPayload]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self, key: Hashable, build: Callable[[], Any]
+    ) -> EncodedPayload:
+        """Return the cached payload for ``key``, building it on a miss."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None and not self._expired(payload):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+            self.misses += 1
+
+        payload = EncodedPayload.from_data(build())
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def _expired(self, payload: EncodedPayload) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.monotonic() - payload.created_at >= self.ttl_seconds
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -2,10 +2,19 @@
 
 import json
 import math
-from typing import Dict, List, Tuple, Optional, Any
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+
+from .grid_snapshot import load_snapshot, position_fingerprint, write_snapshot
+from .occupancy import OccupancyGrid
+from .spatial_analysis import GridConnectivity, ReachabilityReport, analyze_reachability
 
 
 @dataclass
@@ -46,15 +55,153 @@ DIRECTIONS = {
 }
 
 
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "gte": lambda value, bound: value >= bound,
+    "lte": lambda value, bound: value <= bound,
+    "gt": lambda value, bound: value > bound,
+    "lt": lambda value, bound: value < bound,
+}
+
+
+def compile_requirements(
+    requirements: Dict[str, Any],
+) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile a requirements dict into a predicate over player variables.
+
+    Every key must be present, dict values hold ``gte``/``lte``/``gt``/``lt``
+    bounds (other operators are ignored) and anything else is compared for
+    equality. Neighbour predicates are compiled without the target's
+    ``location`` requirement, since stepping onto the target is what sets it.
+    """
+    checks: List[Tuple[str, Callable[[Any], bool]]] = []
+    for key, expected in (requirements or {}).items():
+        if isinstance(expected, dict):
+            bounds = [
+                (_COMPARISONS[op], bound)
+                for op, bound in expected.items()
+                if op in _COMPARISONS
+            ]
+            checks.append(
+                (key, lambda value, b=bounds: all(cmp(value, bound) for cmp, bound in b))
+            )
+        else:
+            checks.append((key, lambda value, e=expected: value == e))
+
+    def predicate(player_vars: Dict[str, Any]) -> bool:
+        for key, check in checks:
+            if key not in player_vars or not check(player_vars[key]):
+                return False
+        return True
+
+    return predicate
+
+
+@dataclass
+class NeighbourEntry:
+    """Precomputed details of the storylet one step away in a direction."""
+
+    target_id: int
+    position: Position
+    info: Dict[str, Any]
+    # Whether a session may step onto the target. ``location`` is left out:
+    # moving there is what sets it. Movement and pathfinding share this check.
+    predicate: Callable[[Dict[str, Any]], bool]
+    referenced_vars: Tuple[str, ...]
+
+
+_MISSING = object()
+
+# Largest id list sent in a single IN (...) lookup
+_SUMMARY_CHUNK = 500
+
+# Zoom level at which map tiles switch from cluster counts to storylets;
+# each level below doubles the side of a cluster tile
+DETAIL_ZOOM = 4
+
+
+def _load_json_list(raw: Any) -> List[Any]:
+    try:
+        value = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def write_positions(db_session: Session, positions: Dict[int, Position]) -> int:
+    """Store positions in the ``position`` JSON column with one executemany."""
+    if not positions:
+        return 0
+    db_session.execute(
+        text(
+            """
+        UPDATE storylets 
+        SET position = :position 
+        WHERE id = :id
+    """
+        ),
+        [
+            {"id": storylet_id, "position": json.dumps({"x": pos.x, "y": pos.y})}
+            for storylet_id, pos in positions.items()
+        ],
+    )
+    db_session.commit()
+    return len(positions)
+
+
 class SpatialNavigator:
     """Manages spatial relationships between storylets."""
 
-    def __init__(self, db_session: Session):
-        self.db = db_session
+    def __init__(
+        self,
+        db_session: Session,
+        world_id: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        # Shared navigators serve many requests at once, so each thread binds
+        # its own request session (see bind); db_session is the fallback
+        self._default_db = db_session
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        # Restrict to one world's storylets; None means every world
+        self.world_id = world_id
         self.storylet_positions: Dict[int, Position] = {}
         self.position_storylets: Dict[Position, int] = {}
+        # storylet id -> {"title", "text", "requires"} for navigation responses
+        self._summaries: Dict[int, Dict[str, Any]] = {}
+        # Occupied cell -> direction -> neighbour; built on first use and then
+        # patched for the cells around each placement
+        self._nav_table: Dict[Position, Dict[str, Optional[NeighbourEntry]]] = {}
+        self._nav_table_built = False
+        self._dirty_cells: Set[Position] = set()
+        # session -> {(cell, direction): (revision, referenced values, allowed)}
+        self._accessibility: "OrderedDict[str, Dict[Tuple[Position, str], Tuple[Any, Tuple[Any, ...], bool]]]" = OrderedDict()
+        self.max_cached_sessions = 10000
+        # Bumped on every layout change; derived data such as distance
+        # fields records the version it was computed at
+        self.layout_version = 0
+        self._path_planner = None
+        # Placements not yet written to the database
+        self._pending_positions: Dict[int, Position] = {}
+        from .spatial_index import GridIndex
+
+        self.grid_index = GridIndex()
+        self.occupancy = OccupancyGrid()
+        self.connectivity = GridConnectivity()
+        # Binary grid snapshot used for faster cold starts; rows are copied
+        # out of it, so it is not shared between workers (see grid_snapshot)
+        self.snapshot_path = snapshot_path
+        self.loaded_from_snapshot = False
         self._load_positions()
 
+    @property
+    def db(self) -> Session:
+        return getattr(self._local, "db", None) or self._default_db
+
+    def bind(self, db_session: Session):
+        """Use ``db_session`` for this thread's queries."""
+        self._local.db = db_session
+
     @staticmethod
     def auto_assign_coordinates(
         db_session: Session, storylet_ids: Optional[List[int]] = None
@@ -70,13 +217,18 @@ class SpatialNavigator:
             Number of storylets updated with coordinates
         """
         from .location_mapper import LocationMapper
+        from .location_registry import (
+            load_locations,
+            normalize_location,
+            register_locations,
+        )
 
         # Build query based on whether specific IDs are provided
         # Now, we check for position field being null or missing
         if storylet_ids:
             id_placeholders = ",".join([":id" + str(i) for i in range(len(storylet_ids))])
             query = f"""
-                SELECT id, title, requires, position 
+                SELECT id, world_id, title, requires, choices, position 
                 FROM storylets 
                 WHERE id IN ({id_placeholders})
                 AND (position IS NULL OR json_type(position, '$.x') IS NULL OR json_type(position, '$.y') IS NULL)
@@ -89,7 +241,7 @@ class SpatialNavigator:
             result = db_session.execute(
                 text(
                     """
-                SELECT id, title, requires, position 
+                SELECT id, world_id, title, requires, choices, position 
                 FROM storylets 
                 WHERE (position IS NULL OR json_type(position, '$.x') IS NULL OR json_type(position, '$.y') IS NULL)
                 AND requires IS NOT NULL 
@@ -100,7 +252,7 @@ class SpatialNavigator:
 
         storylets_to_fix = []
         for row in result.fetchall():
-            id_val, title, requires_json, position_json = row
+            id_val, world_id, title, requires_json, choices_json, position_json = row
             try:
                 requires = json.loads(requires_json) if requires_json else {}
             except:
@@ -110,9 +262,11 @@ class SpatialNavigator:
                 storylets_to_fix.append(
                     {
                         "id": id_val,
+                        "world_id": world_id,
                         "title": title,
                         "requires": requires,
-                        "choices": [],
+                        # Choices that change location feed the layout engine
+                        "choices": _load_json_list(choices_json),
                         "weight": 1.0,
                         "position": json.loads(position_json) if position_json else None,
                     }
@@ -121,30 +275,34 @@ class SpatialNavigator:
         if not storylets_to_fix:
             return 0
 
-        # Use LocationMapper to assign coordinates
-        mapper = LocationMapper()
-        storylets_with_coords = mapper.assign_coordinates_to_storylets(storylets_to_fix)
-
-        # Update database with coordinates
-        updates_made = 0
-        for storylet_data in storylets_with_coords:
-            if "position" in storylet_data and storylet_data["position"]:
-                position = storylet_data["position"]
-                storylet_id = storylet_data["id"]
-                db_session.execute(
-                    text(
-                        """
-                    UPDATE storylets 
-                    SET position = :position 
-                    WHERE id = :id
-                """
-                    ),
-                    {"position": json.dumps(position), "id": storylet_id},
-                )
-                updates_made += 1
-
+        by_world: Dict[str, List[Dict]] = {}
+        for storylet_data in storylets_to_fix:
+            by_world.setdefault(storylet_data["world_id"], []).append(storylet_data)
+
+        # Registered locations keep their coordinates; LocationMapper only
+        # places names the world has not seen before
+        positions: Dict[int, Position] = {}
+        for world_id, world_storylets in by_world.items():
+            known = load_locations(db_session, world_id)
+            mapper = LocationMapper()
+            mapper.assign_coordinates_to_storylets(world_storylets, known)
+            new_locations = {
+                name: coords
+                for name, coords in mapper.get_location_map().items()
+                if name not in known
+            }
+            registry = register_locations(db_session, world_id, new_locations)
+
+            for storylet_data in world_storylets:
+                location = storylet_data["requires"].get("location")
+                if not isinstance(location, str):
+                    continue
+                coords = registry.get(normalize_location(location))
+                if coords is not None:
+                    positions[storylet_data["id"]] = Position(*coords)
+
+        updates_made = write_positions(db_session, positions)
         if updates_made > 0:
-            db_session.commit()
             print(f"📍 Auto-assigned coordinates to {updates_made} storylets")
 
         return updates_made
@@ -160,18 +318,34 @@ class SpatialNavigator:
         """
         return SpatialNavigator.auto_assign_coordinates(db_session, None)
 
+    def _index_position(self, storylet_id: int, pos: Position):
+        self.storylet_positions[storylet_id] = pos
+        self.position_storylets[pos] = storylet_id
+        self.grid_index.add(storylet_id, pos)
+        self.occupancy.occupy((pos.x, pos.y))
+        self.connectivity.add((pos.x, pos.y))
+
     def _load_positions(self):
-        """Load storylet positions from database."""
+        """Load storylet positions from the snapshot if current, else the database."""
+        fingerprint = None
+        if self.snapshot_path:
+            try:
+                fingerprint = position_fingerprint(self.db, self.world_id)
+                if self._load_snapshot(fingerprint):
+                    return
+            except Exception as e:
+                print(f"⚠️ Warning: Could not use grid snapshot: {e}")
         try:
-            result = self.db.execute(
-                text(
-                    """
+            query = """
                 SELECT id, position 
                 FROM storylets 
                 WHERE position IS NOT NULL
             """
-                )
-            )
+            params: Dict[str, Any] = {}
+            if self.world_id is not None:
+                query += " AND world_id = :world_id"
+                params["world_id"] = self.world_id
+            result = self.db.execute(text(query), params)
 
             for row in result.fetchall():
                 storylet_id, position_json = row
@@ -180,15 +354,134 @@ class SpatialNavigator:
                 except:
                     position = None
                 if position and "x" in position and "y" in position:
-                    pos = Position(position["x"], position["y"])
-                    self.storylet_positions[storylet_id] = pos
-                    self.position_storylets[pos] = storylet_id
+                    self._index_position(
+                        storylet_id, Position(position["x"], position["y"])
+                    )
 
         except Exception as e:
             print(f"⚠️ Warning: Could not load spatial positions: {e}")
             # Initialize empty if table doesn't have spatial columns yet
             self.storylet_positions = {}
             self.position_storylets = {}
+            self.grid_index.clear()
+            self.occupancy.clear()
+            self.connectivity = GridConnectivity()
+            return
+
+        if fingerprint is not None:
+            # Fingerprint taken before the load: a concurrent change leaves
+            # the snapshot stale rather than wrong
+            try:
+                self._write_snapshot(self.snapshot_path, fingerprint)
+            except Exception as e:
+                print(f"⚠️ Warning: Could not write grid snapshot: {e}")
+
+    def _load_snapshot(self, fingerprint: Tuple[int, int, float]) -> bool:
+        """Copy the snapshot's rows into this navigator if it is current."""
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return False
+        with snapshot:
+            if snapshot.fingerprint != fingerprint:
+                return False
+            for storylet_id, x, y in snapshot.items():
+                self._index_position(storylet_id, Position(x, y))
+        self.loaded_from_snapshot = True
+        return True
+
+    def _write_snapshot(self, path: str, fingerprint: Tuple[int, int, float]):
+        with self._lock:
+            cells = {
+                storylet_id: (pos.x, pos.y)
+                for storylet_id, pos in self.storylet_positions.items()
+            }
+        write_snapshot(path, cells, fingerprint)
+
+    def export_snapshot(self, path: Optional[str] = None) -> str:
+        """
+        Write the current grid as a binary snapshot for other workers.
+
+        Pending placements are flushed first so the snapshot's fingerprint
+        matches what is in the database.
+        """
+        path = path or self.snapshot_path
+        if not path:
+            raise ValueError("No snapshot path given")
+        self.flush_positions()
+        self._write_snapshot(path, position_fingerprint(self.db, self.world_id))
+        return path
+
+    def refresh(self) -> Dict[str, int]:
+        """
+        Re-read positions and storylet details, patching only what changed.
+
+        Moved, added or removed storylets update the position maps and grid
+        index in place, and only the neighbour-table cells around changed
+        storylets are rebuilt on the next lookup.
+        """
+        query = """
+            SELECT id, position, title, text_template, requires 
+            FROM storylets 
+            WHERE position IS NOT NULL
+        """
+        params: Dict[str, Any] = {}
+        if self.world_id is not None:
+            query += " AND world_id = :world_id"
+            params["world_id"] = self.world_id
+        rows = self.db.execute(text(query), params).fetchall()
+
+        positions: Dict[int, Position] = {}
+        for row in rows:
+            try:
+                position = json.loads(row[1]) if isinstance(row[1], str) else row[1]
+            except ValueError:
+                position = None
+            if isinstance(position, dict) and "x" in position and "y" in position:
+                positions[row[0]] = Position(position["x"], position["y"])
+
+        with self._lock:
+            moved = removed = 0
+            for storylet_id, old_pos in list(self.storylet_positions.items()):
+                new_pos = positions.get(storylet_id)
+                if new_pos == old_pos:
+                    continue
+                del self.storylet_positions[storylet_id]
+                self.grid_index.remove(storylet_id, old_pos)
+                if self.position_storylets.get(old_pos) == storylet_id:
+                    del self.position_storylets[old_pos]
+                    self.occupancy.release((old_pos.x, old_pos.y))
+                    self.connectivity.remove((old_pos.x, old_pos.y))
+                self._mark_cells_dirty(old_pos)
+                if new_pos is None:
+                    removed += 1
+                else:
+                    moved += 1
+
+            added = 0
+            for storylet_id, new_pos in positions.items():
+                if storylet_id in self.storylet_positions:
+                    continue
+                self.storylet_positions[storylet_id] = new_pos
+                self.position_storylets[new_pos] = storylet_id
+                self.grid_index.add(storylet_id, new_pos)
+                self.occupancy.occupy((new_pos.x, new_pos.y))
+                self.connectivity.add((new_pos.x, new_pos.y))
+                self._mark_cells_dirty(new_pos)
+                added += 1
+            added -= moved
+
+            previous = self._summaries
+            self._summaries = {}
+            self._remember_summaries(
+                (row[0], row[2], row[3], row[4]) for row in rows if row[0] in positions
+            )
+            edited = 0
+            for storylet_id, summary in self._summaries.items():
+                if previous.get(storylet_id, summary) != summary:
+                    self._mark_cells_dirty(positions[storylet_id])
+                    edited += 1
+
+        return {"added": added, "moved": moved, "removed": removed, "edited": edited}
 
     def _ensure_spatial_columns(self):
         """Ensure the database has spatial columns."""
@@ -199,6 +492,14 @@ class SpatialNavigator:
         self, storylets: List[Dict[str, Any]], start_pos: Optional[Position] = None
     ) -> Dict[int, Position]:
         """Assign spatial positions to storylets based on their connections and locations."""
+        # Shared navigators serve concurrent readers; rebuild under the lock
+        # so they never see a half-placed grid
+        with self._lock:
+            return dict(self._assign_spatial_positions(storylets, start_pos))
+
+    def _assign_spatial_positions(
+        self, storylets: List[Dict[str, Any]], start_pos: Optional[Position]
+    ) -> Dict[int, Position]:
         if start_pos is None:
             start_pos = Position(0, 0)
 
@@ -207,6 +508,10 @@ class SpatialNavigator:
         # Clear existing positions for new world generation
         self.storylet_positions.clear()
         self.position_storylets.clear()
+        self.grid_index.clear()
+        self.occupancy.clear()
+        self.connectivity = GridConnectivity()
+        self._reset_navigation_table()
 
         # Use LocationMapper to assign coordinates to storylets based on location names
         from .location_mapper import LocationMapper
@@ -216,7 +521,13 @@ class SpatialNavigator:
 
         # Build title -> id map from database
         storylet_map: Dict[str, int] = {}
-        cursor = self.db.execute(text("SELECT id, title FROM storylets"))
+        if self.world_id is not None:
+            cursor = self.db.execute(
+                text("SELECT id, title FROM storylets WHERE world_id = :world_id"),
+                {"world_id": self.world_id},
+            )
+        else:
+            cursor = self.db.execute(text("SELECT id, title FROM storylets"))
         for row in cursor.fetchall():
             storylet_map[row[1]] = row[0]
 
@@ -261,6 +572,15 @@ class SpatialNavigator:
             )
             self._place_by_connections(unplaced_storylets, storylet_map, start_pos)
 
+        if self.world_id is not None:
+            # Later auto_assign_coordinates batches place by the registry, so
+            # it must describe this layout rather than the one it replaced
+            from .location_registry import replace_locations
+
+            replace_locations(self.db, self.world_id, mapper.get_location_map())
+            self.db.commit()
+
+        self.flush_positions()
         return self.storylet_positions
 
     def _place_by_connections(
@@ -337,24 +657,7 @@ class SpatialNavigator:
 
     def _find_free_position(self, preferred_pos: Position) -> Position:
         """Find the nearest free position to the preferred position."""
-        if preferred_pos not in self.position_storylets:
-            return preferred_pos
-
-        # Spiral outward to find a free position
-        for radius in range(1, 20):  # Max search radius
-            for angle in range(0, 360, 45):  # Check 8 directions
-                x = preferred_pos.x + int(radius * math.cos(math.radians(angle)))
-                y = preferred_pos.y + int(radius * math.sin(math.radians(angle)))
-                pos = Position(x, y)
-
-                if pos not in self.position_storylets:
-                    return pos
-
-        # Fallback: use a random nearby position
-        import random
-
-        offset = random.randint(-10, 10)
-        return Position(preferred_pos.x + offset, preferred_pos.y + offset)
+        return Position(*self.occupancy.nearest_free(preferred_pos.x, preferred_pos.y))
 
     def _suggest_nearby_position(self, center: Position) -> Position:
         """Suggest a position near the center for connected storylets."""
@@ -368,21 +671,32 @@ class SpatialNavigator:
 
     def _place_storylet(self, storylet_id: int, position: Position):
         """Place a storylet at a specific position."""
-        self.storylet_positions[storylet_id] = position
-        self.position_storylets[position] = storylet_id
-
-        # Update database
-        self.db.execute(
-            text(
-                """
-            UPDATE storylets 
-            SET spatial_x = :x, spatial_y = :y 
-            WHERE id = :id
-        """
-            ),
-            {"x": position.x, "y": position.y, "id": storylet_id},
-        )
-        self.db.commit()
+        with self._lock:
+            previous = self.storylet_positions.get(storylet_id)
+            if previous is not None:
+                self.grid_index.remove(storylet_id, previous)
+                if self.position_storylets.get(previous) == storylet_id:
+                    del self.position_storylets[previous]
+                    self.occupancy.release((previous.x, previous.y))
+                    self.connectivity.remove((previous.x, previous.y))
+                    self._mark_cells_dirty(previous)
+            self.storylet_positions[storylet_id] = position
+            self.position_storylets[position] = storylet_id
+            self.grid_index.add(storylet_id, position)
+            self.occupancy.occupy((position.x, position.y))
+            self.connectivity.add((position.x, position.y))
+            self._mark_cells_dirty(position)
+
+            # Persisted in bulk by flush_positions()
+            self._pending_positions[storylet_id] = position
+
+    def flush_positions(self) -> int:
+        """Write all pending placements in one transaction; returns the count."""
+        with self._lock:
+            pending, self._pending_positions = self._pending_positions, {}
+        if not pending:
+            return 0
+        return write_positions(self.db, pending)
 
     def _get_connected_storylets(
         self, storylet_id: int, storylets: List[Dict], storylet_map: Dict[str, int]
@@ -416,134 +730,447 @@ class SpatialNavigator:
 
         return connected
 
-    def get_directional_navigation(
-        self, current_storylet_id: int
-    ) -> Dict[str, Optional[Dict]]:
-        """Get available navigation options in 8 directions from current position."""
-        if current_storylet_id not in self.storylet_positions:
-            return {direction: None for direction in DIRECTIONS.keys()}
+    def _get_storylet_summaries(self, storylet_ids: List[int]) -> Dict[int, Dict]:
+        """Return title/text/requires for storylets, loading misses in one query."""
+        missing = [sid for sid in storylet_ids if sid not in self._summaries]
+        # Chunk very large lookups to stay under SQLite's bound-parameter limit
+        for start in range(0, len(missing), _SUMMARY_CHUNK):
+            cursor = self.db.execute(
+                text(
+                    """
+                SELECT id, title, text_template, requires 
+                FROM storylets 
+                WHERE id IN :ids
+            """
+                ).bindparams(bindparam("ids", expanding=True)),
+                {"ids": missing[start : start + _SUMMARY_CHUNK]},
+            )
+            self._remember_summaries(cursor.fetchall())
+        return {sid: self._summaries[sid] for sid in storylet_ids if sid in self._summaries}
+
+    def _load_all_summaries(self) -> Dict[int, Dict]:
+        """Summaries for every positioned storylet, in one query over the world."""
+        if any(sid not in self._summaries for sid in self.storylet_positions):
+            query = """
+                SELECT id, title, text_template, requires 
+                FROM storylets 
+                WHERE position IS NOT NULL
+            """
+            params: Dict[str, Any] = {}
+            if self.world_id is not None:
+                query += " AND world_id = :world_id"
+                params["world_id"] = self.world_id
+            self._remember_summaries(self.db.execute(text(query), params).fetchall())
+        return self._summaries
+
+    def _remember_summaries(self, rows):
+        for row in rows:
+            requires = row[3]
+            if isinstance(requires, str):
+                requires = json.loads(requires) if requires else {}
+            self._summaries[row[0]] = {
+                "title": row[1],
+                "text": row[2] or "",
+                "requires": requires or {},
+            }
+
+    def invalidate_summaries(self):
+        """Forget cached storylet details (after storylets are edited)."""
+        with self._lock:
+            self._summaries.clear()
+            self._reset_navigation_table()
+
+    def _reset_navigation_table(self):
+        self.layout_version += 1
+        self._nav_table.clear()
+        self._nav_table_built = False
+        self._dirty_cells.clear()
+        self._accessibility.clear()
+
+    def _mark_cells_dirty(self, position: Position):
+        """Flag a cell and its 8 neighbours for a neighbour-table rebuild."""
+        self.layout_version += 1
+        if not self._nav_table_built:
+            return
+        self._dirty_cells.add(position)
+        for direction in DIRECTIONS.values():
+            self._dirty_cells.add(
+                Position(position.x + direction.dx, position.y + direction.dy)
+            )
 
-        current_pos = self.storylet_positions[current_storylet_id]
-        navigation = {}
+    def _ensure_navigation_table(self):
+        """Build the neighbour table, or patch the cells touched since."""
+        with self._lock:
+            self._update_navigation_table()
 
-        for direction_name, direction in DIRECTIONS.items():
-            target_pos = Position(
-                current_pos.x + direction.dx, current_pos.y + direction.dy
-            )
+    def _update_navigation_table(self):
+        if not self._nav_table_built:
+            cells = list(self.position_storylets)
+        elif self._dirty_cells:
+            cells = list(self._dirty_cells)
+        else:
+            return
 
-            if target_pos in self.position_storylets:
-                target_id = self.position_storylets[target_pos]
-
-                # Get storylet details
-                cursor = self.db.execute(
-                    text(
-                        """
-                    SELECT id, title, text_template, requires 
-                    FROM storylets 
-                    WHERE id = :target_id
-                """
-                    ),
-                    {"target_id": target_id},
+        for cell in cells:
+            self._nav_table.pop(cell, None)
+        cells = [cell for cell in cells if cell in self.position_storylets]
+
+        targets: Dict[Position, Dict[str, Tuple[int, Position]]] = {}
+        for cell in cells:
+            neighbours: Dict[str, Tuple[int, Position]] = {}
+            for direction_name, direction in DIRECTIONS.items():
+                target_pos = Position(cell.x + direction.dx, cell.y + direction.dy)
+                target_id = self.position_storylets.get(target_pos)
+                if target_id is not None:
+                    neighbours[direction_name] = (target_id, target_pos)
+            targets[cell] = neighbours
+
+        # One query covers every storylet referenced by the rebuilt cells
+        if not self._nav_table_built:
+            summaries = self._load_all_summaries()
+        else:
+            summaries = self._get_storylet_summaries(
+                list(
+                    {
+                        target_id
+                        for neighbours in targets.values()
+                        for target_id, _ in neighbours.values()
+                    }
                 )
+            )
 
-                row = cursor.fetchone()
-                if row:
-                    navigation[direction_name] = {
-                        "id": row[0],
-                        "title": row[1],
-                        "text": row[2][:100] + "..." if len(row[2]) > 100 else row[2],
-                        "requires": json.loads(row[3]) if row[3] else {},
+        for cell, neighbours in targets.items():
+            row: Dict[str, Optional[NeighbourEntry]] = {}
+            for direction_name, direction in DIRECTIONS.items():
+                row[direction_name] = None
+                if direction_name not in neighbours:
+                    continue
+                target_id, target_pos = neighbours[direction_name]
+                summary = summaries.get(target_id)
+                if summary is None:
+                    continue
+                text_value = summary["text"]
+                requires = summary["requires"]
+                travel_requires = {k: v for k, v in requires.items() if k != "location"}
+                row[direction_name] = NeighbourEntry(
+                    target_id=target_id,
+                    position=target_pos,
+                    info={
+                        "id": target_id,
+                        "title": summary["title"],
+                        "text": text_value[:100] + "..."
+                        if len(text_value) > 100
+                        else text_value,
+                        "requires": requires,
                         "symbol": direction.symbol,
                         "position": {"x": target_pos.x, "y": target_pos.y},
-                    }
-                else:
-                    navigation[direction_name] = None
-            else:
-                navigation[direction_name] = None
+                    },
+                    predicate=compile_requirements(travel_requires),
+                    referenced_vars=tuple(travel_requires),
+                )
+            self._nav_table[cell] = row
+
+        if self._dirty_cells:
+            # Accessibility results for rebuilt cells may refer to old targets
+            dirty = self._dirty_cells
+            for results in self._accessibility.values():
+                for key in [key for key in results if key[0] in dirty]:
+                    del results[key]
+        self._dirty_cells = set()
+        self._nav_table_built = True
+
+    def _neighbours(self, storylet_id: int) -> Optional[Dict[str, Optional[NeighbourEntry]]]:
+        position = self.storylet_positions.get(storylet_id)
+        if position is None:
+            return None
+        self._ensure_navigation_table()
+        return self._nav_table.get(position)
 
-        return navigation
+    def get_directional_navigation(
+        self, current_storylet_id: int
+    ) -> Dict[str, Optional[Dict]]:
+        """Get available navigation options in 8 directions from current position."""
+        neighbours = self._neighbours(current_storylet_id)
+        if neighbours is None:
+            return {direction: None for direction in DIRECTIONS.keys()}
+        return {
+            direction: entry.info if entry is not None else None
+            for direction, entry in neighbours.items()
+        }
 
     def can_move_to_direction(
-        self, current_storylet_id: int, direction: str, player_vars: Dict[str, Any]
+        self,
+        current_storylet_id: int,
+        direction: str,
+        player_vars: Dict[str, Any],
+        session_id: Optional[str] = None,
+        state_revision: Any = None,
     ) -> bool:
-        """Check if the player can move in the specified direction."""
-        nav_options = self.get_directional_navigation(current_storylet_id)
-        target = nav_options.get(direction)
+        """
+        Check if the player can move in the specified direction.
 
-        if not target:
+        When ``session_id`` is given the result is cached for that session and
+        reused until one of the variables the target's requirements reference
+        changes. ``state_revision`` (the state manager's revision token) lets
+        unchanged sessions skip even that comparison.
+        """
+        neighbours = self._neighbours(current_storylet_id)
+        entry = neighbours.get(direction) if neighbours else None
+        if entry is None:
             return False
 
-        # Check requirements
-        requirements = target.get("requires", {})
-        return self._check_requirements(requirements, player_vars)
+        if session_id is None:
+            return entry.predicate(player_vars)
 
-    def _check_requirements(
-        self, requirements: Dict[str, Any], player_vars: Dict[str, Any]
+        cell = self.storylet_positions[current_storylet_id]
+        with self._lock:
+            return self._cached_accessibility(
+                session_id, cell, direction, entry, player_vars, state_revision
+            )
+
+    def _cached_accessibility(
+        self,
+        session_id: str,
+        cell: Position,
+        direction: str,
+        entry: NeighbourEntry,
+        player_vars: Dict[str, Any],
+        state_revision: Any,
     ) -> bool:
-        """Check if player variables meet the requirements."""
-        for req_key, req_value in requirements.items():
-            if req_key not in player_vars:
-                return False
+        results = self._accessibility.get(session_id)
+        if results is None:
+            results = self._accessibility[session_id] = {}
+            while len(self._accessibility) > self.max_cached_sessions:
+                self._accessibility.popitem(last=False)
+        else:
+            self._accessibility.move_to_end(session_id)
+
+        key = (cell, direction)
+        cached = results.get(key)
+        if cached is not None:
+            revision, values, allowed = cached
+            if state_revision is not None and revision == state_revision:
+                return allowed
+            current = tuple(player_vars.get(var, _MISSING) for var in entry.referenced_vars)
+            if current == values:
+                results[key] = (state_revision, values, allowed)
+                return allowed
+
+        allowed = entry.predicate(player_vars)
+        values = tuple(player_vars.get(var, _MISSING) for var in entry.referenced_vars)
+        results[key] = (state_revision, values, allowed)
+        return allowed
+
+    def analyze_reachability(self, start_id: Optional[int] = None) -> ReachabilityReport:
+        """Components of this grid and the storylets reachable from start."""
+        positions: Dict[int, Tuple[int, int]] = {}
+        shadowed: List[int] = []
+        with self._lock:
+            for storylet_id, pos in self.storylet_positions.items():
+                if self.position_storylets.get(pos) == storylet_id:
+                    positions[storylet_id] = (pos.x, pos.y)
+                else:
+                    # Shares its cell with another storylet, so navigation never lands on it
+                    shadowed.append(storylet_id)
+            report = analyze_reachability(positions, start_id, self.connectivity)
+        if shadowed:
+            report.total += len(shadowed)
+            report.unreachable_ids = sorted(report.unreachable_ids + shadowed)
+        return report
+
+    def find_path(
+        self, start_id: int, goal_id: int, player_vars: Dict[str, Any]
+    ):
+        """Cheapest requirement-aware route between two positioned storylets."""
+        # The search walks the position maps, so placements wait for it
+        with self._lock:
+            if self._path_planner is None:
+                from .pathfinding import PathPlanner
 
-            player_value = player_vars[req_key]
-
-            if isinstance(req_value, dict):
-                # Handle operators like {'gte': 5}
-                for op, val in req_value.items():
-                    if op == "gte" and player_value < val:
-                        return False
-                    elif op == "lte" and player_value > val:
-                        return False
-                    elif op == "gt" and player_value <= val:
-                        return False
-                    elif op == "lt" and player_value >= val:
-                        return False
-            else:
-                # Direct comparison
-                if player_value != req_value:
-                    return False
+                self._path_planner = PathPlanner(self)
+            return self._path_planner.find_path(start_id, goal_id, player_vars)
 
-        return True
+    def forget_session(self, session_id: str):
+        """Drop cached accessibility results for a session."""
+        with self._lock:
+            self._accessibility.pop(session_id, None)
 
     def get_spatial_map_data(self) -> Dict[str, Any]:
         """Get data for rendering a spatial map."""
+        with self._lock:
+            summaries = self._load_all_summaries()
+            positions = list(self.storylet_positions.items())
+            bounds = self._calculate_bounds()
         storylets = []
 
-        for storylet_id, position in self.storylet_positions.items():
-            cursor = self.db.execute(
-                text(
-                    """
-                SELECT title, text_template, requires 
-                FROM storylets 
-                WHERE id = :storylet_id
-            """
-                ),
-                {"storylet_id": storylet_id},
-            )
-
-            row = cursor.fetchone()
-            if row:
+        for storylet_id, position in positions:
+            summary = summaries.get(storylet_id)
+            if summary:
+                text_value = summary["text"]
                 storylets.append(
                     {
                         "id": storylet_id,
-                        "title": row[0],
-                        "text": row[1][:50] + "..." if len(row[1]) > 50 else row[1],
-                        "requires": json.loads(row[2]) if row[2] else {},
+                        "title": summary["title"],
+                        "text": text_value[:50] + "..." if len(text_value) > 50 else text_value,
+                        "requires": summary["requires"],
                         "position": {"x": position.x, "y": position.y},
                     }
                 )
 
-        return {"storylets": storylets, "bounds": self._calculate_bounds()}
+        return {"storylets": storylets, "bounds": bounds}
+
+    def get_map_tile(
+        self, min_x: int, min_y: int, max_x: int, max_y: int, zoom: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Map data for one viewport.
+
+        At ``DETAIL_ZOOM`` and above (or without a zoom) the visible storylets
+        are returned; lower zoom levels return storylet counts per square tile
+        of ``2 ** (DETAIL_ZOOM - zoom)`` grid units instead.
+        """
+        bbox = {"min_x": min_x, "min_y": min_y, "max_x": max_x, "max_y": max_y}
+        if zoom is not None and zoom < DETAIL_ZOOM:
+            tile_size = 2 ** (DETAIL_ZOOM - zoom)
+            with self._lock:
+                clusters = self.grid_index.cluster_counts(
+                    min_x, min_y, max_x, max_y, tile_size
+                )
+            return {
+                "bbox": bbox,
+                "zoom": zoom,
+                "tile_size": tile_size,
+                "clusters": clusters,
+            }
+
+        with self._lock:
+            visible = self.grid_index.query_bbox(min_x, min_y, max_x, max_y)
+        summaries = self._get_storylet_summaries([sid for sid, _ in visible])
+        storylets = [
+            {
+                "id": storylet_id,
+                "title": summaries[storylet_id]["title"],
+                "position": {"x": position.x, "y": position.y},
+            }
+            for storylet_id, position in visible
+            if storylet_id in summaries
+        ]
+        return {"bbox": bbox, "zoom": zoom, "storylets": storylets}
+
+    def nearby(
+        self, center: Position, radius: float, limit: Optional[int] = None
+    ) -> List[Tuple[int, Position, float]]:
+        """``(id, position, distance)`` within ``radius``, nearest first."""
+        with self._lock:
+            if limit is not None:
+                return self.grid_index.nearest(center, limit, max_distance=radius)
+            return self.grid_index.within_radius(center, radius)
+
+    def get_storylet_summaries(self, storylet_ids: List[int]) -> Dict[int, Dict]:
+        """Title/text/requires for ``storylet_ids``; unknown ids are omitted."""
+        with self._lock:
+            return dict(self._get_storylet_summaries(storylet_ids))
 
     def _calculate_bounds(self) -> Dict[str, int]:
         """Calculate the bounds of the spatial map."""
-        if not self.storylet_positions:
+        with self._lock:
+            positions = list(self.storylet_positions.values())
+        if not positions:
             return {"min_x": 0, "max_x": 0, "min_y": 0, "max_y": 0}
 
-        positions = list(self.storylet_positions.values())
         return {
             "min_x": min(pos.x for pos in positions),
             "max_x": max(pos.x for pos in positions),
             "min_y": min(pos.y for pos in positions),
             "max_y": max(pos.y for pos in positions),
         }
+
+
+@dataclass
+class _NavigatorEntry:
+    navigator: SpatialNavigator
+    version: int
+    refreshed_at: float
+
+
+class SpatialNavigatorRegistry:
+    """
+    One shared navigator per world, reused across requests.
+
+    A navigator is refreshed in place when its world's catalog version moves
+    on (or after ``ttl_seconds``, to pick up other workers' changes). At most
+    ``max_worlds`` navigators are kept; the least recently used is dropped.
+
+    With a ``snapshot_dir`` (or ``DW_GRID_SNAPSHOT_DIR``), each world's grid
+    is kept as a binary snapshot there, so new workers load positions from it
+    instead of parsing every position from the database. Each navigator
+    still builds its own copy of the grid.
+    """
+
+    def __init__(
+        self,
+        max_worlds: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        snapshot_dir: Optional[str] = None,
+    ):
+        self.max_worlds = (
+            max_worlds
+            if max_worlds is not None
+            else int(os.getenv("DW_NAVIGATOR_MAX_WORLDS", "16"))
+        )
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv("DW_CATALOG_TTL_SECONDS", "30"))
+        )
+        self.snapshot_dir = snapshot_dir or os.getenv("DW_GRID_SNAPSHOT_DIR") or None
+        self._entries: "OrderedDict[str, _NavigatorEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, world_id: str, version: int) -> SpatialNavigator:
+        """Return the world's navigator bound to ``db``, refreshed if stale."""
+        with self._lock:
+            entry = self._entries.get(world_id)
+            if entry is not None:
+                self._entries.move_to_end(world_id)
+
+        if entry is None:
+            navigator = SpatialNavigator(
+                db, world_id=world_id, snapshot_path=self.snapshot_path(world_id)
+            )
+            navigator.bind(db)
+            with self._lock:
+                self._entries[world_id] = _NavigatorEntry(
+                    navigator, version, time.monotonic()
+                )
+                while len(self._entries) > self.max_worlds:
+                    self._entries.popitem(last=False)
+            return navigator
+
+        navigator = entry.navigator
+        navigator.bind(db)
+        now = time.monotonic()
+        if entry.version != version or now - entry.refreshed_at >= self.ttl_seconds:
+            navigator.refresh()
+            entry.version = version
+            entry.refreshed_at = now
+        return navigator
+
+    def snapshot_path(self, world_id: str) -> Optional[str]:
+        if not self.snapshot_dir:
+            return None
+        return os.path.join(self.snapshot_dir, quote(world_id, safe="") + ".grid")
+
+    def forget_session(self, session_id: str):
+        with self._lock:
+            navigators = [entry.navigator for entry in self._entries.values()]
+        for navigator in navigators:
+            navigator.forget_session(session_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def loaded_worlds(self) -> List[str]:
+        with self._lock:
+            return list(self._entries)
@@ -6,15 +6,50 @@ successful Twine games like "The Play" (relationships), "Hallowmoor" (inventory)
 and environmental storytelling techniques.
 """
 
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from enum import Enum
+import itertools
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+_state_revisions = itertools.count(1)
+
+
+def merge_variable_changes(
+    base: Dict[str, Any], mine: Dict[str, Any], theirs: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Three-way merge of session variables.
+
+    Applies every key changed in ``mine`` (relative to ``base``) on top of
+    ``theirs``. Keys changed on both sides to different values are reported
+    as conflicts and keep their value from ``theirs``.
+
+    Returns:
+        Tuple of (merged variables, sorted list of conflicting keys)
+    """
+    merged = dict(theirs)
+    conflicts = []
+    for key in set(base) | set(mine):
+        base_value = base.get(key, _MISSING)
+        my_value = mine.get(key, _MISSING)
+        if my_value == base_value:
+            continue
+        their_value = theirs.get(key, _MISSING)
+        if their_value == base_value or their_value == my_value:
+            if my_value is _MISSING:
+                merged.pop(key, None)
+            else:
+                merged[key] = my_value
+        else:
+            conflicts.append(key)
+    return merged, sorted(conflicts)
+
 
 class StateChangeType(Enum):
     """Types of state changes for tracking and rollback."""
@@ -181,8 +216,9 @@ class AdvancedStateManager:
     - State change history
     """
 
-    def __init__(self, session_id: str):
+    def __init__(self, session_id: str, world_id: str = "default"):
         self.session_id = session_id
+        self.world_id = world_id
         self.variables = {}
         self.inventory = {}
         self.relationships = {}
@@ -193,6 +229,9 @@ class AdvancedStateManager:
         # Performance optimization: cache frequently accessed computations
         self._cached_computations = {}
         self._cache_expiry = datetime.now(timezone.utc)
+        # Process-unique token renewed on every state change so external
+        # caches (e.g. storylet eligibility) can detect staleness
+        self.state_revision = next(_state_revisions)
 
     def set_variable(
         self,
@@ -279,6 +318,7 @@ class AdvancedStateManager:
             context=context or {},
         )
         self.change_history.append(change)
+        self._invalidate_cache()
 
         logger.debug(f"Added {quantity}x {name} to inventory")
         return item
@@ -307,6 +347,7 @@ class AdvancedStateManager:
             new_value=item if item.quantity > 0 else None,
         )
         self.change_history.append(change)
+        self._invalidate_cache()
 
         logger.debug(f"Removed {actual_removed}x {item.name} from inventory")
         return True
@@ -350,6 +391,7 @@ class AdvancedStateManager:
             new_value=rel,
         )
         self.change_history.append(change)
+        self._invalidate_cache()
 
         logger.debug(f"Updated relationship {entity_a}-{entity_b}: {changes}")
         return rel
@@ -530,8 +572,14 @@ class AdvancedStateManager:
 
         return context
 
+    def replace_variables(self, variables: Dict[str, Any]):
+        """Replace all variables at once, e.g. after merging a concurrent save."""
+        self.variables = dict(variables)
+        self._invalidate_cache()
+
     def _invalidate_cache(self):
         """Clear cached computations when state changes."""
+        self.state_revision = next(_state_revisions)
         self._cached_computations.clear()
         self._cache_expiry = datetime.now(timezone.utc)
 
@@ -591,6 +639,7 @@ class AdvancedStateManager:
         """Export complete state for saving/serialization."""
         return {
             "session_id": self.session_id,
+            "world_id": self.world_id,
             "variables": self.variables,
             "inventory": {
                 item_id: item.__dict__ for item_id, item in self.inventory.items()
@@ -607,6 +656,7 @@ class AdvancedStateManager:
     def import_state(self, state_data: Dict[str, Any]):
         """Import state from saved data."""
         self.session_id = state_data.get("session_id", self.session_id)
+        self.world_id = state_data.get("world_id", self.world_id)
         self.variables = state_data.get("variables", {})
 
         # Reconstruct inventory
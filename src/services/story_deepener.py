@@ -202,18 +202,14 @@ class StoryDeepener:
     def _call_llm(self, prompt: str) -> str:
         """Make a call to the OpenAI API."""
         try:
-            from openai import OpenAI
+            from .llm_client import chat_completion
 
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-            response = client.chat.completions.create(
+            content = chat_completion(
                 model="gpt-4o",
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=500,
             )
-
-            content = response.choices[0].message.content
             print(
                 f"🔍 DEBUG Bridge: Raw response length: {len(content) if content else 0}"
             )
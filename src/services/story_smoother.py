@@ -316,6 +316,41 @@ class StorySmoother:
                 else "Clan Hall"
             )
 
+    def analyze_spatial_reachability(self) -> Dict[str, Dict]:
+        """Spatial grid components and unreachable storylets, per world."""
+        from .spatial_analysis import analyze_reachability
+
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, world_id, position 
+            FROM storylets 
+            WHERE position IS NOT NULL
+        """
+        )
+        worlds: Dict[str, Dict[int, Tuple[int, int]]] = defaultdict(dict)
+        for storylet_id, world_id, position_json in cursor.fetchall():
+            try:
+                position = json.loads(position_json) if position_json else None
+            except (TypeError, ValueError):
+                position = None
+            if isinstance(position, dict) and "x" in position and "y" in position:
+                worlds[world_id or "default"][storylet_id] = (
+                    position["x"],
+                    position["y"],
+                )
+        conn.close()
+
+        reports = {
+            world_id: analyze_reachability(positions).to_dict()
+            for world_id, positions in worlds.items()
+        }
+        unreachable = sum(len(r["unreachable_ids"]) for r in reports.values())
+        if unreachable:
+            print(f"🧭 Found {unreachable} storylets unreachable on the spatial grid")
+        return reports
+
     def fix_spatial_integration(self, dry_run: bool = False) -> Dict:
         """
         Fix spatial integration by assigning locations to storylets with 'No Location'
@@ -346,8 +381,13 @@ class StorySmoother:
             "locations_assigned": 0,
             "connections_created": 0,
             "modified_storylets": [],
+            "unreachable_storylets": [],
         }
 
+        # Flag storylets the player cannot walk to on the spatial grid
+        for report in self.analyze_spatial_reachability().values():
+            fixes_applied["unreachable_storylets"].extend(report["unreachable_ids"])
+
         # Find storylets with no location
         no_location_storylets = [
             s
@@ -3,9 +3,11 @@ Intelligent storylet analysis and feedback system.
 This module analyzes existing storylets and provides targeted feedback to improve AI generation.
 """
 
+from functools import partial
 from typing import Dict, List, Any, Tuple
 from sqlalchemy.orm import Session
 from ..models import Storylet
+from ..services.llm_fanout import fan_out, merge_storylets
 from ..services.llm_service import llm_suggest_storylets
 import json
 
@@ -101,8 +103,8 @@ def analyze_storylet_gaps(db: Session) -> Dict[str, Any]:
         "total_storylets": len(all_storylets),
         "variables_required": variables_required,
         "variables_set": variables_set,
-        "missing_setters": list(missing_setters),
-        "unused_setters": list(unused_setters),
+        "missing_setters": sorted(missing_setters),
+        "unused_setters": sorted(unused_setters),
         "location_flow": location_flow,
         "orphaned_locations": orphaned_locations,
         "poorly_connected_locations": poorly_connected_locations,
@@ -280,16 +282,14 @@ def generate_targeted_storylets(
                 }
             )
 
-    # Generate storylets for each targeted prompt
-    all_generated = []
-    for prompt in targeted_prompts[:max_storylets]:
-        try:
-            storylets = llm_suggest_storylets(1, prompt["themes"], prompt["bible"])
-            all_generated.extend(storylets)
-        except Exception as e:
-            print(f"Error generating targeted storylet: {e}")
-
-    return all_generated[:max_storylets]
+    # Generate storylets for all targeted prompts concurrently
+    batches = fan_out(
+        [
+            partial(llm_suggest_storylets, 1, prompt["themes"], prompt["bible"])
+            for prompt in targeted_prompts[:max_storylets]
+        ]
+    )
+    return merge_storylets(batches, limit=max_storylets)
 
 
 def get_ai_learning_context(db: Session) -> Dict[str, Any]:
@@ -309,7 +309,8 @@ def get_ai_learning_context(db: Session) -> Dict[str, Any]:
             + analysis["orphaned_locations"],
         },
         "variable_ecosystem": {
-            "well_connected": list(
+            # Sorted so the prompt (and its cache key) is stable across runs
+            "well_connected": sorted(
                 set(analysis["variables_set"].keys())
                 & set(analysis["variables_required"].keys())
             ),
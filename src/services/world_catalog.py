@@ -0,0 +1,163 @@
+"""Per-world storylet catalogs with their own caches.
+
+Each world id gets an independent ``WorldCatalog`` holding a snapshot of its
+storylets and a per-session eligibility cache. Regenerating or editing one
+world only invalidates that world's catalog; every other world keeps serving
+from its cache.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import DEFAULT_WORLD_ID, Storylet
+from .state_manager import AdvancedStateManager
+
+
+@dataclass
+class CatalogStorylet:
+    """Detached, read-only copy of a storylet row."""
+
+    id: int
+    world_id: str
+    title: str
+    text_template: str
+    requires: Dict[str, Any] = field(default_factory=dict)
+    choices: List[Dict[str, Any]] = field(default_factory=list)
+    weight: float = 1.0
+    position: Optional[Dict[str, int]] = None
+
+
+class WorldCatalog:
+    """Cached storylets and eligibility results for a single world."""
+
+    def __init__(
+        self,
+        world_id: str,
+        storylets: List[CatalogStorylet],
+        version: int,
+        max_sessions: int = 10000,
+    ):
+        self.world_id = world_id
+        self.version = version
+        self.storylets = storylets
+        self.by_id: Dict[int, CatalogStorylet] = {s.id: s for s in storylets}
+        self.loaded_at = time.monotonic()
+        self.max_sessions = max_sessions
+        # session_id -> (state_revision, eligible storylet ids)
+        self._eligibility: "OrderedDict[str, Tuple[int, List[int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db: Session, world_id: str, version: int) -> "WorldCatalog":
+        rows = db.query(Storylet).filter(Storylet.world_id == world_id).all()
+        storylets = [
+            CatalogStorylet(
+                id=row.id,
+                world_id=row.world_id,
+                title=row.title,
+                text_template=row.text_template,
+                requires=dict(row.requires or {}),
+                choices=list(row.choices or []),
+                weight=float(row.weight if row.weight is not None else 1.0),
+                position=row.position if isinstance(row.position, dict) else None,
+            )
+            for row in rows
+        ]
+        return cls(world_id, storylets, version)
+
+    def eligible_storylets(
+        self, state_manager: AdvancedStateManager
+    ) -> List[CatalogStorylet]:
+        """Storylets whose requirements the session currently meets."""
+        key = state_manager.session_id
+        revision = state_manager.state_revision
+        with self._lock:
+            cached = self._eligibility.get(key)
+            if cached is not None and cached[0] == revision:
+                self._eligibility.move_to_end(key)
+                return [self.by_id[sid] for sid in cached[1]]
+
+        eligible = [
+            s for s in self.storylets if state_manager.evaluate_condition(s.requires)
+        ]
+        with self._lock:
+            self._eligibility[key] = (revision, [s.id for s in eligible])
+            self._eligibility.move_to_end(key)
+            while len(self._eligibility) > self.max_sessions:
+                self._eligibility.popitem(last=False)
+        return eligible
+
+    def forget_session(self, session_id: str):
+        with self._lock:
+            self._eligibility.pop(session_id, None)
+
+
+class WorldCatalogRegistry:
+    """Process-wide registry of world catalogs, keyed by world id."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        # Catalogs are also refreshed after a TTL so changes made by other
+        # workers become visible without cross-process invalidation.
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else float(os.getenv("DW_CATALOG_TTL_SECONDS", "30"))
+        )
+        self._catalogs: Dict[str, WorldCatalog] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, world_id: str = DEFAULT_WORLD_ID) -> WorldCatalog:
+        """Return the cached catalog for a world, loading it if needed."""
+        with self._lock:
+            catalog = self._catalogs.get(world_id)
+            version = self._versions.get(world_id, 0)
+        if catalog is not None and catalog.version == version:
+            if time.monotonic() - catalog.loaded_at < self.ttl_seconds:
+                return catalog
+
+        fresh = WorldCatalog.load(db, world_id, version)
+        with self._lock:
+            # Only install if nobody invalidated the world while we were loading
+            if self._versions.get(world_id, 0) == version:
+                self._catalogs[world_id] = fresh
+        return fresh
+
+    def version(self, world_id: str = DEFAULT_WORLD_ID) -> int:
+        """Monotonic catalog version for a world, bumped on invalidation."""
+        with self._lock:
+            return self._versions.get(world_id, 0)
+
+    def invalidate(self, world_id: str = DEFAULT_WORLD_ID) -> int:
+        """Drop one world's caches and return its new catalog version."""
+        with self._lock:
+            self._versions[world_id] = self._versions.get(world_id, 0) + 1
+            self._catalogs.pop(world_id, None)
+            return self._versions[world_id]
+
+    def invalidate_all(self):
+        """Drop every world's caches (after changes spanning all worlds)."""
+        with self._lock:
+            for world_id in set(self._catalogs) | set(self._versions):
+                self._versions[world_id] = self._versions.get(world_id, 0) + 1
+            self._catalogs.clear()
+
+    def forget_session(self, session_id: str):
+        with self._lock:
+            catalogs = list(self._catalogs.values())
+        for catalog in catalogs:
+            catalog.forget_session(session_id)
+
+    def loaded_worlds(self) -> List[str]:
+        with self._lock:
+            return sorted(self._catalogs)
+
+
+# Shared registry used by the API routers
+world_catalogs = WorldCatalogRegistry()
@@ -0,0 +1,151 @@
+"""Tests for streamed world generation on POST /author/generate-world."""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.api import author
+from src.database import Base, get_db
+from src.models import Storylet
+from src.services.location_registry import load_locations, register_locations
+from src.services import llm_client
+
+WORLD = {
+    "description": "A foggy harbor town full of smugglers and secrets.",
+    "theme": "mystery",
+    "storylet_count": 5,
+    "world_id": "harbor",
+}
+
+
+class TestGenerateWorldStream:
+    """Test suite for NDJSON world generation (Task: user-047)."""
+
+    @pytest.fixture(autouse=True)
+    def _skip_auto_improvement(self, monkeypatch):
+        # Auto-improvement works on the global database, not the test engine
+        monkeypatch.setattr(
+            "src.services.auto_improvement.should_run_auto_improvement",
+            lambda *args: False,
+        )
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        db = self.SessionLocal()
+        db.add(Storylet(world_id="harbor", title="Old Harbor", text_template="Old."))
+        db.add(Storylet(world_id="other", title="Elsewhere", text_template="Kept."))
+        db.commit()
+        db.close()
+
+        def override_get_db():
+            session = self.SessionLocal()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app = FastAPI()
+        app.include_router(author.router, prefix="/author")
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+
+        self.server, self.state = start_stub_server()
+        llm_client.reset_llm_client()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        self.server.shutdown()
+        self.server.server_close()
+        self.engine.dispose()
+
+    def _events(self, response):
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.text.splitlines() if line]
+
+    def _titles(self, world_id):
+        db = self.SessionLocal()
+        try:
+            return {
+                title
+                for (title,) in db.query(Storylet.title).filter(
+                    Storylet.world_id == world_id
+                )
+            }
+        finally:
+            db.close()
+
+    def test_streams_storylets_then_summary(self, monkeypatch):
+        monkeypatch.setenv(
+            "DW_LLM_BASE_URL", f"http://127.0.0.1:{self.server.server_port}/v1"
+        )
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        monkeypatch.setenv("DW_WORLD_CHUNK_SIZE", "3")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+
+        events = self._events(
+            self.client.post("/author/generate-world?stream=true", json=WORLD)
+        )
+
+        storylet_events = [e for e in events if e["event"] == "storylet"]
+        assert len(storylet_events) == 5
+        assert [e["index"] for e in storylet_events] == [1, 2, 3, 4, 5]
+        assert events[-1]["event"] == "complete"
+        assert events[-1]["success"] is True
+        assert events[-1]["world_id"] == "harbor"
+
+        titles = self._titles("harbor")
+        assert "Old Harbor" not in titles
+        assert {e["storylet"]["title"] for e in storylet_events} <= titles
+        assert len(titles) == 6  # plus the starting storylet
+        assert self._titles("other") == {"Elsewhere"}
+        assert all(body.get("stream") for body in self.state.bodies[:2])
+
+    def test_fast_path_streams_fallback_world(self):
+        events = self._events(
+            self.client.post("/author/generate-world?stream=true", json=WORLD)
+        )
+
+        assert [e["event"] for e in events] == ["storylet", "complete"]
+        assert events[0]["storylet"]["title"] == "A New Mystery Beginning"
+        assert "A New Mystery Beginning" in self._titles("harbor")
+
+    def test_regeneration_replaces_location_registry(self):
+        db = self.SessionLocal()
+        register_locations(db, "harbor", {"old dock": (40, 40)})
+        register_locations(db, "other", {"old dock": (40, 40)})
+        db.commit()
+        db.close()
+
+        self._events(self.client.post("/author/generate-world?stream=true", json=WORLD))
+
+        db = self.SessionLocal()
+        try:
+            assert "old dock" not in load_locations(db, "harbor")
+            assert load_locations(db, "other") == {"old dock": (40, 40)}
+        finally:
+            db.close()
@@ -0,0 +1,101 @@
+"""Tests for binding sessions to a world on POST /api/next."""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api import game
+from src.database import Base, get_db
+from src.models import SessionVars, Storylet
+from src.services.session_store import InProcessSessionStore
+
+
+class TestSessionWorldBinding:
+    """Test suite for keeping sessions in their world (Task: user-029)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        db = self.SessionLocal()
+        for world in ("north", "south"):
+            db.add(
+                Storylet(
+                    world_id=world,
+                    title=f"{world.title()} Gate",
+                    text_template=f"The {world} gate.",
+                    requires={},
+                    choices=[],
+                )
+            )
+        db.commit()
+        db.close()
+
+        def override_get_db():
+            session = self.SessionLocal()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app = FastAPI()
+        app.include_router(game.router, prefix="/api")
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+        for cache in (game._state_managers, game._state_versions, game._db_snapshots):
+            cache.clear()
+        self._original_store = game._session_store
+        game._session_store = InProcessSessionStore()
+
+    def teardown_method(self):
+        game._session_store = self._original_store
+        for cache in (game._state_managers, game._state_versions, game._db_snapshots):
+            cache.clear()
+        self.engine.dispose()
+
+    def _next(self, world_id=None):
+        payload = {"session_id": "traveller", "vars": {"gold": 3}}
+        if world_id is not None:
+            payload["world_id"] = world_id
+        return self.client.post("/api/next", json=payload)
+
+    def _stored_world(self):
+        db = self.SessionLocal()
+        try:
+            return db.get(SessionVars, "traveller").world_id
+        finally:
+            db.close()
+
+    def test_new_session_starts_in_requested_world(self):
+        response = self._next("south")
+
+        assert response.status_code == 200
+        assert response.json()["text"] == "The south gate."
+        assert self._stored_world() == "south"
+
+    def test_existing_session_cannot_switch_worlds(self):
+        assert self._next("south").status_code == 200
+
+        response = self._next("north")
+        assert response.status_code == 409
+        assert self._stored_world() == "south"
+        # Also when the session is loaded afresh from the database
+        for cache in (game._state_managers, game._state_versions, game._db_snapshots):
+            cache.clear()
+        assert self._next("north").status_code == 409
+
+        # Naming the session's own world, or none, keeps working
+        assert self._next("south").status_code == 200
+        assert self._next().status_code == 200
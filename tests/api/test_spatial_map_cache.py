@@ -0,0 +1,154 @@
+"""Tests for the cached, pre-encoded spatial map endpoint."""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api import game
+from src.database import Base, get_db
+from src.models import Storylet
+from src.services.world_catalog import world_catalogs
+
+
+class TestSpatialMapCache:
+    """Test suite for the spatial map response cache (Task: user-032)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        SessionLocal = sessionmaker(bind=self.engine)
+        db = SessionLocal()
+        for i in range(30):
+            db.add(
+                Storylet(
+                    world_id="mapworld",
+                    title=f"Spot {i}",
+                    text_template="Somewhere.",
+                    requires={"location": f"spot_{i}"},
+                    position={"x": i % 6, "y": i // 6},
+                )
+            )
+        db.commit()
+        db.close()
+
+        def override_get_db():
+            session = SessionLocal()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app = FastAPI()
+        app.include_router(game.router, prefix="/api")
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+        game._spatial_map_cache.clear()
+        game._spatial_navigators.clear()
+        world_catalogs.invalidate("mapworld")
+
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def teardown_method(self):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+        game._spatial_map_cache.clear()
+        self.engine.dispose()
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_map_built_with_one_query_and_then_cached(self):
+        response = self.client.get("/api/spatial/map?world_id=mapworld")
+        assert response.status_code == 200
+        assert len(response.json()["storylets"]) == 30
+        # Position load plus one summary query, regardless of map size
+        assert len(self.statements) == 2
+
+        self.statements.clear()
+        again = self.client.get("/api/spatial/map?world_id=mapworld")
+        assert again.content == response.content
+        assert self.statements == []
+
+    def test_etag_and_gzip(self):
+        first = self.client.get(
+            "/api/spatial/map?world_id=mapworld",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert first.headers["content-encoding"] == "gzip"
+        etag = first.headers["etag"]
+
+        not_modified = self.client.get(
+            "/api/spatial/map?world_id=mapworld", headers={"If-None-Match": etag}
+        )
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+        # Unchanged content keeps its ETag across a catalog refresh
+        world_catalogs.invalidate("mapworld")
+        refreshed = self.client.get(
+            "/api/spatial/map?world_id=mapworld", headers={"If-None-Match": etag}
+        )
+        assert refreshed.status_code == 304
+
+        with self.engine.begin() as conn:
+            conn.exec_driver_sql("UPDATE storylets SET title = 'Renamed' WHERE id = 1")
+        world_catalogs.invalidate("mapworld")
+        changed = self.client.get(
+            "/api/spatial/map?world_id=mapworld", headers={"If-None-Match": etag}
+        )
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert "Renamed" in changed.text
+
+    def test_columnar_encoding(self):
+        rows = self.client.get("/api/spatial/map?world_id=mapworld").json()
+        columns = self.client.get(
+            "/api/spatial/map?world_id=mapworld&encoding=columnar"
+        ).json()
+
+        assert columns["encoding"] == "columnar"
+        assert columns["count"] == 30
+        assert columns["id"] == [s["id"] for s in rows["storylets"]]
+        assert columns["x"] == [s["position"]["x"] for s in rows["storylets"]]
+        assert columns["y"] == [s["position"]["y"] for s in rows["storylets"]]
+
+        compressed = self.client.get(
+            "/api/spatial/map?world_id=mapworld&encoding=columnar",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.json() == columns
+
+    def test_bbox_returns_only_visible_storylets(self):
+        tile = self.client.get("/api/spatial/map?world_id=mapworld&bbox=1,1,2,3").json()
+
+        positions = [(s["position"]["x"], s["position"]["y"]) for s in tile["storylets"]]
+        assert sorted(positions) == [(x, y) for x in (1, 2) for y in (1, 2, 3)]
+        assert tile["bbox"] == {"min_x": 1, "min_y": 1, "max_x": 2, "max_y": 3}
+
+    def test_low_zoom_returns_cluster_counts(self):
+        tile = self.client.get(
+            "/api/spatial/map?world_id=mapworld&bbox=0,0,7,7&zoom=2"
+        ).json()
+
+        assert "storylets" not in tile
+        assert tile["tile_size"] == 4
+        assert sum(c["count"] for c in tile["clusters"]) == 30
+
+    def test_invalid_bbox_is_rejected(self):
+        response = self.client.get("/api/spatial/map?world_id=mapworld&bbox=1,2,3")
+        assert response.status_code == 400
+        response = self.client.get("/api/spatial/map?world_id=mapworld&bbox=5,0,1,1")
+        assert response.status_code == 400
@@ -0,0 +1,113 @@
+"""Tests for the spatial pathfinding endpoint."""
+
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directory to path to import modules
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.api import game
+from src.database import Base, get_db
+from src.models import SessionVars, Storylet
+from src.services.session_store import InProcessSessionStore
+
+
+class TestSpatialPathEndpoint:
+    """Test suite for GET /api/spatial/path (Task: user-035)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        SessionLocal = sessionmaker(bind=self.engine)
+        db = SessionLocal()
+        for x, location in enumerate(["dock", "street", "gate", "keep"]):
+            requires = {"location": location}
+            if location == "keep":
+                requires["has_pass"] = True
+            db.add(
+                Storylet(
+                    world_id="pathworld",
+                    title=location.title(),
+                    text_template=f"The {location}.",
+                    requires=requires,
+                    position={"x": x, "y": 0},
+                )
+            )
+        db.add(
+            SessionVars(
+                session_id="walker", world_id="pathworld", vars={"location": "dock"}
+            )
+        )
+        db.commit()
+        db.close()
+
+        def override_get_db():
+            session = SessionLocal()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app = FastAPI()
+        app.include_router(game.router, prefix="/api")
+        app.dependency_overrides[get_db] = override_get_db
+        self.client = TestClient(app)
+        for cache in (game._state_managers, game._state_versions, game._db_snapshots):
+            cache.clear()
+        game._spatial_navigators.clear()
+        self._original_store = game._session_store
+        game._session_store = InProcessSessionStore()
+
+    def teardown_method(self):
+        game._session_store = self._original_store
+        game._spatial_navigators.clear()
+        self.engine.dispose()
+
+    def test_route_to_location(self):
+        response = self.client.get("/api/spatial/path/walker?to=gate")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [step["title"] for step in data["route"]] == ["Dock", "Street", "Gate"]
+        assert data["steps"] == 2
+        assert data["cost"] == 2.0
+
+    def test_returned_route_can_be_walked(self):
+        route = self.client.get("/api/spatial/path/walker?to=gate").json()["route"]
+
+        for step, following in zip(route, route[1:]):
+            dx = following["position"]["x"] - step["position"]["x"]
+            assert dx == 1
+            response = self.client.post("/api/spatial/move/walker?direction=east")
+            assert response.status_code == 200
+            assert response.json()["new_position"] == following["position"]
+        assert self.client.get("/api/spatial/path/walker?to=gate").json()["steps"] == 0
+
+    def test_inaccessible_or_unknown_targets(self):
+        assert self.client.get("/api/spatial/path/walker?to=keep").status_code == 404
+        assert self.client.get("/api/spatial/path/walker?to=moon").status_code == 404
+
+    def test_nearby_lists_storylets_by_distance(self):
+        response = self.client.get("/api/spatial/nearby/walker?radius=2")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["position"] == {"x": 0, "y": 0}
+        assert [s["title"] for s in data["storylets"]] == ["Street", "Gate"]
+        assert [s["distance"] for s in data["storylets"]] == [1.0, 2.0]
+
+    def test_nearby_limit_returns_k_nearest(self):
+        response = self.client.get("/api/spatial/nearby/walker?radius=10&limit=1")
+
+        assert response.status_code == 200
+        assert [s["title"] for s in response.json()["storylets"]] == ["Street"]
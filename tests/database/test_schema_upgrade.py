@@ -0,0 +1,135 @@
+"""Tests for in-place schema upgrades of existing databases."""
+
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import _add_missing_columns, _rebuild_storylets_table
+
+
+class TestSchemaUpgrade:
+    """Test suite for adding columns to older databases (Task: user-028)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE session_vars (session_id VARCHAR(64) PRIMARY KEY, "
+                    "vars JSON, updated_at DATETIME)"
+                )
+            )
+            conn.execute(text("INSERT INTO session_vars VALUES ('s1', '{}', NULL)"))
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_adds_version_column_with_default(self):
+        _add_missing_columns(self.engine)
+
+        columns = {c["name"] for c in inspect(self.engine).get_columns("session_vars")}
+        assert "version" in columns
+        with self.engine.connect() as conn:
+            version = conn.execute(text("SELECT version FROM session_vars")).scalar()
+        assert version == 0
+
+    def test_upgrade_is_idempotent(self):
+        _add_missing_columns(self.engine)
+        _add_missing_columns(self.engine)
+
+        columns = [c["name"] for c in inspect(self.engine).get_columns("session_vars")]
+        assert columns.count("version") == 1
+
+
+class TestStoryletTitleUpgrade:
+    """Test suite for moving title uniqueness into each world (Task: user-029)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE storylets (id INTEGER PRIMARY KEY, "
+                    "title VARCHAR(200) NOT NULL UNIQUE, text_template TEXT NOT NULL, "
+                    "requires JSON, choices JSON, weight FLOAT, position JSON)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO storylets (id, title, text_template, weight) "
+                    "VALUES (7, 'Harbor', 'The harbor.', 1.5)"
+                )
+            )
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def _insert(self, world_id):
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO storylets (world_id, title, text_template) "
+                    "VALUES (:world_id, 'Harbor', 'Another harbor.')"
+                ),
+                {"world_id": world_id},
+            )
+
+    def test_titles_become_unique_per_world(self):
+        _add_missing_columns(self.engine)
+        _rebuild_storylets_table(self.engine)
+        _rebuild_storylets_table(self.engine)
+
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT id, world_id, title, weight FROM storylets")
+            ).one()
+        assert tuple(row) == (7, "default", "Harbor", 1.5)
+
+        self._insert("elsewhere")
+        with pytest.raises(IntegrityError):
+            self._insert("default")
+        indexes = {i["name"] for i in inspect(self.engine).get_indexes("storylets")}
+        assert "ix_storylets_world_id" in indexes
+
+    def test_conflicting_insert_keeps_rest_of_batch(self):
+        from sqlalchemy.orm import sessionmaker
+
+        from src.api.author import _insert_storylets
+
+        # Columns added but the old UNIQUE(title) still in place
+        _add_missing_columns(self.engine)
+        db = sessionmaker(bind=self.engine)()
+        batch = [
+            {
+                "title": title,
+                "text_template": "...",
+                "requires": {},
+                "choices": [],
+                "weight": 1,
+            }
+            for title in ("Pier", "Harbor", "Lighthouse")
+        ]
+        created = _insert_storylets(db, batch, "elsewhere")
+        db.close()
+
+        assert [s["title"] for s in created] == ["Pier", "Lighthouse"]
+        with self.engine.connect() as conn:
+            titles = conn.execute(
+                text("SELECT title FROM storylets WHERE world_id = 'elsewhere'")
+            ).scalars()
+            assert sorted(titles) == ["Lighthouse", "Pier"]
@@ -0,0 +1,90 @@
+"""Tests for memory-mapped navigation grid snapshots."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.grid_snapshot import GridSnapshot, load_snapshot, write_snapshot
+from src.services.spatial_navigator import Position, SpatialNavigator
+
+
+class TestGridSnapshot:
+    """Test suite for snapshot export and cold-start loading (Task: user-040)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        for i in range(30):
+            self.db.add(
+                Storylet(
+                    world_id="snapworld",
+                    title=f"Cell {i}",
+                    text_template="Here.",
+                    requires={},
+                    position={"x": i % 6 - 3, "y": i // 6 - 2},
+                )
+            )
+        self.db.commit()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = str(Path(self.tmpdir.name) / "snapworld.grid")
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_file_round_trip_and_cell_lookup(self):
+        cells = {1: (0, 0), 2: (-5, 7), 3: (100000, -3)}
+        write_snapshot(self.path, cells, (3, 3, 1.5))
+
+        with GridSnapshot(self.path) as snapshot:
+            assert snapshot.fingerprint == (3, 3, 1.5)
+            assert {sid: (x, y) for sid, x, y in snapshot.items()} == cells
+            assert snapshot.storylet_at(-5, 7) == 2
+            assert snapshot.storylet_at(1, 1) is None
+
+    def test_second_worker_loads_from_snapshot(self):
+        first = SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        assert not first.loaded_from_snapshot
+        assert Path(self.path).exists()
+
+        second = SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        assert second.loaded_from_snapshot
+        assert second.storylet_positions == first.storylet_positions
+        assert second.position_storylets == first.position_storylets
+        assert len(second.grid_index) == 30
+
+    def test_moved_storylet_invalidates_snapshot(self):
+        SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        storylet = self.db.query(Storylet).filter_by(title="Cell 0").one()
+        storylet.position = {"x": 40, "y": 40}
+        self.db.commit()
+
+        navigator = SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        assert not navigator.loaded_from_snapshot
+        assert navigator.storylet_positions[storylet.id] == Position(40, 40)
+        # The rebuilt snapshot is current again
+        again = SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        assert again.loaded_from_snapshot
+
+    def test_corrupt_snapshot_is_ignored(self):
+        Path(self.path).write_bytes(b"not a snapshot")
+        assert load_snapshot(self.path) is None
+
+        navigator = SpatialNavigator(self.db, world_id="snapworld", snapshot_path=self.path)
+        assert not navigator.loaded_from_snapshot
+        assert len(navigator.storylet_positions) == 30
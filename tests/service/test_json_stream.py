@@ -0,0 +1,86 @@
+"""Tests for incremental JSON array parsing and streamed world generation."""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.services import llm_client
+from src.services.json_stream import JSONArrayStream, iter_json_array
+from src.services.llm_service import stream_world_storylets
+
+ELEMENTS = [
+    {"title": "Brackets ] and { braces }", "text": 'Say "hi" \\ [ok]', "choices": []},
+    {"title": "Nested", "choices": [{"label": "Go", "set": {"path": [1, [2]]}}]},
+    {"title": "Unicode ✨", "text": "Line\nbreak"},
+]
+
+
+class TestJSONArrayStream:
+    """Test suite for the incremental array parser (Task: user-047)."""
+
+    def test_elements_survive_any_split(self):
+        text = "Here you go:\n```json\n" + json.dumps(ELEMENTS, indent=2) + "\n```"
+        for size in (1, 2, 3, 7, 64, len(text)):
+            pieces = [text[i : i + size] for i in range(0, len(text), size)]
+            assert list(iter_json_array(pieces)) == ELEMENTS
+
+    def test_each_element_is_returned_when_it_closes(self):
+        parser = JSONArrayStream()
+        assert parser.feed('[{"title": "A"}, {"title": ') == [{"title": "A"}]
+        assert parser.feed('"B"}') == [{"title": "B"}]
+        assert not parser.done
+        assert parser.feed("]") == []
+        assert parser.done
+        assert parser.feed('[{"title": "C"}]') == []
+
+    def test_bad_element_is_skipped(self):
+        parser = JSONArrayStream()
+        elements = parser.feed('[{"title": "A",}, {"title": "B"}]')
+        assert elements == [{"title": "B"}]
+        assert parser.skipped == 1
+
+
+class TestStreamedWorldGeneration:
+    """Test suite for streaming world storylets from the stub (Task: user-047)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server(stream_delay_seconds=0.01)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        llm_client.reset_llm_client()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_storylets_arrive_before_the_completion_ends(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_BASE_URL", self.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        monkeypatch.setenv("DW_WORLD_CHUNK_SIZE", "4")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+        llm_client.get_llm_client()
+
+        started = time.perf_counter()
+        arrivals = []
+        storylets = []
+        for storylet in stream_world_storylets("A foggy harbor town", "mystery", count=6):
+            arrivals.append(time.perf_counter() - started)
+            storylets.append(storylet)
+
+        assert len({s["title"] for s in storylets}) == 6
+        assert all(body["stream"] for body in self.state.bodies)
+        assert self.state.requests == 2
+        # The first storylet is usable well before the last one is written
+        assert arrivals[0] < arrivals[-1] / 2
@@ -0,0 +1,98 @@
+"""Tests for the disk-backed LLM response cache."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.services import llm_cache, llm_client
+from src.services.llm_cache import LLMResponseCache, cache_key
+
+
+class TestLLMResponseCache:
+    """Test suite for content-addressed completion caching (Task: user-045)."""
+
+    @pytest.fixture(autouse=True)
+    def _tmp(self, tmp_path, monkeypatch):
+        self.path = str(tmp_path / "llm_cache.db")
+        monkeypatch.setenv("DW_LLM_CACHE_PATH", self.path)
+        monkeypatch.delenv("DW_LLM_CACHE", raising=False)
+        llm_cache.reset_llm_cache()
+        llm_client.reset_llm_client()
+        yield
+        llm_cache.reset_llm_cache()
+        llm_client.reset_llm_client()
+
+    def test_key_ignores_whitespace_but_not_settings(self):
+        messages = [{"role": "user", "content": '{\n  "themes": ["cave"]\n}'}]
+        reformatted = [{"role": "user", "content": '{ "themes": ["cave"] }'}]
+        assert cache_key("gpt-4o", messages, 0.7) == cache_key("gpt-4o", reformatted, 0.7)
+        assert cache_key("gpt-4o", messages, 0.7) != cache_key("gpt-4o", messages, 0.2)
+        assert cache_key("gpt-4o", messages, 0.7) != cache_key(
+            "gpt-4o", messages, 0.7, response_format={"type": "json_object"}
+        )
+
+    def test_entries_persist_and_expire(self):
+        cache = LLMResponseCache(self.path, ttl_seconds=60)
+        cache.put("k", "value")
+        cache.close()
+
+        reopened = LLMResponseCache(self.path, ttl_seconds=60)
+        assert reopened.get("k") == "value"
+        reopened.ttl_seconds = 0.01
+        time.sleep(0.02)
+        assert reopened.get("k") is None
+        assert len(reopened) == 0
+        reopened.close()
+
+    def test_default_path_lives_under_db_directory(self, tmp_path):
+        assert Path(llm_cache.DEFAULT_CACHE_PATH) == ROOT.resolve() / "db" / "llm_cache.db"
+
+        nested = tmp_path / "nested" / "llm_cache.db"
+        LLMResponseCache(str(nested)).close()
+        assert nested.exists()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = LLMResponseCache(self.path, max_entries=2, max_bytes=1000)
+        cache.put("a", "1")
+        time.sleep(0.01)
+        cache.put("b", "2")
+        time.sleep(0.01)
+        assert cache.get("a") == "1"
+        time.sleep(0.01)
+        cache.put("c", "3")
+        assert cache.get("b") is None
+        assert cache.get("a") == "1" and cache.get("c") == "3"
+
+        # The byte cap evicts too
+        cache.put("big", "x" * 1000)
+        assert len(cache) == 1 and cache.get("big")
+        cache.close()
+
+    def test_chat_completion_served_from_cache(self, monkeypatch):
+        server, state = start_stub_server()
+        monkeypatch.setenv("DW_LLM_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+        try:
+            messages = [{"role": "user", "content": "Describe the harbor."}]
+            first = llm_client.chat_completion(messages, model="stub")
+            second = llm_client.chat_completion(messages, model="stub")
+            assert first == second
+            assert state.requests == 1
+            assert llm_cache.get_llm_cache().hits == 1
+
+            # Responses the caller rejects are not cached
+            other = [{"role": "user", "content": "Describe the cellar."}]
+            llm_client.chat_completion(other, model="stub", cacheable=lambda text: False)
+            llm_client.chat_completion(other, model="stub", cacheable=lambda text: False)
+            assert state.requests == 3
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,65 @@
+"""Tests for the shared LLM client and the local OpenAI stub server."""
+
+import sys
+from pathlib import Path
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.services import llm_client
+from src.services.llm_service import llm_suggest_storylets
+
+
+class TestSharedLLMClient:
+    """Test suite for the pooled client against the stub (Task: user-044)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        llm_client.reset_llm_client()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_client_is_shared_and_reuses_connection(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_BASE_URL", self.base_url)
+        client = llm_client.get_llm_client()
+        assert llm_client.get_llm_client() is client
+        assert str(client.base_url).rstrip("/") == self.base_url
+
+        for _ in range(3):
+            response = client.chat.completions.create(
+                model="stub", messages=[{"role": "user", "content": "Hello"}]
+            )
+            assert response.choices[0].message.content
+        assert self.state.requests == 3
+        assert self.state.connections == 1
+
+    def test_reset_picks_up_new_settings(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_BASE_URL", "http://127.0.0.1:9/v1")
+        first = llm_client.get_llm_client()
+        monkeypatch.setenv("DW_LLM_BASE_URL", self.base_url)
+        llm_client.reset_llm_client()
+        second = llm_client.get_llm_client()
+        assert second is not first
+        assert str(second.base_url).rstrip("/") == self.base_url
+
+    def test_suggest_storylets_end_to_end_offline(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_BASE_URL", self.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+
+        storylets = llm_suggest_storylets(2, ["mystery"], {"setting": "harbor"})
+
+        assert [s["title"] for s in storylets] == ["Stub Storylet 0", "Stub Storylet 1"]
+        assert self.state.bodies[0]["response_format"] == {"type": "json_object"}
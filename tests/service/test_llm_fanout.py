@@ -0,0 +1,173 @@
+"""Tests for concurrent fan-out of multi-call storylet generation."""
+
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.database import Base
+from src.models import Storylet
+from src.services import game_logic, llm_client, llm_service
+from src.services.llm_fanout import fan_out, merge_storylets
+from src.services.llm_service import generate_world_storylets
+
+
+def _storylet(title, text="Something happens.", choices=None):
+    return {"title": title, "text": text, "choices": choices if choices is not None else []}
+
+
+class TestFanOut:
+    """Test suite for bounded-parallel generation helpers (Task: user-046)."""
+
+    def test_results_keep_task_order_and_failures_are_empty(self):
+        def slow(value, delay):
+            time.sleep(delay)
+            return [value]
+
+        def broken():
+            raise RuntimeError("upstream error")
+
+        results = fan_out(
+            [lambda: slow("a", 0.05), broken, lambda: slow("c", 0.0)], max_workers=3
+        )
+        assert results == [["a"], [], ["c"]]
+
+    def test_parallelism_is_bounded(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_MAX_PARALLEL", "2")
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def task():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return []
+
+        fan_out([task] * 6)
+        assert peak[0] == 2
+
+    def test_merge_dedupes_validates_and_limits(self):
+        batches = [
+            [_storylet("Harbor Fog"), _storylet("Old Mill")],
+            [
+                _storylet("harbor  fog"),
+                {"title": "", "text": "No title", "choices": []},
+                {"title": "No text", "choices": []},
+                _storylet("Bad Choices", choices="none"),
+                _storylet("Lighthouse"),
+                _storylet("Tide Pools"),
+            ],
+        ]
+        merged = merge_storylets(batches, limit=2, existing_titles=["OLD MILL"])
+        assert [s["title"] for s in merged] == ["Harbor Fog", "Lighthouse"]
+
+
+class TestChunkedWorldGeneration:
+    """Test suite for chunked world generation against the stub (Task: user-046)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server(latency_seconds=0.3)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/v1"
+        llm_client.reset_llm_client()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _use_stub(self, monkeypatch):
+        monkeypatch.setenv("DW_LLM_BASE_URL", self.base_url)
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        monkeypatch.setenv("DW_WORLD_CHUNK_SIZE", "4")
+        monkeypatch.setenv("DW_LLM_MAX_PARALLEL", "4")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+
+    def test_chunks_run_concurrently_and_merge(self, monkeypatch):
+        self._use_stub(monkeypatch)
+        # Keep the one-off client import out of the timing
+        llm_client.get_llm_client()
+
+        started = time.perf_counter()
+        storylets = generate_world_storylets("A foggy harbor town", "mystery", count=10)
+        elapsed = time.perf_counter() - started
+
+        assert self.state.requests == 3
+        assert len(storylets) == 10
+        assert len({s["title"] for s in storylets}) == 10
+        prompts = [body["messages"][-1]["content"] for body in self.state.bodies]
+        sizes = sorted(int(re.search(r"EXACTLY (\d+)", p).group(1)) for p in prompts)
+        assert sizes == [2, 4, 4]
+        assert all("batch" in p for p in prompts)
+        # Three 0.3s calls in parallel take about one call, not three
+        assert elapsed < 0.75
+
+    def test_small_world_is_a_single_unchanged_call(self, monkeypatch):
+        self._use_stub(monkeypatch)
+
+        storylets = generate_world_storylets("A foggy harbor town", "mystery", count=3)
+
+        assert self.state.requests == 1
+        assert len(storylets) == 3
+        assert "batch" not in self.state.bodies[0]["messages"][-1]["content"]
+
+
+class TestAutoPopulateTopUp:
+    """Test suite for topping up short auto-population rounds (Task: user-046)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_failed_and_duplicate_chunks_are_topped_up(self, monkeypatch):
+        calls = []
+
+        def suggest(n, themes, bible):
+            calls.append(themes[0])
+            if themes[0] == "exploration":
+                raise RuntimeError("upstream error")
+            if themes[0] == "danger":
+                # Repeats titles already generated elsewhere
+                return [_storylet("Echo"), _storylet("Echo")]
+            return [_storylet(f"{themes[0]} {i}", choices=[]) for i in range(n)]
+
+        monkeypatch.setattr(llm_service, "llm_suggest_storylets", suggest)
+        monkeypatch.setattr(
+            "src.services.auto_improvement.auto_improve_storylets",
+            lambda **kwargs: {},
+        )
+
+        added = game_logic.auto_populate_storylets(self.db, target_count=6)
+
+        assert added == 6
+        assert self.db.query(Storylet).count() == 6
+        # Two sets cover the gap; the shortfall came from two more
+        assert sorted(calls[:2]) == ["danger", "exploration"]
+        assert len(calls) == 4
@@ -0,0 +1,239 @@
+"""Tests for the LLM concurrency limiter, deadlines and circuit breaker."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.services import llm_client, llm_guard
+from src.services.llm_guard import (
+    CircuitBreaker,
+    ConcurrencyLimiter,
+    LLMGuard,
+    LLMUnavailableError,
+)
+from src.services.llm_service import llm_suggest_storylets
+
+
+class TestConcurrencyLimiter:
+    """Test suite for the bounded LLM slot queue (Task: user-050)."""
+
+    def test_queue_depth_and_wait_deadline(self):
+        limiter = ConcurrencyLimiter(max_concurrent=1, max_queue=1)
+        limiter.acquire(1.0)
+        errors = []
+
+        def waiter():
+            try:
+                limiter.acquire(0.1)
+            except LLMUnavailableError as e:
+                errors.append(e.reason)
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.03)
+        with pytest.raises(LLMUnavailableError) as excinfo:
+            limiter.acquire(1.0)
+        assert excinfo.value.reason == "queue_full"
+        thread.join()
+
+        assert errors == ["deadline"]
+        stats = limiter.get_stats()
+        assert stats["rejected_queue_full"] == 1
+        assert stats["rejected_timeout"] == 1
+        limiter.release()
+        limiter.acquire(0.1)
+        assert limiter.get_stats()["in_flight"] == 1
+
+
+class TestCircuitBreaker:
+    """Test suite for breaker state transitions (Task: user-050)."""
+
+    def test_opens_fails_fast_and_recovers(self):
+        breaker = CircuitBreaker(failure_rate=0.5, min_calls=4, open_seconds=0.05)
+        for success in (True, False, True, False):
+            assert breaker.allow()
+            breaker.record(success, 0.01)
+        assert breaker.state == "open"
+        assert not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+        # Only one trial call at a time
+        assert not breaker.allow()
+        breaker.record(True, 0.01)
+        assert breaker.state == "closed"
+
+        stats = breaker.get_stats()
+        assert stats["transitions"] == {
+            "closed->open": 1,
+            "open->half_open": 1,
+            "half_open->closed": 1,
+        }
+        assert stats["rejected"] == 2
+        assert [t["to"] for t in stats["recent_transitions"]] == [
+            "closed",
+            "half_open",
+            "open",
+        ]
+
+    def test_slow_calls_and_failed_trials_count(self):
+        breaker = CircuitBreaker(
+            failure_rate=1.0, min_calls=2, slow_call_seconds=0.5, open_seconds=0.0
+        )
+        breaker.record(True, 1.0)
+        breaker.record(True, 2.0)
+        assert breaker.state == "open"
+        assert breaker.allow()
+        breaker.record(False, 0.01)
+        assert breaker.state == "open"
+        assert breaker.get_stats()["transitions"]["half_open->open"] == 1
+
+    def test_guard_records_outcomes_of_calls(self):
+        guard = LLMGuard(
+            ConcurrencyLimiter(2, 0),
+            CircuitBreaker(failure_rate=0.5, min_calls=1, open_seconds=60),
+            deadline_seconds=5.0,
+        )
+        with guard.call() as timeout:
+            assert 0 < timeout <= 5.0
+        with pytest.raises(ValueError):
+            with guard.call():
+                raise ValueError("upstream error")
+
+        with pytest.raises(LLMUnavailableError) as excinfo:
+            with guard.call():
+                pass
+        assert excinfo.value.reason == "circuit_open"
+        assert guard.get_stats()["limiter"]["in_flight"] == 0
+
+    def test_open_circuit_fails_fast_with_slots_full(self):
+        guard = LLMGuard(
+            ConcurrencyLimiter(1, 4),
+            CircuitBreaker(failure_rate=0.5, min_calls=1, open_seconds=60),
+            deadline_seconds=2.0,
+        )
+        with pytest.raises(ValueError):
+            with guard.call():
+                raise ValueError("upstream error")
+        guard.limiter.acquire(1.0)
+        started = time.perf_counter()
+        with pytest.raises(LLMUnavailableError) as excinfo:
+            with guard.call():
+                pass
+        assert excinfo.value.reason == "circuit_open"
+        assert time.perf_counter() - started < 0.1
+        assert guard.get_stats()["limiter"]["waiting"] == 0
+        guard.limiter.release()
+
+    def test_rejected_half_open_trial_is_given_back(self):
+        guard = LLMGuard(
+            ConcurrencyLimiter(1, 0),
+            CircuitBreaker(failure_rate=0.5, min_calls=1, open_seconds=0.0),
+            deadline_seconds=1.0,
+        )
+        guard.breaker.record(False, 0.01)
+        guard.limiter.acquire(1.0)
+        with pytest.raises(LLMUnavailableError) as excinfo:
+            with guard.call():
+                pass
+        assert excinfo.value.reason == "queue_full"
+        guard.limiter.release()
+        # The trial slot was not used up by the refused call
+        with guard.call():
+            pass
+        assert guard.breaker.state == "closed"
+
+
+class TestGuardedSuggestions:
+    """Test suite for failing fast to fallback storylets (Task: user-050)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server(latency_seconds=0.5)
+        llm_client.reset_llm_client()
+        llm_guard.reset_llm_guard()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        llm_guard.reset_llm_guard()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_timeouts_open_circuit_and_fall_back(self, monkeypatch):
+        monkeypatch.setenv(
+            "DW_LLM_BASE_URL", f"http://127.0.0.1:{self.server.server_port}/v1"
+        )
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        monkeypatch.setenv("DW_LLM_DEADLINE_SECONDS", "0.1")
+        monkeypatch.setenv("DW_LLM_BREAKER_MIN_CALLS", "2")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+        llm_client.get_llm_client()
+
+        for theme in ("mystery", "danger"):
+            started = time.perf_counter()
+            with pytest.raises(Exception):
+                llm_suggest_storylets(1, [theme], {})
+            # The deadline cuts the call short of the stub's latency
+            assert time.perf_counter() - started < 0.4
+        requests = self.state.requests
+
+        started = time.perf_counter()
+        storylets = llm_suggest_storylets(2, ["harbor"], {})
+        assert time.perf_counter() - started < 0.05
+        assert [s["title"] for s in storylets] == ["Quantum Whispers", "Stellar Resonance"]
+        assert self.state.requests == requests
+
+        stats = llm_guard.get_llm_guard().get_stats()
+        assert stats["circuit"]["state"] == "open"
+        assert stats["circuit"]["transitions"] == {"closed->open": 1}
+
+
+class TestStreamDeadline:
+    """Test suite for cutting off trickling streams (Task: user-050)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server(stream_delay_seconds=0.05)
+        llm_client.reset_llm_client()
+        llm_guard.reset_llm_guard()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        llm_guard.reset_llm_guard()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_stream_is_cut_off_at_the_deadline(self, monkeypatch):
+        monkeypatch.setenv(
+            "DW_LLM_BASE_URL", f"http://127.0.0.1:{self.server.server_port}/v1"
+        )
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        monkeypatch.setenv("DW_LLM_DEADLINE_SECONDS", "0.3")
+        llm_client.get_llm_client()
+
+        pieces = []
+        started = time.perf_counter()
+        with pytest.raises(LLMUnavailableError) as excinfo:
+            for piece in llm_client.stream_chat_completion(
+                [{"role": "user", "content": "Suggest 20 storylets"}]
+            ):
+                pieces.append(piece)
+        # Each piece arrives well inside the read timeout; only the total is cut
+        assert excinfo.value.reason == "deadline"
+        assert pieces
+        assert time.perf_counter() - started < 0.6
+        assert llm_guard.get_llm_guard().get_stats()["limiter"]["in_flight"] == 0
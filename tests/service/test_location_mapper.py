@@ -0,0 +1,87 @@
+"""Tests for the token-indexed location pattern matcher."""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.location_mapper import LocationInfo, LocationMapper
+
+
+def linear_scan_match(mapper: LocationMapper, location: str):
+    """The original pattern-by-pattern scoring, used as the reference."""
+    location_words = set(re.findall(r"\w+", location.lower()))
+    best_match = None
+    best_score = 0
+    for pattern_name, pattern_info in mapper.location_patterns.items():
+        pattern_words = set(re.findall(r"\w+", pattern_name.lower()))
+        common_words = location_words.intersection(pattern_words)
+        if common_words:
+            score = len(common_words) / len(pattern_words)
+            if score > best_score:
+                best_score = score
+                best_match = pattern_info
+    if best_match:
+        return best_match.suggested_position
+    return mapper._hash_to_coordinates(location)
+
+
+class TestLocationPatternIndex:
+    """Test suite for indexed partial matching (Task: user-041)."""
+
+    def setup_method(self):
+        self.mapper = LocationMapper()
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(3)
+        words = list(self.mapper.location_patterns) + [
+            "old", "misty", "ruined", "Hidden", "main", "hall", "zzyzx"
+        ]
+        names = [" ".join(rng.sample(words, rng.randint(1, 4))) for _ in range(500)]
+        names += ["The Main Hall", "main_hall gate", "Tavern of the Dawn", "nowhere"]
+        for name in names:
+            assert self.mapper._find_partial_match(name) == linear_scan_match(
+                self.mapper, name
+            ), name
+
+    def test_ties_go_to_earliest_pattern(self):
+        mapper = LocationMapper()
+        mapper.location_patterns = {
+            "twin peak": LocationInfo("twin peak", "nature", (5, 5), []),
+            "peak twin": LocationInfo("peak twin", "nature", (-5, -5), []),
+        }
+        mapper._build_pattern_index()
+        assert mapper._find_partial_match("peak of the twin") == (5, 5)
+
+    def test_resolved_names_are_cached_with_lru_bound(self):
+        self.mapper._partial_matches.clear()
+        self.mapper.PARTIAL_MATCH_CACHE_SIZE = 3
+        for name in ["old forest", "misty lake", "red cave", "grey shore"]:
+            self.mapper._find_partial_match(name)
+        assert list(self.mapper._partial_matches) == [
+            "misty lake", "red cave", "grey shore"
+        ]
+        assert self.mapper._find_partial_match("red cave") == (-4, -1)
+        assert list(self.mapper._partial_matches)[-1] == "red cave"
+
+    def test_mappers_share_one_index_and_cache(self):
+        other = LocationMapper()
+        assert other._index is self.mapper._index
+
+        self.mapper._find_partial_match("sunken grotto of echoes")
+        assert "sunken grotto of echoes" in other._partial_matches
+
+    def test_custom_patterns_do_not_touch_shared_index(self):
+        mapper = LocationMapper()
+        mapper.location_patterns = {
+            "twin peak": LocationInfo("twin peak", "nature", (5, 5), []),
+        }
+        mapper._build_pattern_index()
+        mapper._find_partial_match("twin peak ridge")
+
+        assert "twin peak ridge" not in self.mapper._partial_matches
+        assert "twin peak" not in self.mapper.location_patterns
+
@@ -0,0 +1,100 @@
+"""Tests for the occupancy grid used for spatial placement."""
+
+import random
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.location_mapper import LocationMapper
+from src.services.occupancy import SPIRAL_OFFSETS, OccupancyGrid, nearest_free
+from src.services.spatial_navigator import SpatialNavigator
+
+
+class TestOccupancyGrid:
+    """Test suite for nearest-free-cell search (Task: user-037)."""
+
+    def test_returns_nearest_free_cell(self):
+        rng = random.Random(3)
+        occupied = {(rng.randint(-6, 6), rng.randint(-6, 6)) for _ in range(120)}
+        grid = OccupancyGrid(occupied)
+
+        for _ in range(50):
+            x, y = rng.randint(-6, 6), rng.randint(-6, 6)
+            fx, fy = grid.nearest_free(x, y)
+            assert (fx, fy) not in occupied
+            best = min(
+                (dx * dx + dy * dy)
+                for dx, dy in SPIRAL_OFFSETS
+                if (x + dx, y + dy) not in occupied
+            )
+            assert (fx - x) ** 2 + (fy - y) ** 2 == best
+
+    def test_bulk_claims_never_collide(self):
+        grid = OccupancyGrid()
+        # More claims than the precomputed spiral holds
+        cells = grid.claim_many([(0, 0)] * (len(SPIRAL_OFFSETS) + 500))
+
+        assert len(set(cells)) == len(cells)
+        assert len(grid) == len(cells)
+
+    def test_search_stays_nearest_past_the_precomputed_disc(self):
+        grid = OccupancyGrid()
+        cells = grid.claim_many([(0, 0)] * (len(SPIRAL_OFFSETS) + 800))
+
+        distances = [x * x + y * y for x, y in cells]
+        assert distances == sorted(distances)
+        # The first cell outside the disc is at 32**2 + 1, not a square corner
+        assert distances[len(SPIRAL_OFFSETS)] == 32 * 32 + 1
+        x, y = nearest_free(0, 0, lambda x, y: x * x + y * y > 40 * 40)
+        assert x * x + y * y == 40 * 40 + 1
+
+    def test_released_cell_is_found_again(self):
+        grid = OccupancyGrid()
+        grid.claim_many([(0, 0)] * 30)
+        grid.release((0, 0))
+
+        assert grid.claim(0, 0) == (0, 0)
+
+    def test_location_mapper_spreads_shared_coordinates(self):
+        mapper = LocationMapper()
+        storylets = [{"requires": {"location": f"unknown place {i}"}} for i in range(600)]
+        placed = mapper.assign_coordinates_to_storylets(storylets)
+
+        coords = [(s["spatial_x"], s["spatial_y"]) for s in placed]
+        assert len(set(coords)) == 600
+
+    def test_navigator_assignment_has_no_collisions(self):
+        engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        storylets = []
+        for i in range(300):
+            data = {
+                "title": f"Scene {i}",
+                "text_template": "A scene.",
+                "requires": {"location": ["tavern", "forest", "market"][i % 3]},
+                "choices": [],
+                "weight": 1.0,
+            }
+            storylets.append(data)
+            db.add(Storylet(**data))
+        db.commit()
+
+        positions = SpatialNavigator(db).assign_spatial_positions(storylets)
+
+        assert len(positions) == 300
+        assert len({(p.x, p.y) for p in positions.values()}) == 300
+        db.close()
+        engine.dispose()
@@ -0,0 +1,105 @@
+"""Tests for requirement-aware pathfinding on the spatial grid."""
+
+import math
+import random
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.pathfinding import PathPlanner
+from src.services.spatial_navigator import SpatialNavigator
+
+
+def build_navigator(cells, gated=()):
+    """Navigator over storylets at ``cells``; ``gated`` cells need a torch."""
+    engine = create_engine(
+        "sqlite+pysqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    for x, y in cells:
+        requires = {"location": f"cell_{x}_{y}"}
+        if (x, y) in gated:
+            requires["torch"] = True
+        db.add(
+            Storylet(
+                title=f"Cell {x},{y}",
+                text_template="A cell.",
+                requires=requires,
+                position={"x": x, "y": y},
+            )
+        )
+    db.commit()
+    navigator = SpatialNavigator(db)
+    ids = {(p.x, p.y): sid for sid, p in navigator.storylet_positions.items()}
+    return navigator, ids
+
+
+class TestPathfinding:
+    """Test suite for A* routing and hub distance fields (Task: user-035)."""
+
+    def setup_method(self):
+        # 7x5 room with a torch-gated wall at x=3 except a gap at y=4
+        cells = [(x, y) for x in range(7) for y in range(5)]
+        wall = {(3, y) for y in range(4)}
+        self.navigator, self.ids = build_navigator(cells, gated=wall)
+
+    def test_route_detours_around_gated_cells(self):
+        result = self.navigator.find_path(self.ids[(0, 0)], self.ids[(6, 0)], {})
+
+        cells = [
+            (self.navigator.storylet_positions[sid].x, self.navigator.storylet_positions[sid].y)
+            for sid in result.route
+        ]
+        assert (3, 4) in cells
+        assert not any(cell in cells for cell in [(3, 0), (3, 1), (3, 2), (3, 3)])
+        assert math.isclose(result.cost, 2 + 6 * math.sqrt(2))
+
+    def test_meeting_requirements_opens_the_direct_route(self):
+        result = self.navigator.find_path(
+            self.ids[(0, 0)], self.ids[(6, 0)], {"torch": True}
+        )
+        assert result.cost == 6.0
+        assert len(result.route) == 7
+
+    def test_unreachable_goal_returns_none(self):
+        navigator, ids = build_navigator([(0, 0), (1, 0), (5, 5)])
+        assert navigator.find_path(ids[(0, 0)], ids[(5, 5)], {}) is None
+
+    def test_hub_distance_fields_match_plain_search(self):
+        rng = random.Random(11)
+        cells = [(x, y) for x in range(25) for y in range(25) if rng.random() < 0.8]
+        gated = {cell for cell in cells if rng.random() < 0.15}
+        navigator, ids = build_navigator(cells, gated=gated)
+        plain = PathPlanner(navigator, hub_threshold=10**9)
+        hubs = PathPlanner(navigator, hub_threshold=1)
+        goal = ids[cells[len(cells) // 2]]
+
+        for start_cell in rng.sample(cells, 40):
+            for player_vars in ({}, {"torch": True}):
+                expected = plain.find_path(ids[start_cell], goal, player_vars)
+                actual = hubs.find_path(ids[start_cell], goal, player_vars)
+                if expected is None:
+                    assert actual is None
+                else:
+                    assert math.isclose(actual.cost, expected.cost)
+        assert goal in hubs._fields
+
+    def test_goal_request_counts_stay_bounded(self):
+        planner = PathPlanner(self.navigator, hub_threshold=10**9, max_fields=1)
+        planner.max_tracked_goals = 5
+        start = self.ids[(0, 4)]
+        for goal in list(self.ids.values())[:12]:
+            planner.find_path(start, goal, {})
+
+        assert len(planner._target_counts) == 5
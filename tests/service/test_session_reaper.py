@@ -0,0 +1,87 @@
+"""Tests for the chunked background session reaper."""
+
+from datetime import datetime, timedelta
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import SessionVars
+from src.services.session_reaper import SessionReaper
+
+
+class TestSessionReaper:
+    """Test suite for chunked session reaping (Task: user-026)."""
+
+    def setup_method(self):
+        """Create a fresh in-memory database with old and fresh sessions."""
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+        old = datetime.utcnow() - timedelta(hours=48)
+        for i in range(7):
+            self.db.add(SessionVars(session_id=f"old_{i}", vars={}, updated_at=old))
+        for i in range(3):
+            self.db.add(SessionVars(session_id=f"fresh_{i}", vars={}))
+        self.db.commit()
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_deletes_expired_sessions_in_chunks(self):
+        reaper = SessionReaper(retention_hours=24, chunk_size=3)
+        stats = reaper.run_once(self.db)
+
+        assert stats.sessions_removed == 7
+        assert stats.chunks == 3
+        remaining = {row.session_id for row in self.db.query(SessionVars).all()}
+        assert remaining == {"fresh_0", "fresh_1", "fresh_2"}
+
+    def test_evicts_only_deleted_sessions(self):
+        cache = {"old_0": object(), "old_5": object(), "fresh_0": object()}
+
+        def evict(ids):
+            return sum(1 for sid in ids if cache.pop(sid, None) is not None)
+
+        reaper = SessionReaper(evict=evict, retention_hours=24, chunk_size=2)
+        stats = reaper.run_once(self.db)
+
+        assert stats.cache_entries_removed == 2
+        assert set(cache) == {"fresh_0"}
+
+    def test_retention_is_configurable(self):
+        reaper = SessionReaper(retention_hours=72, chunk_size=10)
+        stats = reaper.run_once(self.db)
+
+        assert stats.sessions_removed == 0
+        assert self.db.query(SessionVars).count() == 10
+
+    def test_stats_record_each_run(self):
+        reaper = SessionReaper(retention_hours=24, chunk_size=4, history_size=2)
+        reaper.run_once(self.db, trigger="manual")
+        reaper.run_once(self.db, trigger="scheduled")
+        reaper.run_once(self.db, trigger="scheduled")
+
+        stats = reaper.get_stats()
+        assert stats["total_sessions_removed"] == 7
+        assert len(stats["recent_runs"]) == 2
+        assert stats["last_run"]["sessions_removed"] == 0
+        assert stats["last_run"]["trigger"] == "scheduled"
+        assert "removed_session_ids" not in stats["last_run"]
+
+    def test_interval_zero_disables_schedule(self):
+        reaper = SessionReaper(interval_seconds=0)
+        assert reaper.start() is False
+        assert reaper.is_running is False
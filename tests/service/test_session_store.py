@@ -0,0 +1,211 @@
+"""Tests for the pluggable session-state stores."""
+
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.session_store import (
+    InProcessSessionStore,
+    RedisSessionStore,
+    SessionVersionConflict,
+    SQLiteSessionStore,
+    create_session_store,
+)
+from src.services.state_manager import AdvancedStateManager
+
+
+class _RespStandIn(socketserver.ThreadingTCPServer):
+    """Tiny in-memory server speaking enough of the Redis protocol for tests."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.data = {}
+        self.key_versions = {}
+        self.lock = threading.Lock()
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:-2])
+        args = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _write(self, value):
+        if value is None:
+            self.wfile.write(b"$-1\r\n")
+        elif isinstance(value, int):
+            self.wfile.write(b":%d\r\n" % value)
+        elif isinstance(value, list):
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self._write(item)
+        elif value in ("OK", "QUEUED"):
+            self.wfile.write(f"+{value}\r\n".encode())
+        else:
+            self.wfile.write(b"$%d\r\n%s\r\n" % (len(value), value))
+
+    def _apply(self, name, args):
+        server = self.server
+        if name == "GET":
+            return server.data.get(args[0])
+        if name == "MGET":
+            return [server.data.get(k) for k in args]
+        if name == "SET":
+            server.data[args[0]] = args[1]
+            server.key_versions[args[0]] = server.key_versions.get(args[0], 0) + 1
+            return "OK"
+        if name == "DEL":
+            removed = 0
+            for key in args:
+                if server.data.pop(key, None) is not None:
+                    server.key_versions[key] = server.key_versions.get(key, 0) + 1
+                    removed += 1
+            return removed
+        return "OK"
+
+    def handle(self):
+        watched = {}
+        queued = None
+        while True:
+            cmd = self._read_command()
+            if cmd is None:
+                return
+            name, args = cmd[0].decode().upper(), cmd[1:]
+            with self.server.lock:
+                if name == "WATCH":
+                    for key in args:
+                        watched[key] = self.server.key_versions.get(key, 0)
+                    reply = "OK"
+                elif name == "UNWATCH":
+                    watched.clear()
+                    reply = "OK"
+                elif name == "MULTI":
+                    queued = []
+                    reply = "OK"
+                elif name == "EXEC":
+                    dirty = any(
+                        self.server.key_versions.get(k, 0) != v
+                        for k, v in watched.items()
+                    )
+                    reply = None if dirty else [self._apply(n, a) for n, a in queued]
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append((name, args))
+                    reply = "QUEUED"
+                else:
+                    reply = self._apply(name, args)
+            self._write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = _RespStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InProcessSessionStore()
+    if request.param == "sqlite":
+        return SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    server = request.getfixturevalue("resp_server")
+    return RedisSessionStore(host="127.0.0.1", port=server.server_address[1])
+
+
+class TestSessionStoreContract:
+    """Behaviour shared by all session store implementations (Task: user-027)."""
+
+    def test_unknown_session(self, store):
+        assert store.get("missing") is None
+        assert store.get_version("missing") == 0
+
+    def test_put_increments_version(self, store):
+        assert store.put("s1", {"variables": {"gold": 1}}) == 1
+        assert store.put("s1", {"variables": {"gold": 2}}) == 2
+
+        stored = store.get("s1")
+        assert stored.version == 2
+        assert stored.state == {"variables": {"gold": 2}}
+        assert store.get_version("s1") == 2
+
+    def test_conditional_put_rejects_stale_version(self, store):
+        store.put("s1", {"variables": {}})
+        store.put("s1", {"variables": {"gold": 1}})
+
+        with pytest.raises(SessionVersionConflict) as exc_info:
+            store.put("s1", {"variables": {"gold": 5}}, expected_version=1)
+
+        assert exc_info.value.actual == 2
+        assert store.get("s1").state == {"variables": {"gold": 1}}
+        assert store.put("s1", {"variables": {"gold": 5}}, expected_version=2) == 3
+
+    def test_delete(self, store):
+        store.put("s1", {})
+        store.put("s2", {})
+
+        assert store.delete(["s1", "missing"]) == 1
+        assert store.get("s1") is None
+        assert store.get_version("s2") == 1
+
+    def test_state_manager_round_trip(self, store):
+        manager = AdvancedStateManager("s1")
+        manager.set_variable("location", "forge")
+        manager.add_item("pickaxe", "Pickaxe")
+        store.put("s1", manager.export_state())
+
+        restored = AdvancedStateManager("s1")
+        restored.import_state(store.get("s1").state)
+
+        assert restored.get_variable("location") == "forge"
+        assert "pickaxe" in restored.inventory
+        assert len(restored.change_history) == len(manager.change_history)
+
+
+class TestSharedStores:
+    """Two workers sharing one backing store see each other's writes."""
+
+    def test_sqlite_workers_share_versions(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        worker_a = SQLiteSessionStore(path)
+        worker_b = SQLiteSessionStore(path)
+
+        worker_a.put("s1", {"variables": {"location": "tavern"}})
+        assert worker_b.get_version("s1") == 1
+        worker_b.put("s1", {"variables": {"location": "forge"}}, expected_version=1)
+
+        assert worker_a.get("s1").state["variables"]["location"] == "forge"
+
+    def test_redis_workers_share_versions(self, resp_server):
+        port = resp_server.server_address[1]
+        worker_a = create_session_store(f"redis://127.0.0.1:{port}/0")
+        worker_b = create_session_store(f"redis://127.0.0.1:{port}/0")
+
+        worker_a.put("s1", {"variables": {"location": "tavern"}})
+        assert worker_b.get_version("s1") == 1
+        with pytest.raises(SessionVersionConflict):
+            worker_a.put("s1", {}, expected_version=0)
+
+    def test_factory_rejects_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_session_store("memcached://localhost")
@@ -0,0 +1,141 @@
+"""Tests for single-flight coalescing of identical LLM requests."""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add parent directories to path
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "py_scripts"))
+
+from openai_stub_server import start_stub_server
+
+from src.services import llm_client
+from src.services.llm_service import llm_suggest_storylets
+from src.services.llm_usage import llm_usage
+from src.services.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test suite for in-flight request coalescing (Task: user-049)."""
+
+    def _run_concurrently(self, flight, key, fn, callers=5):
+        barrier = threading.Barrier(callers)
+
+        def call():
+            barrier.wait()
+            return flight.do(key, fn)
+
+        with ThreadPoolExecutor(max_workers=callers) as pool:
+            return [f.result() for f in [pool.submit(call) for _ in range(callers)]]
+
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        runs = []
+
+        def work():
+            runs.append(1)
+            time.sleep(0.1)
+            return "result"
+
+        results = self._run_concurrently(flight, "same", work)
+
+        assert len(runs) == 1
+        assert [value for value, _ in results] == ["result"] * 5
+        assert sorted(shared for _, shared in results) == [False] + [True] * 4
+        assert flight.get_stats() == {
+            "calls": 1,
+            "coalesced": 4,
+            "timed_out": 0,
+            "in_flight": 0,
+        }
+
+    def test_errors_are_shared_and_keys_reset(self):
+        flight = SingleFlight()
+        barrier = threading.Barrier(2)
+
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError("upstream error")
+
+        def call():
+            barrier.wait()
+            flight.do("key", fail)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [pool.submit(call) for _ in range(2)]
+            for future in futures:
+                with pytest.raises(RuntimeError):
+                    future.result()
+
+        # A later call runs again rather than reusing the failure
+        assert flight.do("key", lambda: "ok") == ("ok", False)
+        assert flight.in_flight == 0
+
+    def test_waiters_give_up_at_timeout(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(2.0)
+            return "late"
+
+        leader = threading.Thread(target=flight.do, args=("key", slow))
+        leader.start()
+        started.wait(1.0)
+        begun = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            flight.do("key", slow, timeout=0.05)
+        assert time.perf_counter() - begun < 0.5
+        release.set()
+        leader.join()
+        assert flight.get_stats()["timed_out"] == 1
+
+
+class TestCoalescedCompletions:
+    """Test suite for coalesced chat completions against the stub (Task: user-049)."""
+
+    def setup_method(self):
+        self.server, self.state = start_stub_server(latency_seconds=0.2)
+        llm_client.reset_llm_client()
+        llm_usage.reset()
+
+    def teardown_method(self):
+        llm_client.reset_llm_client()
+        llm_usage.reset()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_identical_suggestions_share_one_request(self, monkeypatch):
+        monkeypatch.setenv(
+            "DW_LLM_BASE_URL", f"http://127.0.0.1:{self.server.server_port}/v1"
+        )
+        monkeypatch.setenv("OPENAI_API_KEY", "stub")
+        monkeypatch.setenv("DW_LLM_CACHE", "0")
+        # Let the real code path run against the stub instead of test fallbacks
+        monkeypatch.delenv("PYTEST_CURRENT_TEST", raising=False)
+        monkeypatch.delenv("DW_FAST_TEST", raising=False)
+        monkeypatch.delenv("DW_DISABLE_AI", raising=False)
+        bible = {"current_state": {"location": "harbor", "danger": 1}}
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(
+                pool.map(lambda _: llm_suggest_storylets(2, ["mystery"], bible), range(4))
+            )
+
+        assert self.state.requests == 1
+        assert all(len(storylets) == 2 for storylets in results)
+        stats = llm_usage.get_stats()
+        assert stats["calls"] == 4
+        assert stats["coalesced_calls"] == 3
+
+        # Different requests are not coalesced
+        llm_suggest_storylets(2, ["danger"], bible)
+        assert self.state.requests == 2
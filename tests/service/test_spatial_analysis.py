@@ -0,0 +1,78 @@
+"""Tests for spatial grid connectivity and reachability."""
+
+import random
+import sys
+from pathlib import Path
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.spatial_analysis import GridConnectivity, analyze_reachability
+
+
+def flood_fill_components(cells):
+    """Reference implementation: BFS over 8-neighbours."""
+    remaining = set(cells)
+    sizes = []
+    while remaining:
+        stack = [remaining.pop()]
+        size = 0
+        while stack:
+            x, y = stack.pop()
+            size += 1
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    neighbour = (x + dx, y + dy)
+                    if neighbour in remaining:
+                        remaining.discard(neighbour)
+                        stack.append(neighbour)
+        sizes.append(size)
+    return sorted(sizes, reverse=True)
+
+
+class TestGridConnectivity:
+    """Test suite for component and reachability analysis (Task: user-038)."""
+
+    def test_diagonal_cells_are_connected(self):
+        grid = GridConnectivity([(0, 0), (1, 1), (2, 2), (5, 5)])
+
+        assert grid.connected((0, 0), (2, 2))
+        assert not grid.connected((0, 0), (5, 5))
+        assert [len(c) for c in grid.components()] == [3, 1]
+
+    def test_incremental_updates_match_flood_fill(self):
+        rng = random.Random(5)
+        cells = [(rng.randint(0, 60), rng.randint(0, 60)) for _ in range(1500)]
+        grid = GridConnectivity()
+        for cell in cells:
+            grid.add(cell)
+        assert [len(c) for c in grid.components()] == flood_fill_components(cells)
+
+        removed = set(rng.sample(sorted(set(cells)), 300))
+        for cell in removed:
+            grid.remove(cell)
+        remaining = set(cells) - removed
+        assert [len(c) for c in grid.components()] == flood_fill_components(remaining)
+
+    def test_reachability_from_origin(self):
+        positions = {1: (0, 0), 2: (1, 0), 3: (2, 1), 4: (10, 10), 5: (11, 11)}
+        report = analyze_reachability(positions)
+
+        assert report.start_id == 1
+        assert report.reachable_ids == [1, 2, 3]
+        assert report.unreachable_ids == [4, 5]
+        assert report.to_dict()["component_count"] == 2
+
+        from_island = analyze_reachability(positions, start_id=5)
+        assert from_island.reachable_ids == [4, 5]
+
+    def test_large_grid_single_pass(self):
+        side = 320
+        positions = {
+            y * side + x + 1: (x, y) for x in range(side) for y in range(side)
+        }
+        report = analyze_reachability(positions)
+
+        assert report.total == side * side
+        assert report.component_sizes == [side * side]
+        assert report.unreachable_ids == []
@@ -0,0 +1,96 @@
+"""Tests for the grid-hash spatial index and map tiles."""
+
+import random
+import sys
+from pathlib import Path
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.services.spatial_index import GridIndex
+from src.services.spatial_navigator import Position
+
+
+class TestGridIndex:
+    """Test suite for bounding-box and cluster queries (Task: user-033)."""
+
+    def setup_method(self):
+        rng = random.Random(7)
+        self.index = GridIndex(cell_size=8)
+        self.positions = {}
+        cells = rng.sample([(x, y) for x in range(-50, 50) for y in range(-50, 50)], 2000)
+        for sid, (x, y) in enumerate(cells, start=1):
+            self.positions[sid] = Position(x, y)
+            self.index.add(sid, Position(x, y))
+
+    def _brute_force(self, min_x, min_y, max_x, max_y):
+        return {
+            sid
+            for sid, pos in self.positions.items()
+            if min_x <= pos.x <= max_x and min_y <= pos.y <= max_y
+        }
+
+    def test_bbox_matches_brute_force(self):
+        for bbox in [(-5, -5, 5, 5), (-50, -50, 49, 49), (3, -20, 17, -2), (60, 60, 70, 70)]:
+            found = {sid for sid, _ in self.index.query_bbox(*bbox)}
+            assert found == self._brute_force(*bbox)
+
+    def test_cluster_counts_add_up(self):
+        for tile_size in (4, 8, 16, 5):
+            clusters = self.index.cluster_counts(-37, -41, 29, 33, tile_size)
+            assert sum(c["count"] for c in clusters) == len(
+                self._brute_force(-37, -41, 29, 33)
+            )
+            for cluster in clusters:
+                assert cluster["x"] % tile_size == 0 and cluster["y"] % tile_size == 0
+
+    def test_remove_keeps_index_consistent(self):
+        for sid in list(self.positions)[:500]:
+            self.index.remove(sid, self.positions.pop(sid))
+        assert len(self.index) == 1500
+        found = {sid for sid, _ in self.index.query_bbox(-50, -50, 49, 49)}
+        assert found == set(self.positions)
+
+
+class TestRadiusAndNearestQueries:
+    """Test suite for radius and k-nearest queries (Task: user-039)."""
+
+    def setup_method(self):
+        rng = random.Random(11)
+        self.index = GridIndex(cell_size=4)
+        self.positions = {}
+        cells = rng.sample([(x, y) for x in range(-40, 40) for y in range(-40, 40)], 600)
+        for sid, (x, y) in enumerate(cells, start=1):
+            self.positions[sid] = Position(x, y)
+            self.index.add(sid, Position(x, y))
+
+    def _ranked(self, center):
+        return sorted(
+            (pos.distance_to(center), pos.y, pos.x, sid)
+            for sid, pos in self.positions.items()
+        )
+
+    def test_within_radius_matches_brute_force(self):
+        for center, radius in [(Position(0, 0), 5), (Position(13, -7), 2.5), (Position(-39, 39), 9)]:
+            expected = [
+                sid for d, _, _, sid in self._ranked(center) if d <= radius
+            ]
+            found = self.index.within_radius(center, radius)
+            assert [sid for sid, _, _ in found] == expected
+            assert all(d == pos.distance_to(center) for _, pos, d in found)
+
+    def test_nearest_matches_brute_force(self):
+        for center in [Position(0, 0), Position(38, 38), Position(200, -200)]:
+            for k in (1, 7, 50):
+                expected = [sid for _, _, _, sid in self._ranked(center)[:k]]
+                assert [sid for sid, _, _ in self.index.nearest(center, k)] == expected
+
+    def test_nearest_respects_max_distance(self):
+        center = Position(5, 5)
+        found = self.index.nearest(center, 100, max_distance=3)
+        expected = [sid for d, _, _, sid in self._ranked(center) if d <= 3]
+        assert [sid for sid, _, _ in found] == expected
+
+    def test_empty_index(self):
+        assert GridIndex().nearest(Position(0, 0), 3) == []
+        assert GridIndex().within_radius(Position(0, 0), 3) == []
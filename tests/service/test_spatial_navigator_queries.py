@@ -0,0 +1,335 @@
+"""Tests for spatial navigation lookups and caching."""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.spatial_navigator import (
+    DIRECTIONS,
+    Position,
+    SpatialNavigator,
+    SpatialNavigatorRegistry,
+    compile_requirements,
+)
+
+
+class TestDirectionalNavigationQueries:
+    """Test suite for batched neighbour lookups (Task: user-030)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(
+            Storylet(
+                title="Center",
+                text_template="The square.",
+                requires={"location": "square"},
+                position={"x": 0, "y": 0},
+            )
+        )
+        for name, direction in DIRECTIONS.items():
+            self.db.add(
+                Storylet(
+                    title=name.title(),
+                    text_template=f"Somewhere {name}.",
+                    requires={"location": name, "torch": True}
+                    if name == "north"
+                    else {"location": name},
+                    position={"x": direction.dx, "y": direction.dy},
+                )
+            )
+        self.db.commit()
+        self.center_id = self.db.query(Storylet).filter_by(title="Center").one().id
+        self.navigator = SpatialNavigator(self.db)
+
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._count)
+
+    def teardown_method(self):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+        self.db.close()
+        self.engine.dispose()
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def test_all_neighbours_loaded_in_one_query(self):
+        navigation = self.navigator.get_directional_navigation(self.center_id)
+
+        assert all(navigation[name] is not None for name in DIRECTIONS)
+        assert navigation["east"]["title"] == "East"
+        assert navigation["east"]["position"] == {"x": 1, "y": 0}
+        assert len(self.statements) == 1
+
+    def test_navigation_request_reuses_cached_summaries(self):
+        navigation = self.navigator.get_directional_navigation(self.center_id)
+        player_vars = {"location": "square"}
+        accessible = {
+            name: self.navigator.can_move_to_direction(
+                self.center_id, name, {**player_vars, "location": name}
+            )
+            for name in navigation
+        }
+
+        assert accessible["north"] is False
+        assert accessible["south"] is True
+        assert len(self.statements) == 1
+
+    def test_invalidated_summaries_are_reloaded(self):
+        self.navigator.get_directional_navigation(self.center_id)
+        self.navigator.invalidate_summaries()
+        self.navigator.get_directional_navigation(self.center_id)
+
+        assert len(self.statements) == 2
+
+    def test_public_summaries_skip_unknown_ids(self):
+        summaries = self.navigator.get_storylet_summaries([self.center_id, 9999])
+
+        assert set(summaries) == {self.center_id}
+        assert summaries[self.center_id]["title"] == "Center"
+
+        summaries[self.center_id] = {}
+        again = self.navigator.get_storylet_summaries([self.center_id])
+        assert again[self.center_id]["title"] == "Center"
+        assert len(self.statements) == 1
+
+
+class TestNavigationTable:
+    """Test suite for the precomputed neighbour table (Task: user-031)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all(
+            [
+                Storylet(
+                    title="Camp",
+                    text_template="A quiet camp.",
+                    requires={"location": "camp"},
+                    position={"x": 0, "y": 0},
+                ),
+                Storylet(
+                    title="Cliff",
+                    text_template="A steep cliff.",
+                    requires={"location": "cliff", "stamina": {"gte": 3}},
+                    position={"x": 1, "y": 0},
+                ),
+                Storylet(
+                    title="Cave",
+                    text_template="A dark cave.",
+                    requires={"location": "cave"},
+                    position={"x": 5, "y": 5},
+                ),
+            ]
+        )
+        self.db.commit()
+        self.ids = {s.title: s.id for s in self.db.query(Storylet).all()}
+        self.navigator = SpatialNavigator(self.db)
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_compiled_predicates_apply_requirement_semantics(self):
+        requirements = {"gold": {"gte": 2, "lt": 10, "unknown": 1}, "door": "open"}
+        cases = [
+            ({}, False),
+            ({"gold": 5}, False),
+            ({"gold": 5, "door": "open"}, True),
+            ({"gold": 2, "door": "open"}, True),
+            ({"gold": 10, "door": "open"}, False),
+            ({"gold": 1, "door": "open"}, False),
+            ({"gold": 2, "door": "shut"}, False),
+        ]
+        predicate = compile_requirements(requirements)
+        for player_vars, expected in cases:
+            assert predicate(player_vars) is expected
+
+    def test_neighbour_predicate_ignores_target_location(self):
+        camp = self.ids["Camp"]
+        east = self.navigator.get_directional_navigation(camp)["east"]
+        assert east is not None
+        # The cliff requires location "cliff", but a player standing at the
+        # camp with enough stamina may still step onto it
+        assert self.navigator.can_move_to_direction(
+            camp, "east", {"location": "camp", "stamina": 3}
+        )
+        assert not self.navigator.can_move_to_direction(
+            camp, "east", {"location": "camp", "stamina": 1}
+        )
+
+    def test_moved_storylet_only_rebuilds_neighbouring_cells(self):
+        camp = self.ids["Camp"]
+        assert self.navigator.get_directional_navigation(camp)["south"] is None
+
+        # Move the cave next to the camp the way _place_storylet does
+        cave = self.ids["Cave"]
+        old = self.navigator.storylet_positions[cave]
+        del self.navigator.position_storylets[old]
+        self.navigator._mark_cells_dirty(old)
+        new = Position(0, 1)
+        self.navigator.storylet_positions[cave] = new
+        self.navigator.position_storylets[new] = cave
+        self.navigator._mark_cells_dirty(new)
+
+        south = self.navigator.get_directional_navigation(camp)["south"]
+        assert south["id"] == cave
+        assert self.navigator.get_directional_navigation(cave)["north"]["id"] == camp
+
+    def test_accessibility_cached_until_referenced_variable_changes(self):
+        camp = self.ids["Camp"]
+        evaluated = []
+        entry = self.navigator._neighbours(camp)["east"]
+        original = entry.predicate
+        entry.predicate = lambda player_vars: evaluated.append(1) or original(
+            player_vars
+        )
+
+        player_vars = {"location": "cliff", "stamina": 1, "gold": 0}
+        assert not self.navigator.can_move_to_direction(
+            camp, "east", player_vars, session_id="s1", state_revision=1
+        )
+        # Same revision: served from cache
+        assert not self.navigator.can_move_to_direction(
+            camp, "east", player_vars, session_id="s1", state_revision=1
+        )
+        # Unrelated variable changed: still cached
+        player_vars["gold"] = 10
+        assert not self.navigator.can_move_to_direction(
+            camp, "east", player_vars, session_id="s1", state_revision=2
+        )
+        assert len(evaluated) == 1
+
+        player_vars["stamina"] = 4
+        assert self.navigator.can_move_to_direction(
+            camp, "east", player_vars, session_id="s1", state_revision=3
+        )
+        assert len(evaluated) == 2
+
+
+class TestSharedNavigators:
+    """Test suite for the per-world navigator registry (Task: user-034)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        db = self.SessionLocal()
+        for world in ("north", "south"):
+            for i in range(3):
+                db.add(
+                    Storylet(
+                        world_id=world,
+                        title=f"Post {i}",
+                        text_template=f"Post {i} of the {world}.",
+                        requires={"location": f"post_{i}"},
+                        position={"x": i, "y": 0},
+                    )
+                )
+        db.commit()
+        db.close()
+        self.registry = SpatialNavigatorRegistry(max_worlds=1, ttl_seconds=3600)
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_navigator_is_shared_across_request_sessions(self):
+        first_db, second_db = self.SessionLocal(), self.SessionLocal()
+        first = self.registry.get(first_db, "north", version=0)
+        second = self.registry.get(second_db, "north", version=0)
+
+        assert first is second
+        assert second.db is second_db
+        first_db.close()
+        second_db.close()
+
+    def test_new_version_refreshes_incrementally(self):
+        db = self.SessionLocal()
+        navigator = self.registry.get(db, "north", version=0)
+        post_0 = db.query(Storylet).filter_by(world_id="north", title="Post 0").one()
+        east = navigator.get_directional_navigation(post_0.id)["east"]
+        assert east["title"] == "Post 1"
+
+        db.execute(
+            Storylet.__table__.update()
+            .where(Storylet.world_id == "north", Storylet.title == "Post 1")
+            .values(title="Renamed", position={"x": 0, "y": 1})
+        )
+        db.commit()
+
+        assert self.registry.get(db, "north", version=0) is navigator
+        changes = navigator.refresh()
+        assert changes == {"added": 0, "moved": 1, "removed": 0, "edited": 1}
+
+        navigation = self.registry.get(db, "north", version=1).get_directional_navigation(
+            post_0.id
+        )
+        assert navigation["east"] is None
+        assert navigation["south"]["title"] == "Renamed"
+        db.close()
+
+    def test_registry_memory_is_bounded(self):
+        db = self.SessionLocal()
+        self.registry.get(db, "north", version=0)
+        self.registry.get(db, "south", version=0)
+
+        assert self.registry.loaded_worlds() == ["south"]
+        db.close()
+
+    def test_readers_never_see_a_half_built_grid(self):
+        db = self.SessionLocal()
+        navigator = self.registry.get(db, "north", version=0)
+        storylets = [
+            {"title": f"Post {i}", "requires": {"location": f"post_{i}"}}
+            for i in range(3)
+        ]
+        placing = threading.Event()
+        original = navigator._find_free_position
+
+        def slow_find_free_position(position):
+            placing.set()
+            time.sleep(0.05)
+            return original(position)
+
+        navigator._find_free_position = slow_find_free_position
+        maps = []
+
+        def read_map():
+            placing.wait(1.0)
+            reader_db = self.SessionLocal()
+            navigator.bind(reader_db)
+            maps.append(navigator.get_spatial_map_data())
+            reader_db.close()
+
+        reader = threading.Thread(target=read_map)
+        reader.start()
+        navigator.assign_spatial_positions(storylets)
+        reader.join()
+
+        assert placing.is_set()
+        assert len(maps[0]["storylets"]) == 3
+        db.close()
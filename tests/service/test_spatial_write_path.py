@@ -0,0 +1,90 @@
+"""Tests for the bulk spatial position write path."""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.spatial_navigator import SpatialNavigator
+
+
+class TestBulkPositionWrites:
+    """Test suite for single-transaction placement (Task: user-036)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.storylets = []
+        for i in range(60):
+            self.storylets.append(
+                {
+                    "title": f"Place {i}",
+                    "text_template": "Somewhere.",
+                    "requires": {"location": f"place {i}"},
+                    "choices": [],
+                    "weight": 1.0,
+                }
+            )
+            # Legacy rows without coordinates
+            self.db.add(Storylet(**self.storylets[-1], position=None))
+        self.db.commit()
+
+        self.updates = []
+        self.commits = []
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        event.listen(self.engine, "commit", self._commit)
+
+    def teardown_method(self):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        event.remove(self.engine, "commit", self._commit)
+        self.db.close()
+        self.engine.dispose()
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.strip().upper().startswith("UPDATE"):
+            self.updates.append((statement, executemany))
+
+    def _commit(self, conn):
+        self.commits.append(conn)
+
+    def _stored_positions(self):
+        self.db.expire_all()
+        return {s.id: s.position for s in self.db.query(Storylet).all()}
+
+    def test_assignment_writes_once_into_position_column(self):
+        navigator = SpatialNavigator(self.db)
+        positions = navigator.assign_spatial_positions(self.storylets)
+
+        assert len(positions) == 60
+        assert len(self.updates) == 1
+        statement, executemany = self.updates[0]
+        assert executemany and "position" in statement
+        assert len(self.commits) == 1
+
+        stored = self._stored_positions()
+        assert all(
+            stored[sid] == {"x": pos.x, "y": pos.y} for sid, pos in positions.items()
+        )
+
+    def test_auto_assign_coordinates_in_one_batch(self):
+        updated = SpatialNavigator.auto_assign_coordinates(self.db)
+
+        assert updated == 60
+        assert len(self.updates) == 1 and self.updates[0][1]
+        assert all(
+            isinstance(pos, dict) and {"x", "y"} <= set(pos)
+            for pos in self._stored_positions().values()
+        )
+        assert SpatialNavigator.auto_assign_coordinates(self.db) == 0
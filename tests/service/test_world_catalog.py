@@ -0,0 +1,86 @@
+"""Tests for per-world storylet catalogs."""
+
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Add parent directories to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.database import Base
+from src.models import Storylet
+from src.services.state_manager import AdvancedStateManager
+from src.services.world_catalog import WorldCatalogRegistry
+
+
+class TestWorldCatalogs:
+    """Test suite for multi-world catalogs (Task: user-029)."""
+
+    def setup_method(self):
+        self.engine = create_engine(
+            "sqlite+pysqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        for world in ("alpha", "beta"):
+            # Same titles in different worlds are allowed
+            self.db.add_all(
+                [
+                    Storylet(
+                        world_id=world,
+                        title="Gate",
+                        text_template=f"The {world} gate.",
+                        requires={},
+                    ),
+                    Storylet(
+                        world_id=world,
+                        title="Vault",
+                        text_template=f"The {world} vault.",
+                        requires={"has_key": True},
+                    ),
+                ]
+            )
+        self.db.commit()
+        self.registry = WorldCatalogRegistry(ttl_seconds=3600)
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_catalog_only_contains_its_world(self):
+        alpha = self.registry.get(self.db, "alpha")
+        assert {s.world_id for s in alpha.storylets} == {"alpha"}
+        assert len(alpha.storylets) == 2
+
+    def test_invalidating_one_world_keeps_others_cached(self):
+        alpha = self.registry.get(self.db, "alpha")
+        beta = self.registry.get(self.db, "beta")
+
+        self.registry.invalidate("alpha")
+
+        assert self.registry.get(self.db, "beta") is beta
+        reloaded = self.registry.get(self.db, "alpha")
+        assert reloaded is not alpha
+        assert reloaded.version == alpha.version + 1
+
+    def test_eligibility_cached_until_state_changes(self):
+        catalog = self.registry.get(self.db, "alpha")
+        manager = AdvancedStateManager("s1", world_id="alpha")
+
+        assert [s.title for s in catalog.eligible_storylets(manager)] == ["Gate"]
+
+        calls = []
+        original = manager.evaluate_condition
+        manager.evaluate_condition = lambda req: calls.append(req) or original(req)
+        catalog.eligible_storylets(manager)
+        assert calls == []
+
+        manager.set_variable("has_key", True)
+        titles = sorted(s.title for s in catalog.eligible_storylets(manager))
+        assert titles == ["Gate", "Vault"]
+        assert len(calls) == 2